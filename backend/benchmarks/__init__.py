@@ -0,0 +1,3 @@
+"""
+Runnable performance benchmarks for the carbon emission backend.
+"""
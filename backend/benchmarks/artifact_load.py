@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from ..config import SHAP_BACKGROUND_SIZE, SHAP_KMEANS_CLUSTERS
+from ..explainability.lime_service import build_lime_explainer, build_lime_explainer_from_stats
+from ..explainability.shap_service import build_shap_explainer
+from ..model.constants import FEATURE_COLUMNS, MODEL_FILE, TARGET_COLUMN, TRAIN_DATA_FILE
+from ..model.shared import (
+    export_shared_arrays,
+    load_shared_lime_stats,
+    load_shared_shap_background,
+    load_shared_training_data,
+)
+from .memory_report import _read_smaps_rollup
+
+# "pickle": unpickle the training DataFrame and derive the explainers' inputs
+# from it (the loading path before the compact export); otherwise the compact
+# export at that precision.
+FORMATS = ("pickle", "float64", "float32")
+SHAP_BACKGROUND_TIERS = ("interventional", "kmeans")
+
+
+def _load(directory: Path, fmt: str, model: Any) -> Dict[str, float]:
+    timings = {}
+    start = time.perf_counter()
+    if fmt == "pickle":
+        train_data = joblib.load(directory / TRAIN_DATA_FILE)
+        X_train = train_data["X_train"]
+        timings["data_ms"] = (time.perf_counter() - start) * 1e3
+
+        start = time.perf_counter()
+        build_lime_explainer(np.asarray(X_train.values), FEATURE_COLUMNS)
+        timings["lime_ms"] = (time.perf_counter() - start) * 1e3
+
+        start = time.perf_counter()
+        for tier in SHAP_BACKGROUND_TIERS:
+            build_shap_explainer(model, X_train, tier, SHAP_BACKGROUND_SIZE, SHAP_KMEANS_CLUSTERS)
+        timings["shap_ms"] = (time.perf_counter() - start) * 1e3
+        return timings
+
+    shared_dir = directory / f"shared-{fmt}"
+    load_shared_training_data(shared_dir)
+    timings["data_ms"] = (time.perf_counter() - start) * 1e3
+
+    start = time.perf_counter()
+    build_lime_explainer_from_stats(load_shared_lime_stats(shared_dir), FEATURE_COLUMNS)
+    timings["lime_ms"] = (time.perf_counter() - start) * 1e3
+
+    start = time.perf_counter()
+    for tier, size in zip(SHAP_BACKGROUND_TIERS, (SHAP_BACKGROUND_SIZE, SHAP_KMEANS_CLUSTERS)):
+        background = load_shared_shap_background(shared_dir, tier, size)
+        build_shap_explainer(model, None, tier, background=background)
+    timings["shap_ms"] = (time.perf_counter() - start) * 1e3
+    return timings
+
+
+def _worker(directory: Path, fmt: str, results: Any) -> None:
+    # Import the heavy libraries (and pandas' lazily imported parts) and load
+    # the model first: they cost the same whatever the format.
+    import lime.discretize  # noqa: F401
+    import lime.lime_tabular  # noqa: F401
+    import scipy.stats  # noqa: F401
+    import shap  # noqa: F401
+
+    pd.DataFrame(np.zeros((1, len(FEATURE_COLUMNS))), columns=FEATURE_COLUMNS)
+    model = joblib.load(directory / MODEL_FILE)
+    baseline = _read_smaps_rollup()
+    timings = _load(directory, fmt, model)
+    loaded = _read_smaps_rollup()
+    results.put({**timings, "rss_mb": (loaded["rss_kb"] - baseline["rss_kb"]) / 1024})
+
+
+def _prepare(directory: Path, n_rows: Optional[int]) -> int:
+    """
+    Write the pickled training data and one compact export per precision
+    into `directory`, from the current artifacts or `n_rows` synthetic rows.
+    """
+    from ..model.versions import current_layout
+
+    layout = current_layout()
+    model = joblib.load(layout.model_path)
+    if n_rows is None:
+        train_data = joblib.load(layout.train_data_path)
+        X_train, y_train = train_data["X_train"], train_data["y_train"]
+    else:
+        from ..model.data import generate_synthetic_emission_data
+
+        df = generate_synthetic_emission_data(n_samples=n_rows)
+        X_train, y_train = df[FEATURE_COLUMNS], df[TARGET_COLUMN]
+
+    joblib.dump(model, directory / MODEL_FILE)
+    joblib.dump({"X_train": X_train, "y_train": y_train}, directory / TRAIN_DATA_FILE)
+    for fmt in FORMATS[1:]:
+        export_shared_arrays(model, X_train, y_train, directory / f"shared-{fmt}", precision=fmt)
+    return len(X_train)
+
+
+def _disk_mb(directory: Path, fmt: str) -> float:
+    if fmt == "pickle":
+        paths = [directory / TRAIN_DATA_FILE]
+    else:
+        paths = [path for path in (directory / f"shared-{fmt}").glob("*.npy") if not path.name.startswith("forest_")]
+    return sum(path.stat().st_size for path in paths) / 2**20
+
+
+def run_artifact_load_report(
+    n_rows: Optional[int] = None, formats: Sequence[str] = FORMATS, repeats: int = 3
+) -> List[Dict[str, Any]]:
+    """
+    For each training-data format: time to load the training data and build
+    the LIME and SHAP (interventional and k-means) explainers in a fresh
+    process, the RSS it adds (best of `repeats` processes), and the size on
+    disk of the training data plus precomputed explainer inputs.
+    """
+    context = multiprocessing.get_context("spawn")
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        rows = _prepare(directory, n_rows)
+        for fmt in formats:
+            samples = []
+            for _ in range(repeats):
+                queue = context.Queue()
+                process = context.Process(target=_worker, args=(directory, fmt, queue))
+                process.start()
+                samples.append(queue.get())
+                process.join()
+            best = min(samples, key=lambda sample: sample["data_ms"] + sample["lime_ms"] + sample["shap_ms"])
+            results.append(
+                {
+                    "format": fmt,
+                    "rows": rows,
+                    **best,
+                    "total_ms": best["data_ms"] + best["lime_ms"] + best["shap_ms"],
+                    "rss_mb": min(sample["rss_mb"] for sample in samples),
+                    "disk_mb": _disk_mb(directory, fmt),
+                }
+            )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Explainer load time and memory: pickled training data vs the compact export."
+    )
+    parser.add_argument(
+        "--rows", type=int, default=None, help="Synthetic training rows (default: the current artifacts)."
+    )
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    print(
+        f"{'format':>8} {'rows':>9} {'data ms':>8} {'lime ms':>8} {'shap ms':>8} "
+        f"{'total ms':>9} {'rss MB':>7} {'disk MB':>8}"
+    )
+    for row in run_artifact_load_report(args.rows, repeats=args.repeats):
+        print(
+            f"{row['format']:>8} {row['rows']:>9} {row['data_ms']:>8.1f} {row['lime_ms']:>8.1f} "
+            f"{row['shap_ms']:>8.1f} {row['total_ms']:>9.1f} {row['rss_mb']:>7.1f} {row['disk_mb']:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    # `python -m backend.benchmarks.artifact_load [--rows 1000000]`
+    main()
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Any, Callable, Dict, List, Sequence
+
+import numpy as np
+
+from ..model.data import generate_synthetic_emission_data
+from ..model.registry import load_compiled_forest, load_model
+from ..model.train_model import FEATURE_COLUMNS
+
+
+def _median_seconds(fn: Callable[[Any], Any], X: Any, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(X)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings))
+
+
+def run_inference_benchmark(
+    batch_sizes: Sequence[int] = (1, 100, 100_000),
+    repeats: int = 5,
+) -> List[Dict[str, Any]]:
+    """
+    Compare sklearn's `RandomForestRegressor.predict` with the flat-array
+    engine at each batch size.
+
+    Returns one row per batch size with median latencies, per-row cost,
+    speedup and whether both engines produced bit-identical predictions.
+    """
+    model = load_model()
+    forest = load_compiled_forest()
+
+    data = generate_synthetic_emission_data(n_samples=max(batch_sizes), random_state=7)
+    X_all = data[FEATURE_COLUMNS]
+
+    results: List[Dict[str, Any]] = []
+    for batch_size in batch_sizes:
+        X_df = X_all.iloc[:batch_size]
+        X_np = X_df.to_numpy()
+        # Large batches are slow enough that a couple of runs suffice.
+        n_repeats = repeats if batch_size < 10_000 else max(1, repeats // 2)
+
+        sklearn_s = _median_seconds(model.predict, X_df, n_repeats)
+        flat_s = _median_seconds(forest.predict, X_np, n_repeats)
+        identical = bool(np.array_equal(model.predict(X_df), forest.predict(X_np)))
+
+        results.append(
+            {
+                "batch_size": batch_size,
+                "sklearn_ms": sklearn_s * 1e3,
+                "flat_ms": flat_s * 1e3,
+                "sklearn_us_per_row": sklearn_s * 1e6 / batch_size,
+                "flat_us_per_row": flat_s * 1e6 / batch_size,
+                "speedup": sklearn_s / flat_s,
+                "identical": identical,
+            }
+        )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark sklearn vs flat-array Random Forest inference."
+    )
+    parser.add_argument(
+        "--batch-sizes", type=int, nargs="+", default=[1, 100, 100_000]
+    )
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    results = run_inference_benchmark(args.batch_sizes, args.repeats)
+
+    print(f"{'batch':>8} {'sklearn ms':>12} {'flat ms':>10} {'speedup':>8} {'identical':>10}")
+    for row in results:
+        print(
+            f"{row['batch_size']:>8} {row['sklearn_ms']:>12.3f} {row['flat_ms']:>10.3f} "
+            f"{row['speedup']:>7.1f}x {str(row['identical']):>10}"
+        )
+
+
+if __name__ == "__main__":
+    # `python -m backend.benchmarks.inference`
+    main()
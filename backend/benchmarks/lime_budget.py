@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import argparse
+import itertools
+import time
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+from ..explainability.lime_service import build_lime_template, get_local_lime_explanation
+from ..model.registry import load_compiled_forest, load_lime_explainer, load_training_data
+
+
+def _top_k(explanation: Dict[str, Any], k: int) -> set:
+    contributions = sorted(
+        explanation["contributions"], key=lambda item: abs(item["weight"]), reverse=True
+    )
+    return {item["feature"] for item in contributions[:k]}
+
+
+def _mean_pairwise_jaccard(sets: Sequence[set]) -> float:
+    scores = [len(a & b) / len(a | b) for a, b in itertools.combinations(sets, 2)]
+    return float(np.mean(scores)) if scores else 1.0
+
+
+def _weight_std(explanations: Sequence[Dict[str, Any]]) -> float:
+    """
+    Mean standard deviation of each feature's weight across repeated runs
+    (features missing from a run count as weight 0).
+    """
+    per_run = [
+        {item["feature"]: item["weight"] for item in exp["contributions"]}
+        for exp in explanations
+    ]
+    features = set().union(*per_run)
+    stds = [np.std([run.get(feature, 0.0) for run in per_run]) for feature in features]
+    return float(np.mean(stds))
+
+
+def run_lime_budget_report(
+    budgets: Sequence[int] = (250, 500, 1000, 2000, 5000),
+    n_instances: int = 5,
+    n_repeats: int = 5,
+    top_k: int = 5,
+) -> List[Dict[str, Any]]:
+    """
+    Measure LIME latency against explanation stability for each sample budget,
+    for both the standard (`explain_instance`) and fast (template) paths.
+
+    Stability is measured over `n_repeats` independent neighbourhoods per
+    instance: fresh LIME sampling for the standard path, and templates drawn
+    with different seeds for the fast path (a single template is fully
+    deterministic across requests).
+    """
+    X_train, _ = load_training_data()
+    lime_explainer = load_lime_explainer()
+    forest = load_compiled_forest()
+    instances = X_train.sample(n_instances, random_state=0).to_numpy()
+    predictions = forest.predict(instances)
+    num_features = min(10, X_train.shape[1])
+
+    results: List[Dict[str, Any]] = []
+    for budget in budgets:
+        for mode in ("standard", "fast"):
+            templates = [None] * n_repeats
+            if mode == "fast":
+                templates = [
+                    build_lime_template(lime_explainer, budget, random_state=seed)
+                    for seed in range(n_repeats)
+                ]
+
+            timings: List[float] = []
+            jaccards: List[float] = []
+            stds: List[float] = []
+            for instance, prediction in zip(instances, predictions):
+                explanations = []
+                for template in templates:
+                    start = time.perf_counter()
+                    explanations.append(
+                        get_local_lime_explanation(
+                            lime_explainer=lime_explainer,
+                            model_predict_fn=forest.predict,
+                            instance=instance,
+                            num_features=num_features,
+                            num_samples=budget,
+                            prediction=float(prediction),
+                            template=template,
+                        )
+                    )
+                    timings.append(time.perf_counter() - start)
+                jaccards.append(_mean_pairwise_jaccard([_top_k(e, top_k) for e in explanations]))
+                stds.append(_weight_std(explanations))
+
+            results.append(
+                {
+                    "mode": mode,
+                    "num_samples": budget,
+                    "latency_ms_median": float(np.median(timings)) * 1e3,
+                    "latency_ms_p95": float(np.percentile(timings, 95)) * 1e3,
+                    "top_k_jaccard": float(np.mean(jaccards)),
+                    "weight_std": float(np.mean(stds)),
+                }
+            )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Report LIME latency vs explanation stability per sample budget."
+    )
+    parser.add_argument(
+        "--budgets", type=int, nargs="+", default=[250, 500, 1000, 2000, 5000]
+    )
+    parser.add_argument("--instances", type=int, default=5)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--top-k", type=int, default=5)
+    args = parser.parse_args()
+
+    results = run_lime_budget_report(args.budgets, args.instances, args.repeats, args.top_k)
+
+    print(
+        f"{'mode':>9} {'samples':>8} {'p50 ms':>8} {'p95 ms':>8} "
+        f"{'top-' + str(args.top_k) + ' jaccard':>15} {'weight std':>11}"
+    )
+    for row in results:
+        print(
+            f"{row['mode']:>9} {row['num_samples']:>8} {row['latency_ms_median']:>8.1f} "
+            f"{row['latency_ms_p95']:>8.1f} {row['top_k_jaccard']:>15.3f} {row['weight_std']:>11.4f}"
+        )
+
+
+if __name__ == "__main__":
+    # `python -m backend.benchmarks.lime_budget`
+    main()
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+MODES = ("mmap", "pickle")
+
+
+def _read_smaps_rollup() -> Dict[str, int]:
+    """
+    Rss / Pss / private memory of the current process in KiB, from
+    /proc/self/smaps_rollup (Linux only).
+    """
+    fields: Dict[str, int] = {}
+    with open("/proc/self/smaps_rollup") as handle:
+        for line in handle:
+            parts = line.split()
+            if len(parts) >= 3 and parts[-1] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1])
+    return {
+        "rss_kb": fields.get("Rss", 0),
+        "pss_kb": fields.get("Pss", 0),
+        "private_kb": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+    }
+
+
+def _load_and_touch(mode: str) -> None:
+    """
+    Load the forest and training data the way an API worker would and read
+    every page, so mapped files are actually resident.
+    """
+    from ..model.versions import current_layout
+
+    layout = current_layout()
+    if mode == "mmap":
+        from ..model.shared import load_shared_forest, load_shared_training_data
+
+        forest = load_shared_forest(layout.shared_dir)
+        X_train, y_train = load_shared_training_data(layout.shared_dir)
+    else:
+        import joblib
+
+        from ..model.inference import FlatForest
+
+        forest = FlatForest.from_sklearn(joblib.load(layout.model_path))
+        train_data = joblib.load(layout.train_data_path)
+        X_train, y_train = train_data["X_train"], train_data["y_train"]
+
+    for name in forest.array_names:
+        np.asarray(getattr(forest, name)).sum()
+    X_train.to_numpy().sum()
+    y_train.to_numpy().sum()
+
+
+def _worker(mode: str, barrier: Any, results: Any) -> None:
+    baseline = _read_smaps_rollup()
+    _load_and_touch(mode)
+    # Measure only once every process has loaded, so shared pages are
+    # accounted across all of them in Pss.
+    barrier.wait()
+    loaded = _read_smaps_rollup()
+    results.put({key: loaded[key] - baseline[key] for key in loaded})
+    barrier.wait()
+
+
+def measure(mode: str, n_processes: int) -> Dict[str, Any]:
+    """
+    Start `n_processes` spawned workers that each load the artifacts in
+    `mode`, and return the summed per-process memory added by loading.
+    """
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(n_processes)
+    results = context.Queue()
+    processes = [
+        context.Process(target=_worker, args=(mode, barrier, results)) for _ in range(n_processes)
+    ]
+    for process in processes:
+        process.start()
+    samples = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    return {
+        "mode": mode,
+        "processes": n_processes,
+        "rss_mb": sum(s["rss_kb"] for s in samples) / 1024,
+        "pss_mb": sum(s["pss_kb"] for s in samples) / 1024,
+        "private_mb": sum(s["private_kb"] for s in samples) / 1024,
+    }
+
+
+def run_memory_report(process_counts: Sequence[int] = (1, 4, 8)) -> List[Dict[str, Any]]:
+    from ..model.registry import ensure_shared_arrays
+
+    ensure_shared_arrays()
+    return [measure(mode, n) for n in process_counts for mode in MODES]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Memory added per worker by memory-mapped vs unpickled artifacts."
+    )
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 4, 8])
+    args = parser.parse_args()
+
+    print(f"{'procs':>6} {'mode':>7} {'rss MB':>9} {'pss MB':>9} {'private MB':>11}")
+    for row in run_memory_report(args.processes):
+        print(
+            f"{row['processes']:>6} {row['mode']:>7} {row['rss_mb']:>9.1f} "
+            f"{row['pss_mb']:>9.1f} {row['private_mb']:>11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    # `python -m backend.benchmarks.memory_report [--processes 1 4 8]`
+    main()
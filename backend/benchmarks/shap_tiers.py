@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..explainability.shap_service import build_shap_explainer
+from ..model.registry import load_model, load_training_data
+
+# The explainer `/predict` used before tiers existed: interventional over a
+# 300-row sample. Attribution error is measured against it.
+REFERENCE = ("interventional", 300)
+
+
+def _median_seconds(fn: Any, repeats: int) -> float:
+    fn()
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings))
+
+
+def _shap_values(explainer: Any, X: pd.DataFrame) -> np.ndarray:
+    return np.asarray(explainer.shap_values(X)).reshape(X.shape)
+
+
+def _top_k_agreement(values: np.ndarray, reference: np.ndarray, k: int) -> float:
+    """
+    Mean share of each row's top-`k` features (by |SHAP|) that match the
+    reference's.
+    """
+    top = np.argsort(-np.abs(values), axis=1)[:, :k]
+    top_ref = np.argsort(-np.abs(reference), axis=1)[:, :k]
+    return float(np.mean([len(set(a) & set(b)) / k for a, b in zip(top, top_ref)]))
+
+
+def run_shap_tier_report(
+    settings: Sequence[Tuple[str, int]],
+    n_instances: int = 100,
+    repeats: int = 5,
+    top_k: int = 3,
+) -> List[Dict[str, Any]]:
+    """
+    For each `(tier, size)` setting (size = background rows for
+    `interventional`, clusters for `kmeans`, ignored for `path`): explainer
+    build time, single-row and per-row batched latency, and attribution error
+    against `REFERENCE` on `n_instances` training rows (mean absolute
+    difference relative to the reference's mean |SHAP|, and top-k overlap).
+    """
+    model = load_model()
+    X_train, _ = load_training_data()
+    X = X_train.sample(min(n_instances, len(X_train)), random_state=1)
+    row = X.iloc[:1]
+
+    def build(tier: str, size: int) -> Any:
+        return build_shap_explainer(model, X_train, tier, background_size=size, n_clusters=size)
+
+    reference = _shap_values(build(*REFERENCE), X)
+    scale = float(np.mean(np.abs(reference)))
+
+    results = []
+    for tier, size in settings:
+        start = time.perf_counter()
+        explainer = build(tier, size)
+        build_seconds = time.perf_counter() - start
+        values = _shap_values(explainer, X)
+        results.append(
+            {
+                "tier": tier,
+                "size": size if tier != "path" else None,
+                "build_s": build_seconds,
+                "single_ms": _median_seconds(lambda: explainer.shap_values(row), repeats) * 1e3,
+                "batch_ms_per_row": _median_seconds(lambda: explainer.shap_values(X), max(1, repeats // 2))
+                * 1e3
+                / len(X),
+                "rel_error": float(np.mean(np.abs(values - reference))) / scale,
+                "top_k_agreement": _top_k_agreement(values, reference, top_k),
+            }
+        )
+    return results
+
+
+def _parse_setting(text: str) -> Tuple[str, int]:
+    tier, _, size = text.partition(":")
+    return tier, int(size or 0)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="SHAP latency vs attribution error per explainer tier and background size."
+    )
+    parser.add_argument(
+        "--settings",
+        nargs="+",
+        type=_parse_setting,
+        default=[
+            ("path", 0),
+            ("kmeans", 8),
+            ("kmeans", 16),
+            ("kmeans", 32),
+            ("interventional", 50),
+            ("interventional", 100),
+            ("interventional", 300),
+        ],
+        help="tier[:size] entries, e.g. path kmeans:16 interventional:100",
+    )
+    parser.add_argument("--instances", type=int, default=100)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--top-k", type=int, default=3)
+    args = parser.parse_args()
+
+    print(
+        f"{'tier':>15} {'size':>5} {'build s':>8} {'single ms':>10} {'batch ms/row':>13} "
+        f"{'rel err':>8} {f'top-{args.top_k}':>6}"
+    )
+    for row in run_shap_tier_report(args.settings, args.instances, args.repeats, args.top_k):
+        size = "-" if row["size"] is None else row["size"]
+        print(
+            f"{row['tier']:>15} {size:>5} {row['build_s']:>8.2f} {row['single_ms']:>10.2f} "
+            f"{row['batch_ms_per_row']:>13.3f} {row['rel_error']:>8.3f} {row['top_k_agreement']:>6.2f}"
+        )
+
+
+if __name__ == "__main__":
+    # `python -m backend.benchmarks.shap_tiers [--settings path kmeans:16 interventional:300]`
+    main()
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+# Heavy modules that importing the API must not pull in; they are loaded
+# lazily when an explanation is first needed or when training runs.
+DEFAULT_FORBIDDEN = (
+    "shap",
+    "lime",
+    "sklearn",
+    "scipy",
+    "backend.model.train_model",
+)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+def _parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """
+    Parse `python -X importtime` output into
+    {module, depth, self_us, cumulative_us} records.
+    """
+    records = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        records.append(
+            {
+                "module": name.strip(),
+                "depth": depth,
+                "self_us": int(self_us),
+                "cumulative_us": int(cumulative_us),
+            }
+        )
+    return records
+
+
+def profile_import(module: str = "backend.main") -> List[Dict[str, Any]]:
+    """
+    Import `module` in a fresh interpreter with `-X importtime` and return the
+    parsed per-module timings.
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(PROJECT_ROOT), env.get("PYTHONPATH")]))
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return _parse_importtime(completed.stderr)
+
+
+def summarize(records: Sequence[Dict[str, Any]], module: str, top: int = 15) -> Dict[str, Any]:
+    """
+    Total import time for `module`, its slowest direct imports, and self time
+    aggregated by top-level package.
+    """
+    total_us = next(r["cumulative_us"] for r in records if r["module"] == module)
+
+    by_package: Dict[str, int] = defaultdict(int)
+    for record in records:
+        by_package[record["module"].split(".")[0]] += record["self_us"]
+
+    direct = [r for r in records if r["depth"] == 1]
+    direct.sort(key=lambda r: r["cumulative_us"], reverse=True)
+
+    return {
+        "module": module,
+        "total_seconds": total_us / 1e6,
+        "direct_imports": [(r["module"], r["cumulative_us"] / 1e6) for r in direct[:top]],
+        "by_package": sorted(
+            ((name, us / 1e6) for name, us in by_package.items()),
+            key=lambda item: item[1],
+            reverse=True,
+        )[:top],
+        "loaded_modules": {r["module"] for r in records},
+    }
+
+
+def check_startup(
+    module: str = "backend.main",
+    forbidden: Sequence[str] = DEFAULT_FORBIDDEN,
+    budget_seconds: Optional[float] = None,
+    repeats: int = 3,
+) -> List[str]:
+    """
+    Profile the import `repeats` times (keeping the fastest run) and return a
+    list of problems: forbidden modules that were imported, and the total
+    exceeding `budget_seconds` if one is given. An empty list means OK.
+    """
+    summaries = [summarize(profile_import(module), module) for _ in range(max(1, repeats))]
+    best = min(summaries, key=lambda summary: summary["total_seconds"])
+    _print_summary(best)
+
+    problems = []
+    loaded = best["loaded_modules"]
+    for name in forbidden:
+        offenders = sorted(m for m in loaded if m == name or m.startswith(name + "."))
+        if offenders:
+            problems.append(f"{module} imports {name} at startup ({len(offenders)} modules)")
+    if budget_seconds is not None and best["total_seconds"] > budget_seconds:
+        problems.append(
+            f"import of {module} took {best['total_seconds']:.3f}s (budget {budget_seconds:.3f}s)"
+        )
+    return problems
+
+
+def _print_summary(summary: Dict[str, Any]) -> None:
+    print(f"import {summary['module']}: {summary['total_seconds']:.3f}s")
+    print("\nslowest direct imports (cumulative):")
+    for name, seconds in summary["direct_imports"]:
+        print(f"  {seconds * 1e3:9.1f} ms  {name}")
+    print("\nself time by top-level package:")
+    for name, seconds in summary["by_package"]:
+        print(f"  {seconds * 1e3:9.1f} ms  {name}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Import-time breakdown of the API and a startup regression check."
+    )
+    parser.add_argument("--module", default="backend.main")
+    parser.add_argument(
+        "--budget-seconds",
+        type=float,
+        default=None,
+        help="Fail if the import takes longer than this (fastest of --repeats runs).",
+    )
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument(
+        "--allow",
+        nargs="*",
+        default=[],
+        help="Modules to drop from the forbidden list.",
+    )
+    args = parser.parse_args()
+
+    forbidden = [name for name in DEFAULT_FORBIDDEN if name not in args.allow]
+    problems = check_startup(args.module, forbidden, args.budget_seconds, args.repeats)
+
+    if problems:
+        print("\nFAILED:")
+        for problem in problems:
+            print(f"  - {problem}")
+        sys.exit(1)
+    print("\nOK: no heavy modules imported at startup")
+
+
+if __name__ == "__main__":
+    # `python -m backend.benchmarks.startup_profile [--budget-seconds 2.0]`
+    main()
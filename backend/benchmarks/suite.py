@@ -0,0 +1,289 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# Longest the API case waits for `/ready` before giving up.
+READY_TIMEOUT_SECONDS = 600.0
+
+# Representative raw scenario for the end-to-end /predict case.
+SAMPLE_PAYLOAD = {
+    "gdp_per_capita": 25_000.0,
+    "industrial_output": 800.0,
+    "population": 5_000_000.0,
+    "vehicle_count": 1_500_000.0,
+    "energy_consumption": 3_000.0,
+    "renewable_share": 25.0,
+    "engine_size": 2.0,
+    "fuel_consumption": 7.5,
+    "cylinders": 4.0,
+}
+
+
+def _median_seconds(fn: Callable[[], Any], repeats: int, warmup: int = 1) -> float:
+    for _ in range(warmup):
+        fn()
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings))
+
+
+def bench_predict(repeats: int) -> Dict[str, float]:
+    from ..model.features import BASE_FEATURE_COLUMNS
+    from ..model.registry import load_compiled_forest, load_training_data
+    from ..model.sweep import sweep_feature_matrix
+
+    forest = load_compiled_forest()
+    X_train, _ = load_training_data()
+    X = np.ascontiguousarray(np.tile(X_train.to_numpy(), (1 + 1000 // len(X_train), 1))[:1000])
+    row = X[:1]
+    # 1000-point what-if curve over renewable_share around SAMPLE_PAYLOAD.
+    sweep = sweep_feature_matrix(
+        np.array([SAMPLE_PAYLOAD[name] for name in BASE_FEATURE_COLUMNS]),
+        [("renewable_share", np.linspace(0.0, 100.0, 1000))],
+    )
+    return {
+        "predict_single": _median_seconds(lambda: forest.predict(row), repeats * 10),
+        "predict_batch_1000": _median_seconds(lambda: forest.predict(X), repeats),
+        "predict_sweep_1000": _median_seconds(lambda: forest.predict_sweep(sweep), repeats),
+    }
+
+
+def bench_explanations(repeats: int) -> Dict[str, float]:
+    import pandas as pd
+
+    from ..config import LIME_NUM_SAMPLES
+    from ..explainability.lime_service import get_local_lime_explanation
+    from ..explainability.shap_service import get_local_shap_explanation
+    from ..model.registry import (
+        FEATURE_COLUMNS,
+        get_lime_template,
+        load_compiled_forest,
+        load_lime_explainer,
+        load_shap_explainer,
+        load_training_data,
+    )
+
+    forest = load_compiled_forest()
+    shap_explainer = load_shap_explainer()
+    lime_explainer = load_lime_explainer()
+    template = get_lime_template(LIME_NUM_SAMPLES)
+    X_train, _ = load_training_data()
+    instance = X_train.to_numpy()[0]
+    instance_df = pd.DataFrame(instance.reshape(1, -1), columns=FEATURE_COLUMNS)
+    prediction = float(forest.predict(instance.reshape(1, -1))[0])
+
+    def lime(template_or_none: Any) -> Callable[[], Any]:
+        return lambda: get_local_lime_explanation(
+            lime_explainer=lime_explainer,
+            model_predict_fn=forest.predict,
+            instance=instance,
+            num_features=min(10, len(FEATURE_COLUMNS)),
+            num_samples=LIME_NUM_SAMPLES,
+            prediction=prediction,
+            template=template_or_none,
+        )
+
+    return {
+        "shap_single": _median_seconds(lambda: get_local_shap_explanation(shap_explainer, instance_df), repeats),
+        "lime_single_fast": _median_seconds(lime(template), repeats),
+        "lime_single_standard": _median_seconds(lime(None), max(1, repeats // 2)),
+    }
+
+
+def bench_api_predict(repeats: int, ready_timeout: float = READY_TIMEOUT_SECONDS) -> Dict[str, float]:
+    from fastapi.testclient import TestClient
+
+    from ..main import app, explanation_cache
+
+    with TestClient(app) as client:
+        deadline = time.monotonic() + ready_timeout
+        while (ready := client.get("/ready")).status_code != 200:
+            if time.monotonic() > deadline or ready.json().get("error"):
+                raise RuntimeError(f"API not ready after {ready_timeout:.0f}s: {ready.text}")
+            time.sleep(0.1)
+
+        def request() -> None:
+            response = client.post("/predict", json=SAMPLE_PAYLOAD)
+            response.raise_for_status()
+
+        def uncached() -> None:
+            explanation_cache.clear()
+            request()
+
+        return {
+            "api_predict_uncached": _median_seconds(uncached, repeats),
+            "api_predict_cached": _median_seconds(request, repeats * 10),
+        }
+
+
+_COLD_START_SCRIPT = """
+import time
+start = time.perf_counter()
+from backend.model.registry import load_artifacts, load_compiled_forest
+load_artifacts()
+load_compiled_forest()
+print(time.perf_counter() - start)
+"""
+
+
+def bench_cold_start(repeats: int) -> Dict[str, float]:
+    """
+    Artifact load (all of `load_artifacts` plus the compiled forest) in a
+    fresh interpreter, including the imports it triggers.
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(PROJECT_ROOT), env.get("PYTHONPATH")]))
+
+    def run() -> float:
+        completed = subprocess.run(
+            [sys.executable, "-c", _COLD_START_SCRIPT],
+            cwd=PROJECT_ROOT,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return float(completed.stdout.strip().splitlines()[-1])
+
+    return {"cold_start_load": float(np.median([run() for _ in range(max(1, repeats // 2))]))}
+
+
+def bench_training(sizes: Sequence[int]) -> Dict[str, float]:
+    from ..model.train_model import train_random_forest_with_explainability
+
+    results = {}
+    for n_samples in sizes:
+        start = time.perf_counter()
+        train_random_forest_with_explainability(n_samples=n_samples)
+        results[f"train_{n_samples}"] = time.perf_counter() - start
+    return results
+
+
+CASES = ("predict", "explain", "api", "cold_start", "training")
+
+
+def run_suite(
+    cases: Sequence[str] = CASES,
+    repeats: int = 5,
+    training_sizes: Sequence[int] = (1_000, 5_000, 20_000),
+) -> Dict[str, Any]:
+    """
+    Run the selected benchmark cases and return a JSON-ready report:
+    `{"environment": {...}, "results": {benchmark: median seconds}}`.
+    """
+    runners: Dict[str, Callable[[], Dict[str, float]]] = {
+        "predict": lambda: bench_predict(repeats),
+        "explain": lambda: bench_explanations(repeats),
+        "api": lambda: bench_api_predict(repeats),
+        "cold_start": lambda: bench_cold_start(repeats),
+        "training": lambda: bench_training(training_sizes),
+    }
+    results: Dict[str, float] = {}
+    for case in cases:
+        print(f"running {case}...", file=sys.stderr, flush=True)
+        results.update(runners[case]())
+
+    from ..config import ADMISSION_CONTROL, EXPLAIN_WORKERS
+
+    return {
+        "environment": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+            "explain_workers": EXPLAIN_WORKERS,
+            "admission_control": ADMISSION_CONTROL,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def compare(
+    current: Dict[str, float],
+    baseline: Dict[str, float],
+    threshold: float = 0.2,
+    min_delta_seconds: float = 0.001,
+) -> List[Dict[str, Any]]:
+    """
+    Compare benchmark results against a baseline.
+
+    A benchmark regresses when it is more than `threshold` (relative) slower
+    than the baseline and the absolute difference exceeds `min_delta_seconds`
+    (so sub-millisecond noise does not fail the check). Benchmarks missing
+    from either side are reported but never regress.
+    """
+    rows = []
+    for name in sorted(set(current) | set(baseline)):
+        now, before = current.get(name), baseline.get(name)
+        ratio = now / before if now is not None and before else None
+        regressed = (
+            ratio is not None
+            and ratio > 1 + threshold
+            and now - before > min_delta_seconds
+        )
+        rows.append({"name": name, "current": now, "baseline": before, "ratio": ratio, "regressed": regressed})
+    return rows
+
+
+def _format_seconds(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value * 1e3:.2f} ms"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark suite for prediction, explanation, API, cold-start and training hot paths."
+    )
+    parser.add_argument("--cases", nargs="+", choices=CASES, default=list(CASES))
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--training-sizes", type=int, nargs="+", default=[1_000, 5_000, 20_000])
+    parser.add_argument("--output", type=Path, default=None, help="Write the results JSON here.")
+    parser.add_argument("--baseline", type=Path, default=None, help="Results JSON to compare against.")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative slowdown (0.2 = 20%%).")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="Ignore slowdowns smaller than this.")
+    args = parser.parse_args()
+
+    # Explanations run in-process, so the api case measures the request path
+    # rather than pool start-up, and always in full (no admission control
+    # degrading them). Set before any case imports backend.config.
+    os.environ.setdefault("EXPLAIN_WORKERS", "0")
+    os.environ.setdefault("ADMISSION_CONTROL", "false")
+    report = run_suite(args.cases, args.repeats, args.training_sizes)
+    if args.output is not None:
+        args.output.write_text(json.dumps(report, indent=2))
+
+    baseline = json.loads(args.baseline.read_text())["results"] if args.baseline else {}
+    rows = compare(report["results"], baseline, args.threshold, args.min_delta_ms / 1e3)
+
+    print(f"{'benchmark':<24} {'current':>12} {'baseline':>12} {'ratio':>7}")
+    for row in rows:
+        ratio = "-" if row["ratio"] is None else f"{row['ratio']:.2f}x"
+        flag = "  REGRESSION" if row["regressed"] else ""
+        print(
+            f"{row['name']:<24} {_format_seconds(row['current']):>12} "
+            f"{_format_seconds(row['baseline']):>12} {ratio:>7}{flag}"
+        )
+
+    regressions = [row["name"] for row in rows if row["regressed"]]
+    if regressions:
+        print(f"\nFAILED: {len(regressions)} regression(s) over {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    # `python -m backend.benchmarks.suite --output bench.json [--baseline baseline.json]`
+    main()
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from sklearn.model_selection import train_test_split
+
+from ..model.constants import FEATURE_COLUMNS, TARGET_COLUMN
+from ..model.cv_scheduler import fit_cv_and_final_model
+from ..model.data import generate_synthetic_emission_data
+
+SCHEDULES = {
+    "sequential": {"sequential": True},
+    "parallel": {},
+    "parallel+reuse": {"reuse_fold_models": True},
+}
+
+
+def run_training_benchmark(
+    sizes: Sequence[int] = (1_000, 100_000, 1_000_000),
+    n_estimators: int = 200,
+    n_cores: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Time cross-validation + final fit for each schedule at each dataset size.
+
+    Also checks each schedule against the sequential one: CV scores must
+    always match, test predictions only when the final model is refitted
+    (`parallel+reuse` assembles a different forest by design).
+    """
+    results: List[Dict[str, Any]] = []
+    for n_samples in sizes:
+        df = generate_synthetic_emission_data(n_samples=n_samples)
+        X_train, X_test, y_train, _ = train_test_split(
+            df[FEATURE_COLUMNS], df[TARGET_COLUMN], test_size=0.2, random_state=42
+        )
+
+        reference = None
+        for name, options in SCHEDULES.items():
+            start = time.perf_counter()
+            model, cv_scores = fit_cv_and_final_model(
+                X_train, y_train, n_estimators=n_estimators, n_cores=n_cores, **options
+            )
+            seconds = time.perf_counter() - start
+
+            predictions = model.predict(X_test)
+            if reference is None:
+                reference = (seconds, cv_scores, predictions)
+            results.append(
+                {
+                    "n_samples": n_samples,
+                    "schedule": name,
+                    "seconds": seconds,
+                    "speedup": reference[0] / seconds,
+                    "cv_identical": cv_scores == reference[1],
+                    "predictions_identical": bool(np.array_equal(predictions, reference[2])),
+                    "cv_mae_mean": float(np.mean(cv_scores)),
+                }
+            )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Training wall time: sequential CV loop vs fold-parallel scheduler."
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--n-estimators", type=int, default=200)
+    parser.add_argument("--cores", type=int, default=None, help="Core budget (default: all).")
+    args = parser.parse_args()
+
+    print(f"cores: {args.cores or os.cpu_count()}, trees per forest: {args.n_estimators}")
+    print(f"{'rows':>9} {'schedule':>15} {'seconds':>9} {'speedup':>8} {'same CV':>8} {'same preds':>11}")
+    for row in run_training_benchmark(args.sizes, args.n_estimators, args.cores):
+        print(
+            f"{row['n_samples']:>9} {row['schedule']:>15} {row['seconds']:>9.2f} "
+            f"{row['speedup']:>7.2f}x {str(row['cv_identical']):>8} "
+            f"{str(row['predictions_identical']):>11}"
+        )
+
+
+if __name__ == "__main__":
+    # `python -m backend.benchmarks.training [--sizes 1000 100000] [--cores 8]`
+    main()
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import List
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _env_int_list(name: str, default: List[int]) -> List[int]:
+    value = os.getenv(name)
+    if not value:
+        return list(default)
+    return [int(item) for item in value.split(",") if item.strip()]
+
+
+def _available_cpus() -> int:
+    """
+    CPUs this process may use: the cgroup CPU quota (containers) if there is
+    one, else the host's core count.
+    """
+    try:
+        quota, period = Path("/sys/fs/cgroup/cpu.max").read_text().split()[:2]
+        if quota != "max":
+            return max(1, int(int(quota) // int(period)))
+    except (OSError, ValueError):
+        pass
+    return os.cpu_count() or 1
+
+
+# LIME: number of perturbation samples per explanation, and whether to use the
+# fast path built on precomputed perturbation templates.
+LIME_NUM_SAMPLES = int(os.getenv("LIME_NUM_SAMPLES", "5000"))
+LIME_FAST_MODE = _env_bool("LIME_FAST_MODE", True)
+# LIME budget of the "reduced_lime" tier `/predict` drops to under load.
+LIME_DEGRADED_NUM_SAMPLES = int(os.getenv("LIME_DEGRADED_NUM_SAMPLES", "1000"))
+# Sample budgets whose perturbation templates are built at load time.
+LIME_TEMPLATE_BUDGETS = sorted(
+    set(
+        _env_int_list("LIME_TEMPLATE_BUDGETS", [500, 1000, 2000])
+        + [LIME_NUM_SAMPLES, LIME_DEGRADED_NUM_SAMPLES]
+    )
+)
+
+# SHAP explainer tier used unless a request picks another: "path"
+# (tree-path-dependent, no background), "interventional" (SHAP_BACKGROUND_SIZE
+# sampled training rows) or "kmeans" (SHAP_KMEANS_CLUSTERS cluster centers).
+SHAP_TIER = os.getenv("SHAP_TIER", "interventional")
+SHAP_BACKGROUND_SIZE = int(os.getenv("SHAP_BACKGROUND_SIZE", "300"))
+SHAP_KMEANS_CLUSTERS = int(os.getenv("SHAP_KMEANS_CLUSTERS", "16"))
+
+# Prediction + explanation result cache (0 entries disables it).
+EXPLANATION_CACHE_SIZE = int(os.getenv("EXPLANATION_CACHE_SIZE", "1024"))
+EXPLANATION_CACHE_TTL_SECONDS = float(os.getenv("EXPLANATION_CACHE_TTL_SECONDS", "3600"))
+# Significant digits kept per feature when building cache keys.
+EXPLANATION_CACHE_PRECISION = int(os.getenv("EXPLANATION_CACHE_PRECISION", "6"))
+
+# Worker processes for SHAP/LIME; 0 runs explanations in the API's threadpool.
+# Each worker holds its own shap/lime/sklearn imports and explainers (about
+# 340 MB RSS with the default artifacts), so the default is small: the available
+# CPUs, at most 2. Use 0 on small-memory instances.
+EXPLAIN_WORKERS = int(os.getenv("EXPLAIN_WORKERS", str(min(_available_cpus(), 2))))
+EXPLAIN_POOL_START_METHOD = os.getenv("EXPLAIN_POOL_START_METHOD", "spawn")
+
+# Retry-After (seconds) sent with 503s while artifacts are still loading.
+READY_RETRY_AFTER_SECONDS = int(os.getenv("READY_RETRY_AFTER_SECONDS", "5"))
+
+# Cache-Control max-age for the pre-rendered metrics / feature-importance /
+# policy-insights responses (clients revalidate with If-None-Match after it).
+STATIC_RESPONSE_MAX_AGE_SECONDS = int(os.getenv("STATIC_RESPONSE_MAX_AGE_SECONDS", "60"))
+
+# Concurrent `/predict` requests are coalesced into one batched forest call and
+# one batched SHAP call: a batch is dispatched after PREDICT_COALESCE_WINDOW_MS
+# or once PREDICT_COALESCE_MAX_BATCH requests are waiting (a window of 0
+# disables coalescing).
+PREDICT_COALESCE_WINDOW_MS = float(os.getenv("PREDICT_COALESCE_WINDOW_MS", "2"))
+PREDICT_COALESCE_MAX_BATCH = int(os.getenv("PREDICT_COALESCE_MAX_BATCH", "64"))
+
+# Deferred explanations (`/predict?deferred=true`): explanation jobs allowed to
+# wait (beyond that, the prediction is returned without a job), jobs explained
+# at once, finished results kept for `/explanations/{id}`, and the longest
+# long-poll a client may ask for.
+EXPLANATION_QUEUE_SIZE = int(os.getenv("EXPLANATION_QUEUE_SIZE", "256"))
+EXPLANATION_JOB_CONCURRENCY = int(
+    os.getenv("EXPLANATION_JOB_CONCURRENCY", str(2 * max(EXPLAIN_WORKERS, 1)))
+)
+EXPLANATION_RESULTS_MAX = int(os.getenv("EXPLANATION_RESULTS_MAX", "1024"))
+EXPLANATION_MAX_WAIT_SECONDS = float(os.getenv("EXPLANATION_MAX_WAIT_SECONDS", "30"))
+
+# Load-aware degradation of `/predict` explanations (full -> reduced LIME
+# budget -> SHAP only -> prediction only). Load is the number of explanations
+# in flight or queued relative to ADMISSION_MAX_INFLIGHT, and recent
+# explanation latency relative to ADMISSION_EXPLANATION_TARGET_SECONDS.
+# Predictions slower than PREDICT_LATENCY_SLO_MS (95th percentile) drop
+# explanations altogether. Tiers recover one step per
+# ADMISSION_RECOVER_SECONDS.
+ADMISSION_CONTROL = _env_bool("ADMISSION_CONTROL", True)
+ADMISSION_MAX_INFLIGHT = int(os.getenv("ADMISSION_MAX_INFLIGHT", str(4 * max(EXPLAIN_WORKERS, 1))))
+ADMISSION_EXPLANATION_TARGET_SECONDS = float(os.getenv("ADMISSION_EXPLANATION_TARGET_SECONDS", "1.0"))
+PREDICT_LATENCY_SLO_MS = float(os.getenv("PREDICT_LATENCY_SLO_MS", "50"))
+ADMISSION_WINDOW_SECONDS = float(os.getenv("ADMISSION_WINDOW_SECONDS", "10"))
+ADMISSION_RECOVER_SECONDS = float(os.getenv("ADMISSION_RECOVER_SECONDS", "5"))
+
+# Most rows `/predict/batch` accepts in one request (larger bodies get a 422).
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "10000"))
+
+# Rows scored per micro-batch by the NDJSON streaming endpoint.
+STREAM_BATCH_SIZE = int(os.getenv("STREAM_BATCH_SIZE", "256"))
+# Longest NDJSON line it buffers; longer lines get a per-line error.
+STREAM_MAX_LINE_BYTES = int(os.getenv("STREAM_MAX_LINE_BYTES", "65536"))
+
+# Largest what-if grid `/predict/sweep` scores in one request.
+SWEEP_MAX_POINTS = int(os.getenv("SWEEP_MAX_POINTS", "10000"))
+
+# Serve the forest and training data from memory-mapped .npy files shared by
+# all worker processes (instead of per-process unpickled copies).
+ARTIFACT_MMAP = _env_bool("ARTIFACT_MMAP", True)
+# dtype of the exported training-data columns: "float64", or "float32" for half
+# the size (the forest compares in float32 anyway). SHAP backgrounds and LIME
+# statistics are always precomputed from the full-precision data.
+ARTIFACT_PRECISION = os.getenv("ARTIFACT_PRECISION", "float64")
+
+# Training: cores shared by the CV folds and the final fit (unset = all), and
+# whether to assemble the final forest from the fold models instead of refitting.
+TRAIN_CORE_BUDGET = int(os.getenv("TRAIN_CORE_BUDGET", "0")) or None
+TRAIN_REUSE_FOLD_MODELS = _env_bool("TRAIN_REUSE_FOLD_MODELS", False)
+
+# Compressed ("distilled") forest trained alongside the full one and served with
+# `model=distilled`: its MAE may exceed the full forest's by DISTILL_ACCURACY_BUDGET
+# (relative, e.g. 0.05 = 5%). For each depth cap in DISTILL_DEPTHS,
+# DISTILL_CANDIDATE_TREES trees are grown and between DISTILL_MIN_TREES and
+# DISTILL_MAX_TREES of them kept.
+DISTILL_MODEL = _env_bool("DISTILL_MODEL", True)
+DISTILL_ACCURACY_BUDGET = float(os.getenv("DISTILL_ACCURACY_BUDGET", "0.05"))
+DISTILL_DEPTHS = _env_int_list("DISTILL_DEPTHS", [4, 6, 8, 10, 12])
+DISTILL_CANDIDATE_TREES = int(os.getenv("DISTILL_CANDIDATE_TREES", "64"))
+DISTILL_MAX_TREES = int(os.getenv("DISTILL_MAX_TREES", "32"))
+DISTILL_MIN_TREES = int(os.getenv("DISTILL_MIN_TREES", "8"))
+
+# Versioned artifacts: how often running servers (and explanation workers)
+# check the current-version pointer for a new model to pre-warm and swap to
+# (0 disables hot swapping), and how many published versions to keep on disk.
+MODEL_VERSION_POLL_SECONDS = float(os.getenv("MODEL_VERSION_POLL_SECONDS", "5"))
+MODEL_VERSIONS_KEEP = int(os.getenv("MODEL_VERSIONS_KEEP", "3"))
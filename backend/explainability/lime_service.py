@@ -1,38 +1,244 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import numpy as np
 
+from ..utils.telemetry import stage_timer
+
+
+class LimePerturbationTemplate:
+    """
+    Precomputed LIME neighbourhood for a fixed sample budget.
+
+    With `discretize_continuous=True`, LIME perturbs an instance by drawing a
+    quartile bin per feature from the training distribution and sampling a
+    value inside that bin. None of this depends on the instance being
+    explained, only on which drawn bins match the instance's bins. The draws
+    are therefore made once and reused across requests.
+    """
+
+    def __init__(self, bins: np.ndarray, values: np.ndarray) -> None:
+        self.bins = bins
+        self.values = values
+
+    @property
+    def num_samples(self) -> int:
+        return self.bins.shape[0]
+
+
+# Rows of the packed array `lime_training_stats` returns.
+LIME_STATS_ROWS = ("mins", "maxs", "means", "stds", "counts")
+
+
+def build_lime_explainer(training_data: np.ndarray, feature_names: Sequence[str]) -> Any:
+    """
+    LimeTabularExplainer (regression, quartile-discretized) over the
+    training data. Imports lime.
+    """
+    from lime.lime_tabular import LimeTabularExplainer
+
+    return LimeTabularExplainer(
+        training_data=training_data,
+        feature_names=list(feature_names),
+        mode="regression",
+        discretize_continuous=True,
+        random_state=42,
+    )
+
+
+def lime_training_stats(training_data: np.ndarray) -> np.ndarray:
+    """
+    Everything `build_lime_explainer` derives from the training data, as one
+    `(len(LIME_STATS_ROWS), n_features, 4)` array: per feature and quartile
+    bin, the bin's min, max, mean, std and training-row count. Features with
+    fewer than 4 distinct bins are NaN-padded.
+    """
+    from lime.discretize import QuartileDiscretizer
+
+    n_features = training_data.shape[1]
+    discretizer = QuartileDiscretizer(training_data, [], [str(i) for i in range(n_features)])
+    discretized = discretizer.discretize(training_data)
+
+    stats = np.full((len(LIME_STATS_ROWS), n_features, 4), np.nan)
+    for feature in range(n_features):
+        n_bins = len(discretizer.means[feature])
+        stats[0, feature, :n_bins] = discretizer.mins[feature]
+        stats[1, feature, :n_bins] = discretizer.maxs[feature]
+        stats[2, feature, :n_bins] = discretizer.means[feature]
+        stats[3, feature, :n_bins] = discretizer.stds[feature]
+        stats[4, feature, :n_bins] = np.bincount(
+            discretized[:, feature].astype(int), minlength=n_bins
+        )
+    return stats
+
+
+def build_lime_explainer_from_stats(stats: np.ndarray, feature_names: Sequence[str]) -> Any:
+    """
+    The explainer `build_lime_explainer` would return, rebuilt from
+    `lime_training_stats` without the training data.
+    """
+    from lime.lime_tabular import LimeTabularExplainer
+
+    data_stats: Dict[str, Dict[int, Any]] = {
+        key: {} for key in ("mins", "maxs", "means", "stds", "bins", "feature_values", "feature_frequencies")
+    }
+    for feature in range(stats.shape[1]):
+        n_bins = int(np.count_nonzero(~np.isnan(stats[2, feature])))
+        for row, key in enumerate(LIME_STATS_ROWS[:4]):
+            data_stats[key][feature] = stats[row, feature, :n_bins].tolist()
+        # Bin edges are the upper bounds of all but the last bin.
+        data_stats["bins"][feature] = data_stats["maxs"][feature][:-1]
+        counts = stats[4, feature, :n_bins]
+        present = np.flatnonzero(counts > 0)
+        data_stats["feature_values"][feature] = present.astype(float).tolist()
+        data_stats["feature_frequencies"][feature] = counts[present].tolist()
+
+    # With statistics supplied, LIME only reads the training data's width.
+    return LimeTabularExplainer(
+        training_data=np.zeros((1, stats.shape[1])),
+        feature_names=list(feature_names),
+        mode="regression",
+        discretize_continuous=True,
+        random_state=42,
+        training_data_stats=data_stats,
+    )
+
+
+def build_lime_template(
+    lime_explainer: Any, num_samples: int, random_state: int = 42
+) -> LimePerturbationTemplate:
+    """
+    Draw a discretized perturbation template from a LimeTabularExplainer's
+    training statistics, mirroring LIME's own sampling.
+    """
+    discretizer = lime_explainer.discretizer
+    if discretizer is None:
+        raise ValueError("Fast LIME requires an explainer built with discretize_continuous=True")
+
+    rng = np.random.RandomState(random_state)
+    n_features = len(lime_explainer.feature_names)
+    bins = np.zeros((num_samples, n_features))
+    for column in range(n_features):
+        bins[:, column] = rng.choice(
+            lime_explainer.feature_values[column],
+            size=num_samples,
+            replace=True,
+            p=lime_explainer.feature_frequencies[column],
+        )
+    values = discretizer.undiscretize(bins)
+    return LimePerturbationTemplate(bins=bins, values=values)
+
+
+def build_lime_templates(
+    lime_explainer: Any, budgets: Sequence[int], random_state: int = 42
+) -> Dict[int, LimePerturbationTemplate]:
+    """
+    Build one perturbation template per sample budget.
+    """
+    return {
+        int(budget): build_lime_template(lime_explainer, int(budget), random_state)
+        for budget in budgets
+    }
+
+
+def _explain_with_template(
+    lime_explainer: Any,
+    template: LimePerturbationTemplate,
+    model_predict_fn,
+    instance: np.ndarray,
+    num_features: int,
+    prediction: Optional[float],
+) -> List[Tuple[str, float]]:
+    """
+    Equivalent of `LimeTabularExplainer.explain_instance` for regression, using
+    a precomputed neighbourhood instead of sampling a new one.
+    """
+    discretizer = lime_explainer.discretizer
+    instance_bins = discretizer.discretize(instance)
+
+    # Binary "same bin as the instance" representation; row 0 is the instance.
+    data = (template.bins == instance_bins).astype(float)
+    data[0] = 1.0
+    inverse = template.values.copy()
+    inverse[0] = instance
+
+    # Discretized features are unscaled in LIME, so distances are taken
+    # directly on the binary representation.
+    distances = np.sqrt(((data - 1.0) ** 2).sum(axis=1))
+
+    with stage_timer("lime_model_predict"):
+        if prediction is None:
+            yss = np.asarray(model_predict_fn(inverse), dtype=float)
+        else:
+            yss = np.empty(template.num_samples)
+            yss[0] = prediction
+            yss[1:] = model_predict_fn(inverse[1:])
+
+    with stage_timer("lime_fit"):
+        _, local_exp, _, _ = lime_explainer.base.explain_instance_with_data(
+            data,
+            yss[:, np.newaxis],
+            distances,
+            0,
+            num_features,
+            feature_selection=lime_explainer.feature_selection,
+        )
+
+    return [
+        (discretizer.names[feature][int(instance_bins[feature])], weight)
+        for feature, weight in local_exp
+    ]
+
 
 def get_local_lime_explanation(
     lime_explainer: Any,
     model_predict_fn,
     instance: np.ndarray,
     num_features: int = 10,
+    num_samples: int = 5000,
+    prediction: Optional[float] = None,
+    template: Optional[LimePerturbationTemplate] = None,
 ) -> Dict[str, Any]:
     """
     Generate a LIME explanation for a single instance.
 
+    If `template` is given, the fast path reuses its precomputed perturbations
+    (and its sample budget) instead of sampling `num_samples` new ones. Passing
+    the already computed `prediction` avoids scoring the instance twice.
+
     Returns a dict containing:
     - intercept
     - predicted_value
     - local_prediction (intercept + sum(weights))
     - contributions: list of {feature, weight, effect}
     """
-    explanation = lime_explainer.explain_instance(
-        data_row=instance,
-        predict_fn=model_predict_fn,
-        num_features=num_features,
-    )
+    if template is not None:
+        pairs = _explain_with_template(
+            lime_explainer=lime_explainer,
+            template=template,
+            model_predict_fn=model_predict_fn,
+            instance=instance,
+            num_features=num_features,
+            prediction=prediction,
+        )
+    else:
+        with stage_timer("lime_standard"):
+            explanation = lime_explainer.explain_instance(
+                data_row=instance,
+                predict_fn=model_predict_fn,
+                num_features=num_features,
+                num_samples=num_samples,
+            )
+        pairs = explanation.as_list()
 
     # For robustness across LIME versions, avoid relying on internal
     # intercept attributes which may change type (scalar, array, dict).
-    # Instead, compute the model prediction directly and infer an
+    # Instead, use the model prediction directly and infer an
     # effective intercept from the explanation weights.
-    prediction = float(model_predict_fn(instance.reshape(1, -1))[0])
+    if prediction is None:
+        prediction = float(model_predict_fn(instance.reshape(1, -1))[0])
 
-    pairs = explanation.as_list()
     contributions: List[Dict[str, Any]] = []
     total_weight = 0.0
 
@@ -48,13 +254,12 @@ def get_local_lime_explanation(
         )
 
     # Effective local prediction and intercept consistent with the weights
-    local_pred = prediction
+    local_pred = float(prediction)
     intercept = float(local_pred - total_weight)
 
     return {
         "intercept": intercept,
-        "predicted_value": prediction,
+        "predicted_value": float(prediction),
         "local_prediction": float(local_pred),
         "contributions": contributions,
     }
-
@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from starlette.concurrency import run_in_threadpool
+
+from ..model.registry import (
+    FEATURE_COLUMNS,
+    ModelVersion,
+    get_artifact_version,
+    get_lime_template,
+    has_distilled_model,
+    load_compiled_forest,
+    load_distilled_forest,
+    load_forest,
+    load_lime_explainer,
+    load_lime_templates,
+    load_shap_explainer,
+    model_registry,
+    pin_version,
+)
+from ..utils.telemetry import capture_stages, record_stages
+from .lime_service import get_local_lime_explanation
+from .shap_service import get_batch_shap_explanation, get_local_shap_explanations
+
+logger = logging.getLogger(__name__)
+
+# Longest a started worker waits for the rest of the pool to come up.
+WORKER_START_TIMEOUT_SECONDS = 600.0
+
+# Set in each worker by `_init_worker`.
+_startup_barrier: Any = None
+
+
+def warm_explainers(version: Optional[ModelVersion] = None) -> None:
+    """
+    Load artifacts and build explainers in the current process (for the
+    active model version by default), so the first real task does not pay
+    for it.
+    """
+    load_compiled_forest(version)
+    if has_distilled_model(version):
+        load_distilled_forest(version)
+    load_shap_explainer(version)
+    load_lime_templates(version)
+
+
+def _init_worker(startup_barrier: Any) -> None:
+    # Warm the current version, then pre-warm and swap to each newly
+    # published one in the background.
+    global _startup_barrier
+    _startup_barrier = startup_barrier
+    warm_explainers()
+    model_registry.start_watching(warm_explainers)
+
+
+def _ready() -> None:
+    # Held until every worker has initialised and taken one of these tasks,
+    # so each of `start`'s tasks lands on a different worker.
+    _startup_barrier.wait(WORKER_START_TIMEOUT_SECONDS)
+
+
+def _run_timed(version: str, fn: Callable[..., Any], *args: Any) -> Tuple[Any, List[Tuple[str, float]]]:
+    """
+    Run `fn(*args)` on model `version` and return its result with the stage
+    timings it recorded, so they can be recorded in the API process.
+    """
+    with pin_version(model_registry.get(version)), capture_stages() as stages:
+        result = fn(*args)
+    return result, stages
+
+
+def explain_lime_instance(
+    instance: np.ndarray, prediction: float, num_samples: int, fast_mode: bool, model: str = "full"
+) -> Dict[str, Any]:
+    """
+    LIME explanation for one engineered feature vector, of the `model`
+    ("full" or "distilled") forest.
+
+    Runs inside a pool worker (or in-thread when the pool is disabled) and
+    returns plain dicts so results pickle cheaply.
+    """
+    lime_explainer = load_lime_explainer()
+    forest = load_forest(model)
+
+    return get_local_lime_explanation(
+        lime_explainer=lime_explainer,
+        model_predict_fn=forest.predict,
+        instance=instance,
+        num_features=min(10, len(FEATURE_COLUMNS)),
+        num_samples=num_samples,
+        prediction=prediction,
+        template=get_lime_template(num_samples) if fast_mode else None,
+    )
+
+
+def explain_shap_instances(
+    X: np.ndarray, shap_tier: Optional[str] = None, model: str = "full"
+) -> List[Dict[str, Any]]:
+    """
+    Local SHAP explanations (as in `/predict`) for each row of an engineered
+    feature matrix, from one explainer call at `shap_tier` (default
+    `SHAP_TIER`) on the `model` forest. Used for coalesced `/predict` requests.
+    """
+    shap_explainer = load_shap_explainer(tier=shap_tier, model=model)
+    return get_local_shap_explanations(shap_explainer, pd.DataFrame(X, columns=FEATURE_COLUMNS))
+
+
+def explain_batch_shap(
+    X: np.ndarray, shap_tier: Optional[str] = None, model: str = "full"
+) -> Dict[str, Any]:
+    """
+    Batched SHAP values for an engineered feature matrix (see
+    `get_batch_shap_explanation`), at `shap_tier` (default `SHAP_TIER`) on
+    the `model` forest.
+    """
+    shap_explainer = load_shap_explainer(tier=shap_tier, model=model)
+    return get_batch_shap_explanation(shap_explainer, pd.DataFrame(X, columns=FEATURE_COLUMNS))
+
+
+class ExplanationPool:
+    """
+    Runs CPU-bound explanation work outside the API process.
+
+    With `max_workers > 0`, tasks go to a ProcessPoolExecutor whose workers
+    are pre-warmed with the artifacts, so LIME's Python loop and SHAP no longer
+    hold the server's GIL. With `max_workers == 0`, tasks run in Starlette's
+    threadpool instead (the previous behaviour).
+
+    If a worker dies (e.g. killed for memory), the pool is restarted and the
+    task retried once; if that fails too, it runs in the threadpool.
+    """
+
+    def __init__(self, max_workers: int, start_method: str = "spawn") -> None:
+        self.max_workers = int(max_workers)
+        self.start_method = start_method
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._executor is not None
+
+    def start(self) -> None:
+        """
+        Create the worker processes and block until each has loaded the
+        artifacts. No-op when the pool is disabled or already running.
+        Raises if any worker fails to initialise.
+        """
+        if self.max_workers <= 0:
+            return
+        with self._lock:
+            if self._executor is None:
+                self._executor = self._start_executor()
+
+    def _start_executor(self) -> ProcessPoolExecutor:
+        context = multiprocessing.get_context(self.start_method)
+        executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(context.Barrier(self.max_workers),),
+        )
+        # One task per worker forces every process to start and run its
+        # initializer now rather than on the first request. The tasks only
+        # finish once all workers are up; an initializer that raises breaks
+        # the pool, and `result()` re-raises that.
+        futures = [executor.submit(_ready) for _ in range(self.max_workers)]
+        try:
+            for future in futures:
+                future.result()
+        except BaseException:
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        return executor
+
+    def _restart(self, broken: ProcessPoolExecutor) -> Optional[ProcessPoolExecutor]:
+        """
+        Replace the `broken` pool with a freshly started one, unless another
+        caller already has. Returns the pool to retry on, or None if it could
+        not be started (explanations then run in the threadpool).
+        """
+        with self._lock:
+            if self._executor is broken:
+                broken.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+                try:
+                    self._executor = self._start_executor()
+                except Exception:
+                    logger.exception("Could not restart the explanation pool; explaining in-process")
+            return self._executor
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Await `fn(*args)` on a pool worker (or the threadpool if disabled),
+        on the model version active for the caller. `fn` must be a picklable
+        module-level function.
+        """
+        version = get_artifact_version()
+        executor = self._executor
+        # A broken pool (a worker died) is restarted and the task retried once.
+        for attempt in range(2):
+            if executor is None:
+                break
+            try:
+                result, stages = await asyncio.get_running_loop().run_in_executor(
+                    executor, _run_timed, version, fn, *args
+                )
+            except BrokenProcessPool:
+                if attempt:
+                    logger.exception("The restarted explanation pool broke too; explaining in-process")
+                    break
+                logger.warning("An explanation worker died; restarting the pool")
+                executor = await run_in_threadpool(self._restart, executor)
+            else:
+                record_stages(stages)
+                return result
+
+        result, stages = await run_in_threadpool(_run_timed, version, fn, *args)
+        record_stages(stages)
+        return result
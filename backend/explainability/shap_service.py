@@ -1,10 +1,90 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 import numpy as np
 import pandas as pd
 
+from ..utils.telemetry import stage_timer
+
+# Latency/fidelity tiers of the local SHAP explainer (see `build_shap_explainer`).
+SHAP_TIERS = ("path", "interventional", "kmeans")
+
+
+def kmeans_background(X: pd.DataFrame, n_clusters: int) -> pd.DataFrame:
+    """
+    Summarize `X` by `n_clusters` k-means clusters (on standardized
+    features), as `2 * n_clusters` background rows: each cluster's medoid
+    (its real row nearest the center, so engineered features stay
+    consistent) once, plus the rest shared out in proportion to cluster size.
+
+    TreeExplainer weighs background rows equally, so repetition is how the
+    cluster sizes are kept.
+    """
+    from sklearn.cluster import KMeans
+
+    values = X.to_numpy(dtype=float)
+    scaled = (values - values.mean(axis=0)) / np.where(values.std(axis=0) > 0, values.std(axis=0), 1.0)
+    n_clusters = min(n_clusters, len(X))
+    kmeans = KMeans(n_clusters=n_clusters, n_init=3, random_state=42).fit(scaled)
+    medoids = [
+        int(np.argmin(np.where(kmeans.labels_ == cluster, distances, np.inf)))
+        for cluster, distances in enumerate(kmeans.transform(scaled).T)
+    ]
+
+    weights = np.bincount(kmeans.labels_, minlength=n_clusters) / len(X)
+    extra = n_clusters * weights
+    counts = 1 + np.floor(extra).astype(int)
+    # Largest remainders get the slots lost to rounding down.
+    shortfall = 2 * n_clusters - int(counts.sum())
+    counts[np.argsort(np.floor(extra) - extra, kind="stable")[:shortfall]] += 1
+    return X.iloc[np.repeat(medoids, counts)]
+
+
+def shap_background(
+    X_train: pd.DataFrame, tier: str, background_size: int = 300, n_clusters: int = 16
+) -> pd.DataFrame:
+    """
+    Background rows of an interventional tier: `background_size` rows
+    sampled from the training data ("interventional") or its k-means summary
+    ("kmeans").
+    """
+    if tier == "interventional":
+        return X_train.sample(min(background_size, len(X_train)), random_state=42)
+    if tier == "kmeans":
+        return kmeans_background(X_train, n_clusters)
+    raise ValueError(f"SHAP tier {tier!r} has no background (expected interventional or kmeans)")
+
+
+def build_shap_explainer(
+    model: Any,
+    X_train: Optional[pd.DataFrame],
+    tier: str,
+    background_size: int = 300,
+    n_clusters: int = 16,
+    background: Optional[pd.DataFrame] = None,
+) -> Any:
+    """
+    TreeExplainer for one latency/fidelity tier:
+
+    - "path": tree-path-dependent, no background; cost does not grow with data
+    - "interventional": `background_size` rows sampled from the training data
+      (cost grows linearly with them)
+    - "kmeans": interventional over a k-means summary of the training data
+
+    A precomputed `background` (see `shap_background`) is used as is, so
+    `X_train` is then not needed.
+    """
+    import shap
+
+    if tier not in SHAP_TIERS:
+        raise ValueError(f"Unknown SHAP tier {tier!r} (expected one of {', '.join(SHAP_TIERS)})")
+    if tier == "path":
+        return shap.TreeExplainer(model, feature_perturbation="tree_path_dependent")
+    if background is None:
+        background = shap_background(X_train, tier, background_size, n_clusters)
+    return shap.TreeExplainer(model, background)
+
 
 def get_global_shap_feature_importance(global_explain: Dict[str, Any]) -> List[Dict[str, Any]]:
     """
@@ -34,6 +114,12 @@ def get_global_shap_feature_importance(global_explain: Dict[str, Any]) -> List[D
     return items
 
 
+def _expected_value(shap_explainer: Any) -> float:
+    # A scalar for interventional explainers, a 1-element array for
+    # tree-path-dependent ones.
+    return float(np.ravel(shap_explainer.expected_value)[0])
+
+
 def get_local_shap_explanation(
     shap_explainer: Any, instance_df: pd.DataFrame
 ) -> Dict[str, Any]:
@@ -42,22 +128,52 @@ def get_local_shap_explanation(
 
     Returns a dict with the base value and per-feature contribution values.
     """
-    shap_values = shap_explainer.shap_values(instance_df)
-    shap_values = np.array(shap_values)[0]  # (n_features,)
+    return get_local_shap_explanations(shap_explainer, instance_df)[0]
 
-    base_value = float(np.array(shap_explainer.expected_value))
 
-    per_feature = []
-    for feature, value in zip(instance_df.columns, shap_values):
-        per_feature.append(
-            {
-                "feature": feature,
-                "value": float(value),
-            }
-        )
+def get_local_shap_explanations(
+    shap_explainer: Any, instances_df: pd.DataFrame
+) -> List[Dict[str, Any]]:
+    """
+    Local SHAP explanations for several instances from a single explainer
+    call, each shaped like `get_local_shap_explanation`'s.
+    """
+    with stage_timer("shap"):
+        shap_values = np.asarray(shap_explainer.shap_values(instances_df))
+    shap_values = shap_values.reshape(len(instances_df), instances_df.shape[1])
+
+    base_value = _expected_value(shap_explainer)
+    features = list(instances_df.columns)
+
+    return [
+        {
+            "base_value": base_value,
+            "per_feature": [
+                {"feature": feature, "value": float(value)}
+                for feature, value in zip(features, row)
+            ],
+        }
+        for row in shap_values
+    ]
+
+
+def get_batch_shap_explanation(
+    shap_explainer: Any, instances_df: pd.DataFrame
+) -> Dict[str, Any]:
+    """
+    Compute SHAP values for many instances with a single explainer call.
+
+    Returns a compact, column-oriented dict:
+    - base_value: float
+    - feature_names: list[str]
+    - values: list of per-row contribution lists, aligned with feature_names
+    """
+    with stage_timer("shap_batch"):
+        shap_values = np.asarray(shap_explainer.shap_values(instances_df))
+    shap_values = shap_values.reshape(len(instances_df), instances_df.shape[1])
 
     return {
-        "base_value": base_value,
-        "per_feature": per_feature,
+        "base_value": _expected_value(shap_explainer),
+        "feature_names": list(instances_df.columns),
+        "values": shap_values.tolist(),
     }
-
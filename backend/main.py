@@ -1,28 +1,110 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+import asyncio
+import logging
+import os
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 import numpy as np
-import pandas as pd
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-
-from .model.registry import load_artifacts, load_baseline_model, FEATURE_COLUMNS
-from .explainability.lime_service import get_local_lime_explanation
-from .explainability.shap_service import (
-    get_global_shap_feature_importance,
-    get_local_shap_explanation,
+from fastapi.responses import JSONResponse, Response
+from pydantic import ValidationError
+from starlette.requests import Request
+from starlette.concurrency import run_in_threadpool
+
+from .config import (
+    ADMISSION_CONTROL,
+    ADMISSION_EXPLANATION_TARGET_SECONDS,
+    ADMISSION_MAX_INFLIGHT,
+    ADMISSION_RECOVER_SECONDS,
+    ADMISSION_WINDOW_SECONDS,
+    EXPLAIN_POOL_START_METHOD,
+    EXPLAIN_WORKERS,
+    EXPLANATION_CACHE_PRECISION,
+    EXPLANATION_CACHE_SIZE,
+    EXPLANATION_CACHE_TTL_SECONDS,
+    LIME_FAST_MODE,
+    EXPLANATION_JOB_CONCURRENCY,
+    EXPLANATION_MAX_WAIT_SECONDS,
+    EXPLANATION_QUEUE_SIZE,
+    EXPLANATION_RESULTS_MAX,
+    LIME_DEGRADED_NUM_SAMPLES,
+    LIME_NUM_SAMPLES,
+    PREDICT_COALESCE_MAX_BATCH,
+    PREDICT_COALESCE_WINDOW_MS,
+    PREDICT_LATENCY_SLO_MS,
+    READY_RETRY_AFTER_SECONDS,
+    SHAP_TIER,
+    STATIC_RESPONSE_MAX_AGE_SECONDS,
+    STREAM_BATCH_SIZE,
+    STREAM_MAX_LINE_BYTES,
+    SWEEP_MAX_POINTS,
+)
+from .model.features import BASE_FEATURE_COLUMNS, build_feature_frame, build_feature_matrix
+from .model.sweep import evenly_spaced_indices, sweep_feature_matrix
+from .model.registry import (
+    ModelVersion,
+    active_version,
+    artifact_readiness,
+    artifacts_missing,
+    get_artifact_version,
+    has_distilled_model,
+    load_baseline_model,
+    load_compiled_forest,
+    load_distilled_forest,
+    load_distilled_metrics,
+    load_forest,
+    load_global_explain,
+    load_metrics,
+    load_prediction_trend,
+    load_training_data,
+    model_registry,
+    pin_version,
+    train_artifacts_in_subprocess,
 )
+from .explainability.pool import (
+    ExplanationPool,
+    explain_batch_shap,
+    explain_lime_instance,
+    explain_shap_instances,
+    warm_explainers,
+)
+from .explainability.shap_service import get_global_shap_feature_importance
+from .utils.admission import AdmissionController
+from .utils.batching import MicroBatcher
+from .utils.cache import ExplanationCache
+from .utils.jobs import JobQueue
+from .utils.ndjson import NDJSONStreamingResponse, dumps_line, iter_ndjson_batches
 from .utils.policy import generate_policy_insights
+from .utils.static_responses import StaticResponseCache
+from .utils.telemetry import (
+    EXPLANATION_TIERS_TOTAL,
+    RequestMetricsMiddleware,
+    gauge_lines,
+    render_metrics,
+    stage_timer,
+)
+from .utils.versioning import MODEL_VERSION_HEADER, ModelVersionMiddleware
 from .utils.schemas import (
+    BatchPredictionRequest,
+    BatchPredictionResponse,
+    DistilledMetricsResponse,
     EmissionFeatures,
+    ExplanationJobResponse,
     FeatureImportanceResponse,
     MetricsResponse,
+    ModelVariant,
     PolicyInsightsResponse,
     PredictionResponse,
     PredictionTrendResponse,
-    TrendPoint,
+    ReadinessResponse,
     BaselinePredictionResponse,
+    ShapTier,
+    SweepRequest,
+    SweepResponse,
 )
 
 
@@ -36,8 +118,6 @@ app = FastAPI(
 )
 
 # Allow local frontend development by default (Vite, etc.)
-import os
-
 origins = [
     "http://localhost:5173",
     "http://127.0.0.1:5173",
@@ -55,26 +135,264 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[MODEL_VERSION_HEADER],
+)
+
+# Pin each request to one model version across hot swaps, and report it.
+app.add_middleware(ModelVersionMiddleware)
+
+# Per-endpoint request counts and latencies for `/metrics/runtime`.
+app.add_middleware(RequestMetricsMiddleware)
+
+# Repeated (or near-identical) scenarios skip SHAP/LIME entirely.
+explanation_cache = ExplanationCache(
+    max_entries=EXPLANATION_CACHE_SIZE,
+    ttl_seconds=EXPLANATION_CACHE_TTL_SECONDS,
+    precision=EXPLANATION_CACHE_PRECISION,
+)
+
+# Metrics, feature importance and policy insights, rendered once per
+# artifact version and served with ETags.
+static_responses = StaticResponseCache(max_age_seconds=STATIC_RESPONSE_MAX_AGE_SECONDS)
+
+# SHAP/LIME run here so they neither hold the server's GIL nor occupy the
+# threadpool that serves cheap endpoints.
+explanation_pool = ExplanationPool(
+    max_workers=EXPLAIN_WORKERS, start_method=EXPLAIN_POOL_START_METHOD
+)
+
+
+async def _predict_coalesced(key: Any, rows: List[np.ndarray]) -> List[float]:
+    version, model = key
+    forest = load_forest(model, version)
+    X = np.vstack(rows)
+    # A lone row is a cheap flat-forest walk, fine on the event loop.
+    with stage_timer("rf_predict"):
+        if len(X) == 1:
+            predictions = forest.predict(X)
+        else:
+            predictions = await run_in_threadpool(forest.predict, X)
+    return predictions.tolist()
+
+
+async def _shap_coalesced(key: Any, rows: List[np.ndarray]) -> List[Dict[str, Any]]:
+    version, shap_tier, model = key
+    with pin_version(version):
+        return await explanation_pool.run(explain_shap_instances, np.vstack(rows), shap_tier, model)
+
+
+# Concurrent `/predict` requests share one forest call and one SHAP call per
+# model version and forest (and SHAP tier); LIME stays per request.
+predict_batcher = MicroBatcher(
+    "rf_predict",
+    _predict_coalesced,
+    max_batch_size=PREDICT_COALESCE_MAX_BATCH,
+    max_wait_seconds=PREDICT_COALESCE_WINDOW_MS / 1000,
+)
+shap_batcher = MicroBatcher(
+    "shap",
+    _shap_coalesced,
+    max_batch_size=PREDICT_COALESCE_MAX_BATCH,
+    max_wait_seconds=PREDICT_COALESCE_WINDOW_MS / 1000,
 )
 
 
+async def _explain(
+    instance: np.ndarray,
+    prediction: float,
+    version: ModelVersion,
+    shap_tier: str,
+    tier: str,
+    model: str = "full",
+) -> Dict[str, Any]:
+    """
+    LIME and SHAP of the `model` forest for one instance, as far as
+    explanation `tier` includes them (the rest are None).
+
+    LIME runs on the explanation pool alongside the coalesced SHAP batch.
+    The `explanation` stage includes queueing; LIME and SHAP themselves are
+    timed in the worker.
+    """
+    if tier == "prediction_only":
+        return {"lime_explanation": None, "shap_values": None}
+
+    async def lime() -> Optional[Dict[str, Any]]:
+        if tier == "shap_only":
+            return None
+        num_samples = LIME_NUM_SAMPLES if tier == "full" else LIME_DEGRADED_NUM_SAMPLES
+        return await explanation_pool.run(
+            explain_lime_instance, instance, prediction, num_samples, LIME_FAST_MODE, model
+        )
+
+    with admission.track_explanation(), stage_timer("explanation"):
+        lime_exp, shap_exp = await asyncio.gather(
+            lime(), shap_batcher.submit(instance, key=(version, shap_tier, model))
+        )
+    return {"lime_explanation": lime_exp, "shap_values": shap_exp}
+
+
+async def _explain_deferred(
+    job: Tuple[np.ndarray, float, ModelVersion, str, str, str, Any]
+) -> Dict[str, Any]:
+    instance, prediction, version, shap_tier, tier, model, cache_key = job
+    with pin_version(version):
+        explanations = await _explain(instance, prediction, version, shap_tier, tier, model)
+    if tier == "full":
+        explanation_cache.put(cache_key, {"prediction": prediction, **explanations})
+    return explanations
+
+
+# Background explanations for `/predict?deferred=true`, fetched from
+# `/explanations/{id}`. Job ids are local to this server process.
+explanation_jobs = JobQueue(
+    "explanation_job",
+    _explain_deferred,
+    max_queued=EXPLANATION_QUEUE_SIZE,
+    concurrency=EXPLANATION_JOB_CONCURRENCY,
+    max_results=EXPLANATION_RESULTS_MAX,
+)
+
+# Steps explanation effort down under load (and back up), so predictions
+# keep their latency SLO when explanation demand exceeds capacity.
+admission = AdmissionController(
+    max_inflight=ADMISSION_MAX_INFLIGHT,
+    explanation_target_seconds=ADMISSION_EXPLANATION_TARGET_SECONDS,
+    prediction_slo_seconds=PREDICT_LATENCY_SLO_MS / 1000,
+    window_seconds=ADMISSION_WINDOW_SECONDS,
+    recover_seconds=ADMISSION_RECOVER_SECONDS,
+    queue_depth=lambda: explanation_jobs.stats()["queued"],
+    enabled=ADMISSION_CONTROL,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+def _warm_version(version: ModelVersion) -> None:
+    """
+    Load what the API process serves from `version` and pre-render its
+    static responses, before any request is routed to it.
+    """
+    with pin_version(version):
+        load_training_data()
+        load_metrics()
+        load_global_explain()
+        load_prediction_trend()
+        distilled = has_distilled_model()
+        # Pre-render so the first dashboard load is served from bytes too.
+        for name, render in STATIC_RESPONSES.items():
+            if name != "metrics/distilled" or distilled:
+                static_responses.get(name, version.version, render)
+        load_compiled_forest()
+        if distilled:
+            load_distilled_forest()
+
+
+def _prewarm_next_version(version: ModelVersion) -> None:
+    # Runs in the registry's watcher thread while the current version keeps
+    # serving. Pool workers pre-warm their explainers in their own watchers;
+    # without a pool, explainers are built here instead of on first use.
+    _warm_version(version)
+    if not explanation_pool.running:
+        warm_explainers(version)
+
+
+def _prepare_artifacts() -> None:
+    """
+    Build (if missing), load and warm all artifacts, recording each stage in
+    `artifact_readiness` for the `/ready` endpoint. Afterwards, newly
+    published model versions are pre-warmed and swapped in as they appear.
+    """
+    try:
+        if artifacts_missing():
+            train_artifacts_in_subprocess()
+
+        artifact_readiness.set_stage("loading")
+        version = model_registry.current()
+        _warm_version(version)
+
+        # Explainers are pre-warmed in the pool workers, or here without a
+        # pool, so the first explanation request does not build them.
+        artifact_readiness.set_stage("warming")
+        explanation_pool.start()
+        if not explanation_pool.running:
+            warm_explainers(version)
+
+        artifact_readiness.set_stage("ready")
+        model_registry.start_watching(_prewarm_next_version)
+    except Exception as exc:
+        logger.exception("Artifact preparation failed")
+        artifact_readiness.fail(exc)
+
+
 @app.on_event("startup")
 def _load_model_on_startup() -> None:
-    # Trigger lazy loading and training if needed
-    load_artifacts()
+    # Return immediately; model endpoints answer 503 until this completes.
+    threading.Thread(
+        target=_prepare_artifacts, name="artifact-loader", daemon=True
+    ).start()
+
+
+def _require_model(model: str) -> None:
+    """
+    404 for `model="distilled"` on a version trained without a distilled
+    forest (e.g. with DISTILL_MODEL off, or before it existed).
+    """
+    if model == "distilled" and not has_distilled_model():
+        raise HTTPException(
+            status_code=404,
+            detail=f"Model version {get_artifact_version()} has no distilled model",
+        )
+
+
+async def require_artifacts_ready() -> None:
+    """
+    Dependency for model endpoints: fail fast with 503 + Retry-After while the
+    artifacts are still being built or loaded.
+    """
+    if not artifact_readiness.ready:
+        snapshot = artifact_readiness.snapshot()
+        raise HTTPException(
+            status_code=503,
+            detail={
+                "message": "Model artifacts are not ready yet",
+                "stage": snapshot["stage"],
+                "detail": snapshot["detail"],
+            },
+            headers={"Retry-After": str(READY_RETRY_AFTER_SECONDS)},
+        )
+
+
+@app.on_event("shutdown")
+async def _stop_explanation_pool() -> None:
+    await explanation_jobs.stop()
+    explanation_pool.shutdown()
 
 
 @app.get("/health")
-def health() -> Dict[str, str]:
+async def health() -> Dict[str, str]:
     return {"status": "ok"}
 
 
-@app.get("/metrics", response_model=MetricsResponse)
-def get_metrics() -> MetricsResponse:
-    model, X_train, y_train, metrics, global_explain, shap_explainer, lime_explainer = (
-        load_artifacts()
+@app.get("/ready", response_model=ReadinessResponse)
+async def ready() -> JSONResponse:
+    """
+    Readiness probe: 200 once artifacts are loaded and explainers warmed,
+    otherwise 503 with the current build/load stage.
+    """
+    snapshot = artifact_readiness.snapshot()
+    if snapshot["ready"]:
+        return JSONResponse(snapshot)
+    return JSONResponse(
+        snapshot,
+        status_code=503,
+        headers={"Retry-After": str(READY_RETRY_AFTER_SECONDS)},
     )
 
+
+def _render_metrics() -> MetricsResponse:
+    metrics = load_metrics()
+
     return MetricsResponse(
         r2=metrics["r2"],
         rmse=metrics["rmse"],
@@ -84,12 +402,7 @@ def get_metrics() -> MetricsResponse:
     )
 
 
-@app.get("/metrics/baseline", response_model=MetricsResponse)
-def get_baseline_metrics() -> MetricsResponse:
-    """
-    Metrics for the Linear Regression baseline model, trained on the same split
-    as the Random Forest model. CV fields are left as NaN.
-    """
+def _render_baseline_metrics() -> MetricsResponse:
     lr_model, lr_metrics = load_baseline_model()
     return MetricsResponse(
         r2=lr_metrics["r2"],
@@ -100,105 +413,256 @@ def get_baseline_metrics() -> MetricsResponse:
     )
 
 
-@app.get("/feature-importance", response_model=FeatureImportanceResponse)
-def feature_importance() -> FeatureImportanceResponse:
-    model, X_train, y_train, metrics, global_explain, shap_explainer, lime_explainer = (
-        load_artifacts()
-    )
+def _render_distilled_metrics() -> DistilledMetricsResponse:
+    return DistilledMetricsResponse(**load_distilled_metrics())
+
+
+def _render_feature_importance() -> FeatureImportanceResponse:
+    global_explain = load_global_explain()
     items = get_global_shap_feature_importance(global_explain)
     return FeatureImportanceResponse(items=items)
 
 
-@app.get("/prediction-trend", response_model=PredictionTrendResponse)
-def prediction_trend(limit: int = 100) -> PredictionTrendResponse:
+def _render_policy_insights() -> PolicyInsightsResponse:
+    global_explain = load_global_explain()
+    X_train, y_train = load_training_data()
+    insights_raw = generate_policy_insights(global_explain, X_train, y_train)
+    return PolicyInsightsResponse(insights=insights_raw)
+
+
+# Responses that only change with the artifacts, served from pre-rendered bytes.
+STATIC_RESPONSES = {
+    "metrics": _render_metrics,
+    "metrics/baseline": _render_baseline_metrics,
+    "metrics/distilled": _render_distilled_metrics,
+    "feature-importance": _render_feature_importance,
+    "policy-insights": _render_policy_insights,
+}
+
+
+def _static_response(request: Request, name: str) -> Response:
+    return static_responses.respond(
+        request, name, get_artifact_version(), STATIC_RESPONSES[name]
+    )
+
+
+@app.get(
+    "/metrics",
+    response_model=MetricsResponse,
+    dependencies=[Depends(require_artifacts_ready)],
+)
+async def get_metrics(request: Request) -> Response:
+    return _static_response(request, "metrics")
+
+
+@app.get("/metrics/runtime")
+async def runtime_metrics() -> Response:
     """
-    Return a small slice of (true, predicted) pairs for visualization.
+    Runtime telemetry in Prometheus text format: per-stage timings of the
+    prediction/explanation hot path, per-endpoint request counts and
+    latencies, artifact load progress, explanation cache and deferred
+    explanation job stats. (Model quality stays at `/metrics`.)
     """
-    model, X_train, y_train, metrics, global_explain, shap_explainer, lime_explainer = (
-        load_artifacts()
+    readiness = artifact_readiness.snapshot()
+    cache = explanation_cache.stats()
+    extra = gauge_lines(
+        "carbon_artifact_stage_started_seconds",
+        "Seconds after startup at which each artifact build/load stage began.",
+        [({"stage": item["stage"]}, item["at_seconds"]) for item in readiness["history"]],
+    )
+    extra += gauge_lines(
+        "carbon_artifacts_ready", "1 once artifacts are loaded and explainers warmed.",
+        [({}, 1.0 if readiness["ready"] else 0.0)],
+    )
+    if readiness["ready"]:
+        extra += gauge_lines(
+            "carbon_model_version_info", "Model version currently served (value is always 1).",
+            [({"version": model_registry.current().version}, 1.0)],
+        )
+    extra += gauge_lines(
+        "carbon_explanation_cache",
+        "Explanation cache size and cumulative hits, misses and evictions.",
+        [({"stat": stat}, cache[stat]) for stat in ("size", "max_entries", "hits", "misses", "evictions")],
+    )
+    extra += gauge_lines(
+        "carbon_admission",
+        "Admission control: explanation tier level (0 = full), load pressure and explanations in flight.",
+        [({"stat": stat}, value) for stat, value in admission.snapshot().items()],
+    )
+    jobs = explanation_jobs.stats()
+    extra += gauge_lines(
+        "carbon_explanation_jobs",
+        "Deferred explanation jobs: queued, pending (queued or running) and stored results, "
+        "and cumulative submitted, rejected (queue full) and evicted.",
+        [({"stat": stat}, value) for stat, value in jobs.items()],
+    )
+    return Response(
+        render_metrics(extra), media_type="text/plain; version=0.0.4; charset=utf-8"
     )
 
-    # Use a held-out slice from the end of training data for a simple trend
-    n = min(limit, len(X_train))
-    X_slice = X_train.tail(n)
-    y_slice = y_train.tail(n)
-    y_pred = model.predict(X_slice)
 
-    points: List[TrendPoint] = []
-    for idx, true_val, pred_val in zip(
-        X_slice.index, y_slice.values, y_pred
-    ):
-        points.append(
-            TrendPoint(
-                index=int(idx),
-                true_value=float(true_val),
-                predicted_value=float(pred_val),
-            )
-        )
+@app.get(
+    "/metrics/baseline",
+    response_model=MetricsResponse,
+    dependencies=[Depends(require_artifacts_ready)],
+)
+async def get_baseline_metrics(request: Request) -> Response:
+    """
+    Metrics for the Linear Regression baseline model, trained on the same split
+    as the Random Forest model. CV fields are NaN (serialized as null).
+    """
+    return _static_response(request, "metrics/baseline")
 
-    return PredictionTrendResponse(points=points)
+
+@app.get(
+    "/metrics/distilled",
+    response_model=DistilledMetricsResponse,
+    dependencies=[Depends(require_artifacts_ready)],
+)
+async def get_distilled_metrics(request: Request) -> Response:
+    """
+    Test metrics of the distilled forest (`model=distilled`) against the full
+    one, and both forests' size and prediction latency, measured at training
+    time. 404 if the served version has no distilled forest.
+    """
+    _require_model("distilled")
+    return _static_response(request, "metrics/distilled")
 
 
-@app.get("/policy-insights", response_model=PolicyInsightsResponse)
-def policy_insights() -> PolicyInsightsResponse:
-    model, X_train, y_train, metrics, global_explain, shap_explainer, lime_explainer = (
-        load_artifacts()
-    )
-    insights_raw = generate_policy_insights(global_explain, X_train, y_train)
-    return PolicyInsightsResponse(insights=insights_raw)
+@app.get(
+    "/feature-importance",
+    response_model=FeatureImportanceResponse,
+    dependencies=[Depends(require_artifacts_ready)],
+)
+async def feature_importance(request: Request) -> Response:
+    return _static_response(request, "feature-importance")
 
 
-@app.post("/predict", response_model=PredictionResponse)
-def predict(payload: EmissionFeatures) -> PredictionResponse:
-    model, X_train, y_train, metrics, global_explain, shap_explainer, lime_explainer = (
-        load_artifacts()
-    )
+@app.get(
+    "/prediction-trend",
+    response_model=PredictionTrendResponse,
+    dependencies=[Depends(require_artifacts_ready)],
+)
+def prediction_trend(
+    limit: int = Query(100, ge=1),
+    offset: int = Query(0, ge=0),
+    max_points: Optional[int] = Query(None, ge=3),
+) -> JSONResponse:
+    """
+    Page through the (true, predicted) pairs of the held-out test set,
+    precomputed at training time. With `max_points`, longer pages are
+    downsampled (LTTB) for plotting.
+    """
+    trend = load_prediction_trend()
+    return JSONResponse(trend.page(offset=offset, limit=limit, max_points=max_points))
 
-    # Construct full feature vector including engineered features
-    base_features = {
-        "gdp_per_capita": payload.gdp_per_capita,
-        "industrial_output": payload.industrial_output,
-        "population": payload.population,
-        "vehicle_count": payload.vehicle_count,
-        "energy_consumption": payload.energy_consumption,
-        "renewable_share": payload.renewable_share,
-        "engine_size": payload.engine_size,
-        "fuel_consumption": payload.fuel_consumption,
-        "cylinders": payload.cylinders,
-    }
-
-    df = pd.DataFrame([base_features])
-    # Engineered features consistent with training pipeline
-    df["energy_intensity"] = df["energy_consumption"] / df["industrial_output"]
-    df["gdp_energy_interaction"] = (
-        df["gdp_per_capita"] * df["energy_consumption"]
-    )
 
-    # Ensure column order
-    df = df[FEATURE_COLUMNS]
+@app.get(
+    "/policy-insights",
+    response_model=PolicyInsightsResponse,
+    dependencies=[Depends(require_artifacts_ready)],
+)
+async def policy_insights(request: Request) -> Response:
+    return _static_response(request, "policy-insights")
 
-    # Raw prediction
-    prediction = float(model.predict(df)[0])
 
-    # LIME local explanation
-    lime_exp = get_local_lime_explanation(
-        lime_explainer=lime_explainer,
-        model_predict_fn=model.predict,
-        instance=df.values[0],
-        num_features=min(10, df.shape[1]),
-    )
+@app.post(
+    "/predict",
+    response_model=PredictionResponse,
+    dependencies=[Depends(require_artifacts_ready)],
+)
+async def predict(
+    payload: EmissionFeatures,
+    shap_tier: Optional[ShapTier] = None,
+    deferred: bool = False,
+    model: ModelVariant = "full",
+) -> PredictionResponse:
+    """
+    Random Forest prediction with LIME and SHAP explanations. `shap_tier`
+    trades SHAP fidelity for latency (`path` < `kmeans` < `interventional`);
+    the default is the server's `SHAP_TIER`. `model="distilled"` predicts and
+    explains with the compressed forest instead (see `/metrics/distilled`).
+
+    With `deferred`, only the prediction is awaited: the explanations are
+    queued and the response carries an `explanation_id` to fetch them from
+    `/explanations/{id}` (null if the queue is full). Cached explanations are
+    still returned inline.
+
+    Under load, explanations are scaled back (`explanation_tier`: a smaller
+    LIME budget, then SHAP only, then none) to keep predictions fast.
+    """
+    shap_tier = shap_tier or SHAP_TIER
+    _require_model(model)
 
-    # SHAP local explanation
-    shap_exp = get_local_shap_explanation(shap_explainer, df)
+    # Full feature vector including engineered features, in model column order
+    with stage_timer("feature_matrix"):
+        X = build_feature_matrix([payload])
 
-    return PredictionResponse(
-        prediction=prediction,
-        lime_explanation=lime_exp,
-        shap_values=shap_exp,
+    with stage_timer("cache_lookup"):
+        cache_key = explanation_cache.make_key(
+            get_artifact_version(), X[0], LIME_NUM_SAMPLES, LIME_FAST_MODE, shap_tier, model
+        )
+        cached = explanation_cache.get(cache_key)
+    if cached is not None:
+        EXPLANATION_TIERS_TOTAL.inc(tier="full")
+        return PredictionResponse(**cached, model=model)
+
+    # Raw prediction and SHAP are coalesced with concurrent requests (see
+    # `predict_batcher`; `rf_predict` times the batched call).
+    version = active_version()
+    start = time.perf_counter()
+    prediction = await predict_batcher.submit(X[0], key=(version, model))
+    admission.record_prediction(time.perf_counter() - start)
+
+    tier = admission.tier()
+    EXPLANATION_TIERS_TOTAL.inc(tier=tier)
+    if deferred:
+        job = None
+        if tier != "prediction_only":
+            job = explanation_jobs.submit(
+                (X[0], prediction, version, shap_tier, tier, model, cache_key),
+                prediction=prediction,
+                explanation_tier=tier,
+                model=model,
+            )
+        return PredictionResponse(
+            prediction=prediction,
+            explanation_id=job.id if job else None,
+            explanation_tier=tier,
+            model=model,
+        )
+
+    explanations = await _explain(X[0], prediction, version, shap_tier, tier, model)
+    result = {"prediction": prediction, **explanations}
+    # Only complete explanations are cached.
+    if tier == "full":
+        explanation_cache.put(cache_key, result)
+    return PredictionResponse(**result, explanation_tier=tier, model=model)
+
+
+@app.get("/explanations/{explanation_id}", response_model=ExplanationJobResponse)
+async def get_explanation(
+    explanation_id: str,
+    wait: float = Query(0.0, ge=0.0, le=EXPLANATION_MAX_WAIT_SECONDS),
+) -> ExplanationJobResponse:
+    """
+    Result of a deferred `/predict` explanation. With `wait`, long-poll: hold
+    the request up to that many seconds for a pending job to finish. 404 once
+    the result has been evicted from the (size-bounded) store.
+    """
+    job = await explanation_jobs.wait(explanation_id, wait)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired explanation id")
+    return ExplanationJobResponse(
+        id=job.id, status=job.status, error=job.error, **job.info, **(job.result or {})
     )
 
 
-@app.post("/predict/baseline", response_model=BaselinePredictionResponse)
+@app.post(
+    "/predict/baseline",
+    response_model=BaselinePredictionResponse,
+    dependencies=[Depends(require_artifacts_ready)],
+)
 def predict_baseline(payload: EmissionFeatures) -> BaselinePredictionResponse:
     """
     Linear Regression baseline prediction. This endpoint is intentionally
@@ -206,25 +670,163 @@ def predict_baseline(payload: EmissionFeatures) -> BaselinePredictionResponse:
     """
     lr_model, lr_metrics = load_baseline_model()
 
-    base_features = {
-      "gdp_per_capita": payload.gdp_per_capita,
-      "industrial_output": payload.industrial_output,
-      "population": payload.population,
-      "vehicle_count": payload.vehicle_count,
-      "energy_consumption": payload.energy_consumption,
-      "renewable_share": payload.renewable_share,
-      "engine_size": payload.engine_size,
-      "fuel_consumption": payload.fuel_consumption,
-      "cylinders": payload.cylinders,
-    }
-
-    df = pd.DataFrame([base_features])
-    df["energy_intensity"] = df["energy_consumption"] / df["industrial_output"]
-    df["gdp_energy_interaction"] = (
-        df["gdp_per_capita"] * df["energy_consumption"]
-    )
-    df = df[FEATURE_COLUMNS]
+    df = build_feature_frame([payload])
 
     prediction = float(lr_model.predict(df)[0])
     return BaselinePredictionResponse(prediction=prediction)
 
+
+@app.post(
+    "/predict/batch",
+    response_model=BatchPredictionResponse,
+    dependencies=[Depends(require_artifacts_ready)],
+)
+async def predict_batch(payload: BatchPredictionRequest) -> BatchPredictionResponse:
+    """
+    Score many scenarios in one call. Engineered features, the Random Forest
+    prediction and (optionally) SHAP each run once over the whole batch.
+    LIME is not computed here since it is inherently per-instance.
+    """
+    _require_model(payload.model)
+    with stage_timer("feature_matrix"):
+        X = build_feature_matrix(payload.items)
+    with stage_timer("rf_predict"):
+        predictions = await run_in_threadpool(load_forest(payload.model).predict, X)
+
+    shap_exp = None
+    if payload.include_shap:
+        with stage_timer("explanation"):
+            shap_exp = await explanation_pool.run(
+                explain_batch_shap, X, payload.shap_tier, payload.model
+            )
+
+    return BatchPredictionResponse(
+        predictions=predictions.tolist(),
+        shap_values=shap_exp,
+    )
+
+
+@app.post(
+    "/predict/sweep",
+    response_model=SweepResponse,
+    dependencies=[Depends(require_artifacts_ready)],
+)
+async def predict_sweep(payload: SweepRequest) -> SweepResponse:
+    """
+    What-if sweep: vary one or two raw features of `base` over a grid and
+    score every grid point in one batched prediction, with the engineered
+    features recomputed per point. Returns the response curve (one axis) or
+    surface (two axes), plus SHAP values for `shap_points` evenly spaced
+    grid points if requested. No LIME.
+    """
+    _require_model(payload.model)
+    shape = tuple(axis.size for axis in payload.axes)
+    n_points = int(np.prod(shape))
+    if n_points > SWEEP_MAX_POINTS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Sweep grid has {n_points} points; the limit is {SWEEP_MAX_POINTS}",
+        )
+
+    grids = [axis.grid() for axis in payload.axes]
+    with stage_timer("feature_matrix"):
+        base = np.array([getattr(payload.base, name) for name in BASE_FEATURE_COLUMNS], dtype=float)
+        X = sweep_feature_matrix(base, [(axis.feature, grid) for axis, grid in zip(payload.axes, grids)])
+    with stage_timer("rf_predict"):
+        predictions = await run_in_threadpool(load_forest(payload.model).predict_sweep, X)
+
+    shap_values = None
+    indices = evenly_spaced_indices(n_points, payload.shap_points)
+    if len(indices):
+        with stage_timer("explanation"):
+            shap_exp = await explanation_pool.run(
+                explain_batch_shap, X[indices], payload.shap_tier, payload.model
+            )
+        shap_values = {
+            **shap_exp,
+            "points": np.column_stack(np.unravel_index(indices, shape)).tolist(),
+        }
+
+    return SweepResponse(
+        features=[axis.feature for axis in payload.axes],
+        grid=grids,
+        predictions=predictions.reshape(shape).tolist(),
+        shap_values=shap_values,
+    )
+
+
+async def _stream_predictions(
+    request: Request, include_shap: bool, shap_tier: Optional[str] = None, model: str = "full"
+) -> AsyncIterator[bytes]:
+    """
+    Score an NDJSON request body in micro-batches of `STREAM_BATCH_SIZE`
+    rows, yielding one NDJSON result line per input line.
+
+    The body is read only as results are sent, so a slow client throttles
+    how much input is parsed and memory stays flat for any request size.
+    """
+    forest = load_forest(model)
+    async for batch in iter_ndjson_batches(
+        request.stream(), STREAM_BATCH_SIZE, STREAM_MAX_LINE_BYTES
+    ):
+        # One result per input line, in order; valid rows are filled in
+        # after the batch is scored.
+        rows: List[Dict[str, Any]] = []
+        records: List[EmissionFeatures] = []
+        for line, value in batch:
+            row: Dict[str, Any] = {"line": line}
+            rows.append(row)
+            if isinstance(value, ValueError):
+                row["error"] = str(value)
+                continue
+            try:
+                records.append(EmissionFeatures.model_validate(value))
+            except ValidationError as exc:
+                row["error"] = "; ".join(
+                    ": ".join(filter(None, (".".join(map(str, error["loc"])), error["msg"])))
+                    for error in exc.errors()
+                )
+
+        if records:
+            X = build_feature_matrix(records)
+            predictions = await run_in_threadpool(forest.predict, X)
+            shap_exp = None
+            if include_shap:
+                shap_exp = await explanation_pool.run(explain_batch_shap, X, shap_tier, model)
+
+            valid_rows = [row for row in rows if "error" not in row]
+            for position, (row, prediction) in enumerate(zip(valid_rows, predictions.tolist())):
+                row["prediction"] = prediction
+                if shap_exp is not None:
+                    row["shap_values"] = {
+                        "base_value": shap_exp["base_value"],
+                        "per_feature": [
+                            {"feature": feature, "value": value}
+                            for feature, value in zip(
+                                shap_exp["feature_names"], shap_exp["values"][position]
+                            )
+                        ],
+                    }
+        yield b"".join(dumps_line(row) for row in rows)
+
+
+@app.post(
+    "/predict/stream",
+    dependencies=[Depends(require_artifacts_ready)],
+)
+async def predict_stream(
+    request: Request,
+    include_shap: bool = False,
+    shap_tier: Optional[ShapTier] = None,
+    model: ModelVariant = "full",
+) -> NDJSONStreamingResponse:
+    """
+    Streaming scoring: the body is NDJSON, one `EmissionFeatures` object per
+    line, and the response is NDJSON with one result per input line, in
+    order (`{"line", "prediction"[, "shap_values"]}`, or `{"line", "error"}`
+    for a row that fails to parse or validate). Results are sent as each
+    micro-batch is scored, so the first rows arrive before the last are read.
+    `model` picks the forest, as for `/predict`.
+    """
+    _require_model(model)
+    return NDJSONStreamingResponse(_stream_predictions(request, include_shap, shap_tier, model))
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+
+# Kept free of heavy imports: the API imports these names at startup, while
+# the training stack (sklearn, shap) is only needed when training runs.
+
+ARTIFACTS_DIR = Path(__file__).resolve().parent / "artifacts"
+
+# File names inside an artifacts directory: the flat legacy layout below,
+# or one immutable version directory (see `backend.model.versions`).
+MODEL_FILE = "rf_model.joblib"
+TRAIN_DATA_FILE = "train_data.joblib"
+METRICS_FILE = "metrics.joblib"
+GLOBAL_SHAP_FILE = "global_shap.joblib"
+LR_MODEL_FILE = "lr_model.joblib"
+LR_METRICS_FILE = "lr_metrics.joblib"
+DISTILLED_MODEL_FILE = "rf_distilled.joblib"
+DISTILLED_METRICS_FILE = "distilled_metrics.joblib"
+SHARED_ARRAYS_SUBDIR = "shared"
+TREND_SUBDIR = "trend"
+
+MODEL_PATH = ARTIFACTS_DIR / MODEL_FILE
+TRAIN_DATA_PATH = ARTIFACTS_DIR / TRAIN_DATA_FILE
+METRICS_PATH = ARTIFACTS_DIR / METRICS_FILE
+GLOBAL_SHAP_PATH = ARTIFACTS_DIR / GLOBAL_SHAP_FILE
+
+# Raw .npy copies of the large numeric arrays (flat forest, training data),
+# memory-mapped read-only so all API workers share them via the page cache.
+SHARED_ARRAYS_DIR = ARTIFACTS_DIR / SHARED_ARRAYS_SUBDIR
+
+# Held-out (index, true, predicted) columns served by `/prediction-trend`.
+TREND_DIR = ARTIFACTS_DIR / TREND_SUBDIR
+
+# Linear Regression baseline artifacts
+LR_MODEL_PATH = ARTIFACTS_DIR / LR_MODEL_FILE
+LR_METRICS_PATH = ARTIFACTS_DIR / LR_METRICS_FILE
+
+# Forests a request can be served by: the full Random Forest, or the compressed
+# one trained alongside it (optional: older artifacts have none).
+MODEL_VARIANTS = ("full", "distilled")
+
+# Versioned layout: every training run or incremental update writes a new
+# immutable directory under VERSIONS_DIR, and CURRENT_VERSION_FILE names the
+# one being served. Without that pointer the flat files above are served.
+VERSIONS_DIR = ARTIFACTS_DIR / "versions"
+CURRENT_VERSION_FILE = ARTIFACTS_DIR / "CURRENT"
+
+FEATURE_COLUMNS = [
+    "gdp_per_capita",
+    "industrial_output",
+    "population",
+    "vehicle_count",
+    "energy_consumption",
+    "renewable_share",
+    "engine_size",
+    "fuel_consumption",
+    "cylinders",
+    "energy_intensity",
+    "gdp_energy_interaction",
+]
+
+TARGET_COLUMN = "co2_emissions"
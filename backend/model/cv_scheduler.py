@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import copy
+import os
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.metrics import mean_absolute_error
+from sklearn.model_selection import KFold
+
+
+def plan_core_budget(n_tasks: int, n_cores: Optional[int] = None) -> Tuple[int, int]:
+    """
+    Split a core budget between concurrent fits and threads per fit.
+
+    Returns `(n_parallel, n_jobs_per_model)` with
+    `n_parallel * n_jobs_per_model <= n_cores`, so folds never oversubscribe.
+    """
+    n_cores = max(1, n_cores or os.cpu_count() or 1)
+    n_parallel = max(1, min(n_tasks, n_cores))
+    return n_parallel, max(1, n_cores // n_parallel)
+
+
+def merge_fold_forests(
+    fold_models: Sequence[RandomForestRegressor], n_estimators: int
+) -> RandomForestRegressor:
+    """
+    Build a final forest of `n_estimators` trees by taking an equal share of
+    trees from each fold model (each trained on a different 80% of the data),
+    instead of fitting a new forest on the full training set.
+    """
+    n_folds = len(fold_models)
+    base, extra = divmod(n_estimators, n_folds)
+    estimators = []
+    for fold, fold_model in enumerate(fold_models):
+        take = base + (1 if fold < extra else 0)
+        estimators.extend(fold_model.estimators_[:take])
+
+    merged = copy.copy(fold_models[0])
+    merged.estimators_ = estimators
+    merged.n_estimators = len(estimators)
+    return merged
+
+
+def _fit_forest(
+    X: pd.DataFrame,
+    y: pd.Series,
+    n_estimators: int,
+    random_state: int,
+    n_jobs: int,
+) -> RandomForestRegressor:
+    model = RandomForestRegressor(
+        n_estimators=n_estimators, random_state=random_state, n_jobs=n_jobs
+    )
+    return model.fit(X, y)
+
+
+def fit_cv_and_final_model(
+    X_train: pd.DataFrame,
+    y_train: pd.Series,
+    n_estimators: int = 200,
+    random_state: int = 42,
+    n_splits: int = 5,
+    n_cores: Optional[int] = None,
+    reuse_fold_models: bool = False,
+    sequential: bool = False,
+    progress: Optional[Callable[[str], None]] = None,
+) -> Tuple[RandomForestRegressor, List[float]]:
+    """
+    Run K-fold cross-validation and fit the final model.
+
+    By default the fold fits and the final fit are scheduled together on a
+    thread pool (tree building releases the GIL) within `n_cores` cores, with
+    each forest's `n_jobs` sized by `plan_core_budget`. With
+    `sequential=True`, folds and the final fit run one after another, each
+    using every core (the original loop).
+
+    With `reuse_fold_models=True` no final fit is run: the final forest is
+    assembled from the fold models (see `merge_fold_forests`).
+
+    Every forest is seeded with `random_state`, and sklearn draws tree seeds
+    before dispatching work, so results do not depend on the schedule.
+    Returns the final model and the per-fold validation MAE, in fold order.
+    """
+    kf = KFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+    splits = list(kf.split(X_train))
+
+    def fit_fold(fold: int, n_jobs: int) -> Tuple[RandomForestRegressor, float]:
+        train_idx, val_idx = splits[fold]
+        model_cv = _fit_forest(
+            X_train.iloc[train_idx], y_train.iloc[train_idx], n_estimators, random_state, n_jobs
+        )
+        preds_val = model_cv.predict(X_train.iloc[val_idx])
+        mae = float(mean_absolute_error(y_train.iloc[val_idx], preds_val))
+        if progress is not None:
+            progress(f"cross-validation fold {fold + 1}/{n_splits} done")
+        return model_cv, mae
+
+    def fit_final(n_jobs: int) -> RandomForestRegressor:
+        model = _fit_forest(X_train, y_train, n_estimators, random_state, n_jobs)
+        if progress is not None:
+            progress("final model fitted")
+        return model
+
+    if sequential:
+        fold_results = [fit_fold(fold, -1) for fold in range(n_splits)]
+        final_model = None if reuse_fold_models else fit_final(-1)
+    else:
+        n_tasks = n_splits if reuse_fold_models else n_splits + 1
+        n_parallel, n_jobs = plan_core_budget(n_tasks, n_cores)
+        if progress is not None:
+            progress(f"fitting {n_tasks} forests ({n_parallel} at a time, {n_jobs} cores each)")
+        tasks = [delayed(fit_fold)(fold, n_jobs) for fold in range(n_splits)]
+        if not reuse_fold_models:
+            tasks.append(delayed(fit_final)(n_jobs))
+        results = Parallel(n_jobs=n_parallel, backend="threading")(tasks)
+        fold_results = results[:n_splits]
+        final_model = None if reuse_fold_models else results[n_splits]
+
+    fold_models = [fold_model for fold_model, _ in fold_results]
+    cv_mae_scores = [mae for _, mae in fold_results]
+    if final_model is None:
+        final_model = merge_fold_forests(fold_models, n_estimators)
+    # Fitted with a restricted n_jobs; predict with every core afterwards.
+    final_model.n_jobs = -1
+    return final_model, cv_mae_scores
@@ -1,6 +1,21 @@
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
 import numpy as np
 import pandas as pd
 
+# Rows generated per independently seeded block in chunked mode. Block `i`
+# always draws from the `i`-th child of `SeedSequence(random_state)`, so the
+# data does not depend on chunk size, shard size or worker count.
+BLOCK_ROWS = 65_536
+# Default shard size: a whole number of blocks (about 1M rows).
+DEFAULT_ROWS_PER_SHARD = 16 * BLOCK_ROWS
+
 
 def generate_synthetic_emission_data(
     n_samples: int = 1000, random_state: int = 42
@@ -12,8 +27,10 @@ def generate_synthetic_emission_data(
     designed to roughly mimic realistic relationships. A ground-truth CO2 emission
     target is constructed from these features with added noise.
     """
-    rng = np.random.default_rng(random_state)
+    return _synthesize(np.random.default_rng(random_state), n_samples)
 
+
+def _synthesize(rng: np.random.Generator, n_samples: int) -> pd.DataFrame:
     # Socioeconomic features
     gdp_per_capita = rng.uniform(5_000, 80_000, n_samples)
     industrial_output = rng.uniform(10_000, 300_000, n_samples)
@@ -82,3 +99,163 @@ def generate_synthetic_emission_data(
 
     return data
 
+
+def _generate_block(block: int, random_state: int) -> pd.DataFrame:
+    seed = np.random.SeedSequence(random_state, spawn_key=(block,))
+    return _synthesize(np.random.default_rng(seed), BLOCK_ROWS)
+
+
+def _cached_block_source(random_state: int) -> Callable[[int], pd.DataFrame]:
+    """
+    `_generate_block` that keeps the last block it generated, for callers
+    reading consecutive ranges: a block spanning several of them is
+    generated once.
+    """
+    last: Dict[int, pd.DataFrame] = {}
+
+    def block_source(block: int) -> pd.DataFrame:
+        if block not in last:
+            last.clear()
+            last[block] = _generate_block(block, random_state)
+        return last[block]
+
+    return block_source
+
+
+def _rows_from_blocks(
+    start: int, stop: int, block_source: Callable[[int], pd.DataFrame]
+) -> pd.DataFrame:
+    first, last = start // BLOCK_ROWS, (stop - 1) // BLOCK_ROWS
+    parts = []
+    for block in range(first, last + 1):
+        block_start = block * BLOCK_ROWS
+        lo = max(start, block_start) - block_start
+        hi = min(stop, block_start + BLOCK_ROWS) - block_start
+        parts.append(block_source(block).iloc[lo:hi])
+    data = pd.concat(parts, ignore_index=True) if len(parts) > 1 else parts[0].reset_index(drop=True)
+    data.index = pd.RangeIndex(start, stop)
+    return data
+
+
+def generate_synthetic_rows(start: int, stop: int, random_state: int = 42) -> pd.DataFrame:
+    """
+    Rows `start:stop` of the (conceptually infinite) chunked synthetic
+    dataset, built only from the blocks that overlap the range. The index
+    is the global row number.
+    """
+    return _rows_from_blocks(start, stop, lambda block: _generate_block(block, random_state))
+
+
+def iter_synthetic_emission_chunks(
+    n_samples: int, chunk_size: int = BLOCK_ROWS, random_state: int = 42
+) -> Iterator[pd.DataFrame]:
+    """
+    Yield the chunked synthetic dataset of `n_samples` rows as DataFrames of
+    at most `chunk_size` rows, holding at most one block plus one chunk in
+    memory. Concatenating the chunks gives the same data for any chunk size,
+    and each block is generated once whatever the chunk size.
+    """
+    block_source = _cached_block_source(random_state)
+    for start in range(0, n_samples, chunk_size):
+        yield _rows_from_blocks(start, min(start + chunk_size, n_samples), block_source)
+
+
+def _write_shard(path: Path, start: int, stop: int, random_state: int) -> int:
+    import pyarrow
+    import pyarrow.parquet
+
+    # One row group per block (clipped to the shard), so no block is
+    # generated twice even when the shard does not start on a block boundary.
+    boundaries = [start, *range((start // BLOCK_ROWS + 1) * BLOCK_ROWS, stop, BLOCK_ROWS), stop]
+    writer = None
+    try:
+        for lo, hi in zip(boundaries[:-1], boundaries[1:]):
+            rows = generate_synthetic_rows(lo, hi, random_state)
+            table = pyarrow.Table.from_pandas(rows, preserve_index=False)
+            if writer is None:
+                writer = pyarrow.parquet.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+    return stop - start
+
+
+def write_synthetic_parquet_shards(
+    directory: Path,
+    n_samples: int,
+    rows_per_shard: int = DEFAULT_ROWS_PER_SHARD,
+    workers: int = 1,
+    random_state: int = 42,
+) -> List[Path]:
+    """
+    Write the chunked synthetic dataset as `part-NNNNN.parquet` shards of
+    `rows_per_shard` rows, generated in `workers` processes (requires
+    pyarrow). Each worker holds one block at a time, and the shards are
+    identical for any number of workers.
+
+    `rows_per_shard` is rounded up to a multiple of `BLOCK_ROWS`, so that no
+    block is split across shards (and generated by two workers).
+    """
+    rows_per_shard = -(-rows_per_shard // BLOCK_ROWS) * BLOCK_ROWS
+    directory.mkdir(parents=True, exist_ok=True)
+    shards = [
+        (directory / f"part-{index:05d}.parquet", start, min(start + rows_per_shard, n_samples))
+        for index, start in enumerate(range(0, n_samples, rows_per_shard))
+    ]
+    if workers <= 1:
+        for path, start, stop in shards:
+            _write_shard(path, start, stop, random_state)
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            futures = [
+                executor.submit(_write_shard, path, start, stop, random_state)
+                for path, start, stop in shards
+            ]
+            for future in futures:
+                future.result()
+    return [path for path, _, _ in shards]
+
+
+def iter_parquet_shards(
+    directory: Path, chunk_size: int = BLOCK_ROWS, columns: Optional[List[str]] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream the shards written by `write_synthetic_parquet_shards` (in order)
+    as DataFrames of at most `chunk_size` rows.
+    """
+    import pyarrow.parquet
+
+    for path in sorted(directory.glob("*.parquet")):
+        parquet_file = pyarrow.parquet.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Write the chunked synthetic emission dataset as Parquet shards."
+    )
+    parser.add_argument("output", type=Path, help="Directory for part-NNNNN.parquet shards.")
+    parser.add_argument("--rows", type=int, required=True)
+    parser.add_argument(
+        "--rows-per-shard",
+        type=int,
+        default=DEFAULT_ROWS_PER_SHARD,
+        help=f"Rounded up to a multiple of {BLOCK_ROWS:,} rows.",
+    )
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--random-state", type=int, default=42)
+    args = parser.parse_args()
+
+    paths = write_synthetic_parquet_shards(
+        args.output, args.rows, args.rows_per_shard, args.workers, args.random_state
+    )
+    print(f"wrote {args.rows:,} rows to {len(paths)} shards in {args.output}")
+
+
+if __name__ == "__main__":
+    # `python -m backend.model.data shards/ --rows 10000000 --workers 8`
+    main()
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import copy
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+from sklearn.model_selection import train_test_split
+
+from ..config import (
+    DISTILL_ACCURACY_BUDGET,
+    DISTILL_CANDIDATE_TREES,
+    DISTILL_DEPTHS,
+    DISTILL_MAX_TREES,
+    DISTILL_MIN_TREES,
+    TRAIN_CORE_BUDGET,
+)
+from .constants import FEATURE_COLUMNS
+from .inference import FlatForest
+
+
+def _report(progress: Optional[Callable[[str], None]], message: str) -> None:
+    if progress is not None:
+        progress(message)
+
+
+def _sub_forest(model: RandomForestRegressor, estimators: Sequence[Any]) -> RandomForestRegressor:
+    forest = copy.copy(model)
+    forest.estimators_ = list(estimators)
+    forest.n_estimators = len(estimators)
+    return forest
+
+
+def _n_nodes(estimators: Sequence[Any]) -> int:
+    return int(sum(estimator.tree_.node_count for estimator in estimators))
+
+
+def greedy_tree_selection(
+    tree_predictions: np.ndarray,
+    y_true: np.ndarray,
+    target_mae: float,
+    max_trees: int,
+    min_trees: int = 1,
+) -> Tuple[List[int], float, bool]:
+    """
+    Forward selection of trees (rows of `tree_predictions`, each tree's
+    predictions on the validation rows) for the averaged ensemble: each step
+    adds the tree that lowers validation MAE the most.
+
+    Stops at the first subset of at least `min_trees` trees whose MAE is
+    within `target_mae`. Returns the selected tree indices, their MAE and
+    whether the target was met; if it never is, the most accurate subset seen
+    (of at most `max_trees` trees).
+    """
+    n_trees = len(tree_predictions)
+    remaining = np.ones(n_trees, dtype=bool)
+    total = np.zeros(tree_predictions.shape[1])
+    order: List[int] = []
+    best_size, best_mae = 0, np.inf
+
+    for size in range(1, min(max_trees, n_trees) + 1):
+        candidates = np.flatnonzero(remaining)
+        errors = np.abs((total + tree_predictions[candidates]) / size - y_true).mean(axis=1)
+        pick = int(np.argmin(errors))
+        tree, mae = int(candidates[pick]), float(errors[pick])
+        order.append(tree)
+        remaining[tree] = False
+        total += tree_predictions[tree]
+
+        if mae < best_mae:
+            best_size, best_mae = size, mae
+        if size >= min_trees and mae <= target_mae:
+            return order, mae, True
+    return order[:best_size], best_mae, False
+
+
+def compress_random_forest(
+    X_train: pd.DataFrame,
+    y_train: pd.Series,
+    reference_mae: float,
+    accuracy_budget: float = DISTILL_ACCURACY_BUDGET,
+    depths: Sequence[Optional[int]] = DISTILL_DEPTHS,
+    candidate_trees: int = DISTILL_CANDIDATE_TREES,
+    max_trees: int = DISTILL_MAX_TREES,
+    min_trees: int = DISTILL_MIN_TREES,
+    validation_size: float = 0.2,
+    random_state: int = 42,
+    n_cores: Optional[int] = TRAIN_CORE_BUDGET,
+    progress: Optional[Callable[[str], None]] = None,
+) -> Tuple[RandomForestRegressor, Dict[str, Any]]:
+    """
+    Search for the smallest forest whose validation MAE stays within
+    `accuracy_budget` (relative) of `reference_mae`.
+
+    `validation_size` of the training rows are held out. For each depth cap
+    in `depths`, `candidate_trees` trees of at most that depth are grown on
+    the rest, and `greedy_tree_selection` picks as few of them (at most
+    `max_trees`) as meet the target. Of the depths that meet it, the forest
+    with the fewest nodes wins; if none does, the most accurate one.
+
+    `reference_mae` should be the full forest's cross-validated MAE: its CV
+    folds are fitted on the same share of the training rows as the
+    candidates (with the default 5 folds and `validation_size`), so the two
+    are comparable. The selected trees are not refitted on the held-out rows.
+
+    Returns the compressed forest and a summary of the search.
+    """
+    X_fit, X_val, y_fit, y_val = train_test_split(
+        X_train[FEATURE_COLUMNS], y_train, test_size=validation_size, random_state=random_state
+    )
+    X_val_array = np.asarray(X_val, dtype=np.float32)
+    y_val_array = np.asarray(y_val, dtype=np.float64)
+    target_mae = reference_mae * (1 + accuracy_budget)
+
+    candidates = []
+    for depth in depths:
+        _report(progress, f"compressing: {candidate_trees} candidate trees of depth {depth or 'unbounded'}")
+        pool = RandomForestRegressor(
+            n_estimators=candidate_trees,
+            max_depth=depth,
+            random_state=random_state,
+            n_jobs=n_cores or -1,
+        ).fit(X_fit, y_fit)
+        tree_predictions = np.stack([estimator.predict(X_val_array) for estimator in pool.estimators_])
+        selected, val_mae, met = greedy_tree_selection(
+            tree_predictions, y_val_array, target_mae, max_trees, min_trees
+        )
+        estimators = [pool.estimators_[tree] for tree in selected]
+        candidates.append(
+            {
+                "forest": _sub_forest(pool, estimators),
+                "max_depth": depth,
+                "n_trees": len(estimators),
+                "n_nodes": _n_nodes(estimators),
+                "val_mae": val_mae,
+                "within_budget": met,
+            }
+        )
+
+    within = [candidate for candidate in candidates if candidate["within_budget"]]
+    if within:
+        best = min(within, key=lambda candidate: candidate["n_nodes"])
+    else:
+        best = min(candidates, key=lambda candidate: candidate["val_mae"])
+
+    summary = {
+        "reference_mae": float(reference_mae),
+        "target_mae": float(target_mae),
+        "accuracy_budget": float(accuracy_budget),
+        "val_mae": best["val_mae"],
+        "validation_within_budget": best["within_budget"],
+        "candidates": [
+            {key: value for key, value in candidate.items() if key != "forest"} for candidate in candidates
+        ],
+    }
+    return best["forest"], summary
+
+
+def _latency_ms(forest: FlatForest, X: np.ndarray, repeats: int) -> float:
+    """
+    Median wall time of `forest.predict(X)`, in milliseconds.
+    """
+    forest.predict(X)
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        forest.predict(X)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings) * 1e3)
+
+
+def _forest_profile(model: RandomForestRegressor, X: np.ndarray, repeats: int) -> Dict[str, Any]:
+    """
+    Size and serving latency of a forest, as served: compiled to a
+    `FlatForest`, one row (an interactive `/predict`) and a batch of `X`.
+    """
+    forest = FlatForest.from_sklearn(model)
+    return {
+        "n_trees": forest.n_trees,
+        "max_depth": forest.max_depth,
+        "n_nodes": int(len(forest.feature)),
+        "size_bytes": int(sum(getattr(forest, name).nbytes for name in FlatForest.array_names)),
+        "latency_single_ms": _latency_ms(forest, X[:1], repeats),
+        "latency_batch_ms": _latency_ms(forest, X, max(repeats // 10, 3)),
+        "batch_rows": int(len(X)),
+    }
+
+
+def distill_random_forest(
+    model: RandomForestRegressor,
+    metrics: Dict[str, Any],
+    X_train: pd.DataFrame,
+    y_train: pd.Series,
+    X_test: pd.DataFrame,
+    y_test: pd.Series,
+    accuracy_budget: float = DISTILL_ACCURACY_BUDGET,
+    latency_repeats: int = 200,
+    progress: Optional[Callable[[str], None]] = None,
+    **search: Any,
+) -> Tuple[RandomForestRegressor, Dict[str, Any]]:
+    """
+    Compress the trained forest `model` (see `compress_random_forest`, with
+    the budget relative to its `cv_mae_mean`) and evaluate the result on the
+    held-out test set used for `metrics`.
+
+    The returned metrics have the usual MAE, RMSE and R^2, the test MAE
+    relative to the full forest's (`mae_ratio`, and `within_budget` against
+    `accuracy_budget`), and the size and prediction latency of both forests
+    (`distilled` and `full`), as served by the flat-array engine.
+    """
+    distilled, summary = compress_random_forest(
+        X_train,
+        y_train,
+        reference_mae=metrics["cv_mae_mean"],
+        accuracy_budget=accuracy_budget,
+        progress=progress,
+        **search,
+    )
+
+    _report(progress, "evaluating compressed forest")
+    X_test = X_test[FEATURE_COLUMNS]
+    y_pred = distilled.predict(X_test)
+    mae = float(mean_absolute_error(y_test, y_pred))
+    X_profile = np.asarray(X_test, dtype=np.float64)
+    distilled_metrics = {
+        "mae": mae,
+        "rmse": float(np.sqrt(mean_squared_error(y_test, y_pred))),
+        "r2": float(r2_score(y_test, y_pred)),
+        "full_mae": float(metrics["mae"]),
+        "mae_ratio": mae / metrics["mae"],
+        "accuracy_budget": float(accuracy_budget),
+        "within_budget": bool(mae <= metrics["mae"] * (1 + accuracy_budget)),
+        "selection": summary,
+        "distilled": _forest_profile(distilled, X_profile, latency_repeats),
+        "full": _forest_profile(model, X_profile, latency_repeats),
+    }
+    return distilled, distilled_metrics
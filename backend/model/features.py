@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from typing import Any, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .constants import FEATURE_COLUMNS
+
+
+# Raw scenario inputs, in the order expected by FEATURE_COLUMNS.
+BASE_FEATURE_COLUMNS = [
+    "gdp_per_capita",
+    "industrial_output",
+    "population",
+    "vehicle_count",
+    "energy_consumption",
+    "renewable_share",
+    "engine_size",
+    "fuel_consumption",
+    "cylinders",
+]
+
+_ENERGY = BASE_FEATURE_COLUMNS.index("energy_consumption")
+_INDUSTRIAL = BASE_FEATURE_COLUMNS.index("industrial_output")
+_GDP = BASE_FEATURE_COLUMNS.index("gdp_per_capita")
+
+
+def add_engineered_features(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add the engineered columns used by the training pipeline and return the
+    frame restricted to FEATURE_COLUMNS (in model order).
+
+    Works column-wise, so a frame with one row or a million rows costs a
+    single vectorized pass.
+    """
+    df = df.copy()
+    df["energy_intensity"] = df["energy_consumption"] / df["industrial_output"]
+    df["gdp_energy_interaction"] = df["gdp_per_capita"] * df["energy_consumption"]
+    return df[FEATURE_COLUMNS]
+
+
+def engineer_feature_matrix(base: np.ndarray) -> np.ndarray:
+    """
+    Append the engineered columns to a (n_samples, len(BASE_FEATURE_COLUMNS))
+    array, returning an array in FEATURE_COLUMNS order.
+    """
+    base = np.asarray(base, dtype=float)
+    energy_intensity = base[:, _ENERGY] / base[:, _INDUSTRIAL]
+    gdp_energy_interaction = base[:, _GDP] * base[:, _ENERGY]
+    return np.column_stack([base, energy_intensity, gdp_energy_interaction])
+
+
+def build_feature_matrix(records: Sequence[Any]) -> np.ndarray:
+    """
+    Build the full model feature matrix from a sequence of scenario objects
+    (e.g. `EmissionFeatures` payloads) exposing the base features as attributes.
+    """
+    base = np.array(
+        [[getattr(record, name) for name in BASE_FEATURE_COLUMNS] for record in records],
+        dtype=float,
+    ).reshape(len(records), len(BASE_FEATURE_COLUMNS))
+    return engineer_feature_matrix(base)
+
+
+def build_feature_frame(records: Sequence[Any]) -> pd.DataFrame:
+    """
+    Same as `build_feature_matrix`, as a DataFrame with FEATURE_COLUMNS.
+    """
+    return pd.DataFrame(build_feature_matrix(records), columns=FEATURE_COLUMNS)
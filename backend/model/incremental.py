@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import argparse
+import copy
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Sequence
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+
+import shap
+
+from .constants import FEATURE_COLUMNS, TARGET_COLUMN
+from .features import add_engineered_features
+from .shared import export_shared_arrays
+from .trend import PredictionTrend
+from .versions import current_layout, link_or_copy, publish_version, stage_version
+
+
+def _report(progress: Optional[Callable[[str], None]], message: str) -> None:
+    if progress is not None:
+        progress(message)
+
+
+def _sub_forest(model: RandomForestRegressor, estimators: Sequence[Any]) -> RandomForestRegressor:
+    forest = copy.copy(model)
+    forest.estimators_ = list(estimators)
+    forest.n_estimators = len(estimators)
+    return forest
+
+
+def _tree_shap_sum(
+    model: RandomForestRegressor, estimators: Sequence[Any], background: pd.DataFrame
+) -> np.ndarray:
+    """
+    Sum over `estimators` of each tree's SHAP values on `background`.
+
+    For a fixed background, SHAP values are linear in the model, so the
+    forest's values are these per-tree sums divided by the number of trees.
+    """
+    if not estimators:
+        return np.zeros(background.shape)
+    explainer = shap.TreeExplainer(_sub_forest(model, estimators), background)
+    values = np.asarray(explainer.shap_values(background)).reshape(background.shape)
+    return values * len(estimators)
+
+
+def _held_out_metrics(trend: PredictionTrend) -> Dict[str, float]:
+    y_true = np.asarray(trend.true_value)
+    y_pred = np.asarray(trend.predicted_value)
+    return {
+        "mae": float(mean_absolute_error(y_true, y_pred)),
+        "rmse": float(np.sqrt(mean_squared_error(y_true, y_pred))),
+        "r2": float(r2_score(y_true, y_pred)),
+    }
+
+
+def update_artifacts_incrementally(
+    new_data: pd.DataFrame,
+    n_new_trees: int = 20,
+    replace_oldest: bool = False,
+    holdout_every: int = 5,
+    progress: Optional[Callable[[str], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Fold a batch of new labelled rows into the current artifacts without a
+    full rebuild, published as a new version (running servers pre-warm and
+    swap to it).
+
+    `new_data` needs the raw scenario columns and `co2_emissions`. Every
+    `holdout_every`-th row is held out and the rest train `n_new_trees` new
+    trees (`warm_start`) that are added to the forest. With
+    `replace_oldest`, the same number of the oldest trees is dropped, so the
+    forest size stays constant (a sliding window over data drops).
+
+    The training rows are appended to the stored training data, and the
+    held-out rows, scored by the updated model, are appended to the held-out
+    trend. Test metrics are recomputed from that trend: earlier rows keep
+    the predictions made when they were held out, so this is a prequential
+    estimate. CV metrics describe the last full training run and are kept.
+
+    The global SHAP summary is updated exactly on the stored background
+    sample. Only the added (and dropped) trees are explained, because forest
+    SHAP values are the per-tree average.
+
+    Returns a summary of the update, including the new version id.
+    """
+    start = time.perf_counter()
+    source = current_layout()
+    model: RandomForestRegressor = joblib.load(source.model_path)
+    train_data = joblib.load(source.train_data_path)
+    metrics: Dict[str, Any] = joblib.load(source.metrics_path)
+    global_explain: Dict[str, Any] = joblib.load(source.global_shap_path)
+    trend = PredictionTrend.load(source.trend_dir, mmap_mode=None)
+    X_train: pd.DataFrame = train_data["X_train"]
+    y_train: pd.Series = train_data["y_train"]
+
+    # New rows get fresh global indices after everything stored so far.
+    next_index = int(max(X_train.index.max(), np.max(trend.index, initial=-1))) + 1
+    X_new = add_engineered_features(new_data)
+    X_new.index = pd.RangeIndex(next_index, next_index + len(X_new))
+    y_new = pd.Series(
+        np.asarray(new_data[TARGET_COLUMN], dtype=float), index=X_new.index, name=TARGET_COLUMN
+    )
+    is_holdout = np.arange(len(X_new)) % holdout_every == 0
+    X_fit, y_fit = X_new[~is_holdout], y_new[~is_holdout]
+    X_hold, y_hold = X_new[is_holdout], y_new[is_holdout]
+
+    # Global SHAP bookkeeping needs the per-tree sum for the current forest;
+    # artifacts from before it was stored pay for one full computation.
+    background: Optional[pd.DataFrame] = global_explain.get("background")
+    if background is None:
+        background = X_train.sample(min(300, len(X_train)), random_state=42)
+        shap_sum = _tree_shap_sum(model, model.estimators_, background)
+    else:
+        shap_sum = np.asarray(global_explain["background_shap"]) * len(model.estimators_)
+
+    _report(progress, f"growing {n_new_trees} trees on {len(X_fit)} new rows")
+    old_count = len(model.estimators_)
+    # Seed the new trees from the update's position in the data, so a
+    # constant-size forest does not replay the previous update's tree seeds.
+    model.random_state = int(np.random.SeedSequence([old_count, next_index]).generate_state(1)[0])
+    model.warm_start = True
+    model.n_estimators = old_count + n_new_trees
+    model.fit(X_fit[FEATURE_COLUMNS], y_fit)
+    model.warm_start = False
+    added = model.estimators_[old_count:]
+    dropped = model.estimators_[:n_new_trees] if replace_oldest else []
+
+    _report(progress, "updating global SHAP")
+    shap_sum = shap_sum + _tree_shap_sum(model, added, background)
+    if dropped:
+        shap_sum = shap_sum - _tree_shap_sum(model, dropped, background)
+        model.estimators_ = model.estimators_[n_new_trees:]
+        model.n_estimators = len(model.estimators_)
+    background_shap = shap_sum / len(model.estimators_)
+
+    global_explain = {
+        **global_explain,
+        "mean_abs_shap": np.abs(background_shap).mean(axis=0),
+        "rf_feature_importances": model.feature_importances_,
+        "background": background,
+        "background_shap": background_shap,
+    }
+
+    _report(progress, "updating held-out metrics")
+    trend = PredictionTrend.from_predictions(
+        np.concatenate([trend.index, X_hold.index.to_numpy()]),
+        np.concatenate([trend.true_value, y_hold.to_numpy()]),
+        np.concatenate([trend.predicted_value, model.predict(X_hold[FEATURE_COLUMNS])]),
+    )
+    metrics = {**metrics, **_held_out_metrics(trend)}
+
+    _report(progress, "persisting artifacts")
+    X_train = pd.concat([X_train, X_fit[FEATURE_COLUMNS]])
+    y_train = pd.concat([y_train, y_fit])
+    layout = stage_version()
+    joblib.dump(model, layout.model_path)
+    joblib.dump({"X_train": X_train, "y_train": y_train}, layout.train_data_path)
+    joblib.dump(metrics, layout.metrics_path)
+    joblib.dump(global_explain, layout.global_shap_path)
+    # The linear baseline is not retrained incrementally.
+    link_or_copy(source.lr_model_path, layout.lr_model_path)
+    link_or_copy(source.lr_metrics_path, layout.lr_metrics_path)
+    # Neither is the distilled forest: it keeps serving `model=distilled`
+    # until the next full training run.
+    distilled = None
+    if source.distilled_model_path.exists():
+        link_or_copy(source.distilled_model_path, layout.distilled_model_path)
+        link_or_copy(source.distilled_metrics_path, layout.distilled_metrics_path)
+        distilled = joblib.load(source.distilled_model_path)
+    export_shared_arrays(model, X_train, y_train, layout.shared_dir, distilled=distilled)
+    trend.save(layout.trend_dir)
+    version = publish_version(layout).fingerprint()
+
+    return {
+        "version": version,
+        "rows_trained": int(len(X_fit)),
+        "rows_held_out": int(len(X_hold)),
+        "trees_added": len(added),
+        "trees_dropped": len(dropped),
+        "n_trees": len(model.estimators_),
+        "metrics": metrics,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Update the persisted model with a batch of new labelled rows."
+    )
+    parser.add_argument("input", type=Path, help="CSV or Parquet file with scenario columns and co2_emissions.")
+    parser.add_argument("--new-trees", type=int, default=20)
+    parser.add_argument(
+        "--replace-oldest",
+        action="store_true",
+        help="Drop as many of the oldest trees as are added (constant forest size).",
+    )
+    parser.add_argument("--holdout-every", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.input.suffix.lower() in (".parquet", ".pq"):
+        new_data = pd.read_parquet(args.input)
+    else:
+        new_data = pd.read_csv(args.input)
+
+    summary = update_artifacts_incrementally(
+        new_data,
+        n_new_trees=args.new_trees,
+        replace_oldest=args.replace_oldest,
+        holdout_every=args.holdout_every,
+        progress=print,
+    )
+    metrics = summary["metrics"]
+    print(
+        f"trained on {summary['rows_trained']} rows, held out {summary['rows_held_out']}; "
+        f"+{summary['trees_added']}/-{summary['trees_dropped']} trees -> {summary['n_trees']}; "
+        f"MAE {metrics['mae']:.3f}, R^2 {metrics['r2']:.3f}; {summary['seconds']:.1f}s; "
+        f"published version {summary['version']}"
+    )
+
+
+if __name__ == "__main__":
+    # `python -m backend.model.incremental new_rows.csv [--new-trees 20] [--replace-oldest]`
+    main()
@@ -0,0 +1,304 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, List, Optional
+
+import numpy as np
+
+
+class FlatForest:
+    """
+    Flattened inference engine for a fitted RandomForestRegressor.
+
+    All trees are concatenated into contiguous node arrays (feature, threshold,
+    children, value). Leaves point to themselves, so every tree can be advanced
+    in lock-step for a whole batch with one vectorized step per tree level,
+    without sklearn's per-estimator dispatch and joblib threading. Trees are
+    stored deepest-first so shallower trees drop out of the loop early.
+
+    Predictions are bit-identical to `RandomForestRegressor.predict`: inputs are
+    compared as float32 (as sklearn does), and per-tree outputs are accumulated
+    in the original estimator order before dividing by the number of trees.
+
+    The vectorized traversal wins for the small batches served interactively.
+    For large batches it becomes memory-bound, so when the original sklearn
+    trees are available they are walked one by one with their compiled
+    traversal instead (still sequential, still without joblib). A forest
+    loaded from disk has no sklearn trees; it walks one tree at a time over
+    the whole batch, which keeps each tree's nodes in cache.
+    """
+
+    # Node/tree arrays persisted by `save` (one .npy file each).
+    array_names = (
+        "feature",
+        "threshold",
+        "children",
+        "value",
+        "roots",
+        "depths",
+        "estimator_order",
+    )
+
+    # Rows traversed per vectorized block; bounds the (n_trees * rows) buffers.
+    block_size = 1024
+    # Batches at least this large use the per-tree compiled traversal.
+    compiled_min_rows = 256
+    # Without sklearn trees, batches at least this large go tree by tree.
+    tree_major_min_rows = 4096
+
+    def __init__(
+        self,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        children: np.ndarray,
+        value: np.ndarray,
+        roots: np.ndarray,
+        depths: np.ndarray,
+        estimator_order: np.ndarray,
+        n_features: int,
+        trees: Optional[List[Any]] = None,
+    ) -> None:
+        self.feature = feature
+        self.threshold = threshold
+        self.children = children
+        self.value = value
+        self.roots = roots
+        self.depths = depths
+        self.estimator_order = estimator_order
+        self.n_features = int(n_features)
+        self.trees = trees
+
+        # Number of trees still descending at each level (depths are sorted).
+        self._active_per_level = [
+            int(np.count_nonzero(depths > level)) for level in range(int(depths.max()))
+        ]
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    @property
+    def max_depth(self) -> int:
+        return int(self.depths.max())
+
+    @classmethod
+    def from_sklearn(cls, model: Any) -> "FlatForest":
+        """
+        Build a flat forest from a fitted single-output RandomForestRegressor.
+        """
+        trees = [estimator.tree_ for estimator in model.estimators_]
+        if any(tree.n_outputs != 1 for tree in trees):
+            raise ValueError("FlatForest only supports single-output regression forests")
+
+        depths = np.array([tree.max_depth for tree in trees], dtype=np.int64)
+        # Deepest trees first; `estimator_order[i]` is the position of the
+        # i-th original estimator in the flattened layout.
+        layout = np.argsort(-depths, kind="stable")
+        estimator_order = np.empty_like(layout)
+        estimator_order[layout] = np.arange(len(layout))
+
+        features, thresholds, children, values, roots = [], [], [], [], []
+        offset = 0
+        for tree_idx in layout:
+            tree = trees[tree_idx]
+            node_ids = np.arange(tree.node_count, dtype=np.intp)
+            is_leaf = tree.children_left == -1
+            left = np.where(is_leaf, node_ids, tree.children_left) + offset
+            right = np.where(is_leaf, node_ids, tree.children_right) + offset
+
+            roots.append(offset)
+            features.append(np.where(is_leaf, 0, tree.feature).astype(np.intp))
+            thresholds.append(_float32_thresholds(tree.threshold))
+            children.append(np.stack([left, right], axis=1).ravel())
+            values.append(np.asarray(tree.value[:, 0, 0], dtype=np.float64))
+            offset += tree.node_count
+
+        return cls(
+            feature=np.ascontiguousarray(np.concatenate(features)),
+            threshold=np.ascontiguousarray(np.concatenate(thresholds)),
+            children=np.ascontiguousarray(np.concatenate(children), dtype=np.intp),
+            value=np.ascontiguousarray(np.concatenate(values)),
+            roots=np.asarray(roots, dtype=np.intp),
+            depths=depths[layout],
+            estimator_order=estimator_order,
+            n_features=model.n_features_in_,
+            trees=trees,
+        )
+
+    def save(self, directory: Path, prefix: str = "forest_") -> None:
+        """
+        Write each node array as a raw `.npy` file (plus a small JSON header)
+        so `load` can memory-map them. Files are replaced atomically.
+        """
+        directory.mkdir(parents=True, exist_ok=True)
+        for name in self.array_names:
+            atomic_save_array(directory / f"{prefix}{name}.npy", getattr(self, name))
+        meta_path = directory / f"{prefix}meta.json"
+        tmp_path = meta_path.with_name(f"{meta_path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps({"n_features": self.n_features}))
+        os.replace(tmp_path, meta_path)
+
+    @classmethod
+    def load(
+        cls, directory: Path, prefix: str = "forest_", mmap_mode: Optional[str] = "r"
+    ) -> "FlatForest":
+        """
+        Load a forest written by `save`. With `mmap_mode="r"` the node arrays are
+        read-only memory maps, shared through the page cache by every process
+        that loads the same files.
+        """
+        meta = json.loads((directory / f"{prefix}meta.json").read_text())
+        arrays = {
+            name: np.load(directory / f"{prefix}{name}.npy", mmap_mode=mmap_mode)
+            for name in cls.array_names
+        }
+        return cls(n_features=meta["n_features"], **arrays)
+
+    def predict(self, X: Any) -> np.ndarray:
+        """
+        Predict for a 2D array-like (or DataFrame) of shape (n_samples, n_features).
+        """
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[1] != self.n_features:
+            raise ValueError(
+                f"X has {X.shape[1]} features, but the forest expects {self.n_features}"
+            )
+
+        if self.trees is not None and X.shape[0] >= self.compiled_min_rows:
+            return self._predict_compiled(X)
+        if self.trees is None and X.shape[0] >= self.tree_major_min_rows:
+            return self._predict_tree_major(X)
+
+        out = np.empty(X.shape[0], dtype=np.float64)
+        for start in range(0, X.shape[0], self.block_size):
+            block = X[start : start + self.block_size]
+            out[start : start + len(block)] = self._predict_block(block)
+        return out
+
+    def predict_sweep(self, X: Any) -> np.ndarray:
+        """
+        Predict for a batch whose rows differ in only a few columns (a what-if
+        grid around one scenario). Bit-identical to `predict`.
+
+        Splits on the columns that are constant across the batch send every
+        row the same way, so they are resolved once per node for the whole
+        forest; rows are then walked only through splits on the varying
+        columns, usually a handful per tree instead of its full depth.
+        """
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[1] != self.n_features:
+            raise ValueError(
+                f"X has {X.shape[1]} features, but the forest expects {self.n_features}"
+            )
+
+        node_ids = np.arange(len(self.feature), dtype=np.intp)
+        is_leaf = self.children[0::2] == node_ids
+        # NaN != NaN, so a column with missing values counts as varying.
+        varying = (X != X[0]).any(axis=0)
+        fixed = ~is_leaf & ~varying.take(self.feature)
+        go_right = X[0].take(self.feature) > self.threshold
+        jump = np.where(fixed, self.children.take(2 * node_ids + go_right), node_ids)
+        # Pointer doubling: after k rounds `jump` skips up to 2**k consecutive
+        # fixed splits, landing on a leaf or a split on a varying column.
+        steps = 1
+        while steps < self.max_depth:
+            jump = jump.take(jump)
+            steps *= 2
+
+        out = np.empty(X.shape[0], dtype=np.float64)
+        for start in range(0, X.shape[0], self.block_size):
+            block = X[start : start + self.block_size]
+            out[start : start + len(block)] = self._predict_sweep_block(block, jump, is_leaf)
+        return out
+
+    def _predict_sweep_block(self, X: np.ndarray, jump: np.ndarray, is_leaf: np.ndarray) -> np.ndarray:
+        n_rows = X.shape[0]
+        flat_X = X.ravel()
+        nodes = np.repeat(jump.take(self.roots), n_rows)
+        row_offsets = np.tile(np.arange(n_rows, dtype=np.intp) * self.n_features, self.n_trees)
+
+        active = np.flatnonzero(~is_leaf.take(nodes))
+        while active.size:
+            current = nodes.take(active)
+            x = flat_X.take(row_offsets.take(active) + self.feature.take(current))
+            go_right = x > self.threshold.take(current)
+            current = jump.take(self.children.take(2 * current + go_right))
+            nodes[active] = current
+            active = active[~is_leaf.take(current)]
+
+        leaf_values = self.value.take(nodes).reshape(self.n_trees, n_rows)
+        return self._average(leaf_values[position] for position in self.estimator_order)
+
+    def _predict_block(self, X: np.ndarray) -> np.ndarray:
+        n_rows = X.shape[0]
+        flat_X = X.ravel()
+        nodes = np.repeat(self.roots, n_rows)
+        row_offsets = np.tile(np.arange(n_rows, dtype=np.intp) * self.n_features, self.n_trees)
+
+        for n_active in self._active_per_level:
+            n = n_active * n_rows
+            current = nodes[:n]
+            x = flat_X.take(row_offsets[:n] + self.feature.take(current))
+            go_right = x > self.threshold.take(current)
+            nodes[:n] = self.children.take(2 * current + go_right)
+
+        leaf_values = self.value.take(nodes).reshape(self.n_trees, n_rows)
+        return self._average(leaf_values[position] for position in self.estimator_order)
+
+    def _predict_tree_major(self, X: np.ndarray) -> np.ndarray:
+        n_rows = X.shape[0]
+        flat_X = X.ravel()
+        row_offsets = np.arange(n_rows, dtype=np.intp) * self.n_features
+
+        leaf_values = []
+        for root, depth in zip(self.roots, self.depths):
+            nodes = np.full(n_rows, root, dtype=np.intp)
+            for _ in range(int(depth)):
+                x = flat_X.take(row_offsets + self.feature.take(nodes))
+                go_right = x > self.threshold.take(nodes)
+                nodes = self.children.take(2 * nodes + go_right)
+            leaf_values.append(self.value.take(nodes))
+        return self._average(leaf_values[position] for position in self.estimator_order)
+
+    def _predict_compiled(self, X: np.ndarray) -> np.ndarray:
+        return self._average(tree.predict(X)[:, 0] for tree in self.trees)
+
+    def _average(self, per_tree_values) -> np.ndarray:
+        # Sequential accumulation in estimator order, matching sklearn.
+        total = None
+        for tree_values in per_tree_values:
+            if total is None:
+                total = np.zeros(len(tree_values), dtype=np.float64)
+            total += tree_values
+        total /= self.n_trees
+        return total
+
+
+def atomic_save_array(path: Path, array: np.ndarray, order: str = "C") -> None:
+    """
+    `np.save` to a temporary file and rename it into place, so concurrent
+    readers never observe a partially written array. `order="F"` stores a 2D
+    array column-major.
+    """
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as fh:
+        np.save(fh, np.asarray(array, order=order))
+    os.replace(tmp_path, path)
+
+
+def _float32_thresholds(threshold: np.ndarray) -> np.ndarray:
+    """
+    Round float64 split thresholds down to float32 so that, for float32
+    inputs, `x <= t32` holds exactly when `x <= t` does.
+    """
+    threshold = np.asarray(threshold, dtype=np.float64)
+    t32 = threshold.astype(np.float32)
+    too_high = t32.astype(np.float64) > threshold
+    t32[too_high] = np.nextafter(t32[too_high], np.float32(-np.inf))
+    return t32
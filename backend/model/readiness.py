@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+
+class ArtifactReadiness:
+    """
+    Thread-safe progress tracker for the background artifact build/load.
+
+    Stages move through `pending` -> (`training`) -> `loading` -> `warming`
+    -> `ready`, or end in `failed`. Each stage may carry a free-text detail
+    (e.g. the current cross-validation fold).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self.stage = "pending"
+        self.detail: Optional[str] = None
+        self.error: Optional[str] = None
+        self._history: List[Dict[str, Any]] = []
+
+    @property
+    def ready(self) -> bool:
+        return self.stage == "ready"
+
+    @property
+    def failed(self) -> bool:
+        return self.stage == "failed"
+
+    def set_stage(self, stage: str, detail: Optional[str] = None) -> None:
+        with self._lock:
+            if stage != self.stage:
+                self._history.append(
+                    {"stage": stage, "at_seconds": round(time.monotonic() - self._started, 3)}
+                )
+            self.stage = stage
+            self.detail = detail
+
+    def progress(self, detail: str) -> None:
+        """
+        Update the detail of the current stage (training progress callback).
+        """
+        with self._lock:
+            self.detail = detail
+
+    def fail(self, error: BaseException) -> None:
+        self.set_stage("failed", detail=type(error).__name__)
+        with self._lock:
+            self.error = str(error)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "ready": self.stage == "ready",
+                "stage": self.stage,
+                "detail": self.detail,
+                "error": self.error,
+                "elapsed_seconds": round(time.monotonic() - self._started, 3),
+                "history": list(self._history),
+            }
@@ -1,29 +1,68 @@
 from __future__ import annotations
 
-from functools import lru_cache
-from pathlib import Path
-from typing import Any, Dict, Tuple
+import contextvars
+import functools
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, Optional, Tuple, TypeVar
 
 import joblib
 import numpy as np
 import pandas as pd
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.linear_model import LinearRegression
-
-import shap
-from lime.lime_tabular import LimeTabularExplainer
-
-from .train_model import (
-    ARTIFACTS_DIR,
-    GLOBAL_SHAP_PATH,
-    METRICS_PATH,
-    MODEL_PATH,
-    TRAIN_DATA_PATH,
-    FEATURE_COLUMNS,
-    LR_MODEL_PATH,
-    LR_METRICS_PATH,
-    train_and_persist_artifacts,
+
+from ..config import (
+    ARTIFACT_MMAP,
+    LIME_TEMPLATE_BUDGETS,
+    MODEL_VERSION_POLL_SECONDS,
+    SHAP_BACKGROUND_SIZE,
+    SHAP_KMEANS_CLUSTERS,
+    SHAP_TIER,
+)
+from ..explainability.lime_service import (
+    LimePerturbationTemplate,
+    build_lime_explainer,
+    build_lime_explainer_from_stats,
+    build_lime_templates,
+)
+from ..explainability.shap_service import SHAP_TIERS, build_shap_explainer
+from .constants import FEATURE_COLUMNS, MODEL_VARIANTS
+from .inference import FlatForest
+from .readiness import ArtifactReadiness
+from .shared import (
+    DISTILLED_FOREST_PREFIX,
+    export_shared_arrays,
+    load_shared_forest,
+    load_shared_lime_stats,
+    load_shared_shap_background,
+    load_shared_training_data,
+    shared_arrays_current,
 )
+from .trend import PredictionTrend
+from .versions import ArtifactLayout, current_layout, version_layout
+
+# shap, lime and the sklearn estimators are imported lazily where they are
+# first needed, so importing the API does not pay for them.
+if TYPE_CHECKING:
+    from lime.lime_tabular import LimeTabularExplainer
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.linear_model import LinearRegression
+
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+# Progress of the (background) artifact build/load, reported by `/ready`.
+artifact_readiness = ArtifactReadiness()
+
+
+def artifacts_missing() -> bool:
+    return current_layout().missing()
 
 
 def _ensure_artifacts_exist() -> None:
@@ -34,21 +73,304 @@ def _ensure_artifacts_exist() -> None:
     persist everything. This makes the application self-contained and
     reproducible for new environments.
     """
-    if (
-        not MODEL_PATH.exists()
-        or not TRAIN_DATA_PATH.exists()
-        or not METRICS_PATH.exists()
-        or not LR_MODEL_PATH.exists()
-        or not LR_METRICS_PATH.exists()
-    ):
-        ARTIFACTS_DIR.mkdir(parents=True, exist_ok=True)
-        train_and_persist_artifacts()
+    if artifacts_missing():
+        from .train_model import train_and_persist_artifacts
+
+        artifact_readiness.set_stage("training")
+        train_and_persist_artifacts(progress=artifact_readiness.progress)
+
+
+def _train_in_subprocess(messages: Any) -> None:
+    from .train_model import train_and_persist_artifacts
+
+    train_and_persist_artifacts(progress=messages.put)
+
+
+def train_artifacts_in_subprocess() -> None:
+    """
+    Run `train_and_persist_artifacts` in a separate process, relaying its
+    progress to `artifact_readiness`.
+
+    Training (in particular the SHAP step) holds the GIL for long stretches;
+    keeping it out of the server process lets `/health` and `/ready` answer
+    while a cold start is still training.
+    """
+    context = multiprocessing.get_context("spawn")
+    messages = context.Queue()
+    process = context.Process(
+        target=_train_in_subprocess, args=(messages,), name="artifact-trainer"
+    )
+
+    artifact_readiness.set_stage("training")
+    process.start()
+    while process.is_alive() or not messages.empty():
+        try:
+            artifact_readiness.progress(messages.get(timeout=0.5))
+        except queue.Empty:
+            continue
+    process.join()
+
+    if process.exitcode != 0:
+        raise RuntimeError(f"Artifact training failed (exit code {process.exitcode})")
+
+
+class ModelVersion:
+    """
+    One immutable set of artifacts and everything derived from it (compiled
+    forest, explainers, LIME templates), each built once on first use.
+    """
+
+    def __init__(self, layout: ArtifactLayout) -> None:
+        self.layout = layout
+        self.version = layout.fingerprint()
+        self._values: Dict[str, Any] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def cached(self, name: str, build: Callable[[], T]) -> T:
+        try:
+            return self._values[name]
+        except KeyError:
+            pass
+        with self._locks_guard:
+            lock = self._locks.setdefault(name, threading.Lock())
+        # One lock per artifact: concurrent first uses build it once, while
+        # other artifacts of the same version stay available.
+        with lock:
+            if name not in self._values:
+                self._values[name] = build()
+            return self._values[name]
+
+
+class ModelRegistry:
+    """
+    The model version this process serves, and the hot swap to a newly
+    published one.
+
+    A swap replaces one reference, after the new version has been warmed in
+    the background; requests pin the version they started on (`pin_version`),
+    so in-flight work finishes on it. The previous version stays loaded for
+    work pinned to it in another process (e.g. an explanation task queued
+    just before a worker swapped).
+    """
+
+    def __init__(self, keep_loaded: int = 2) -> None:
+        self.keep_loaded = keep_loaded
+        self._current: Optional[ModelVersion] = None
+        self._loaded: "OrderedDict[str, ModelVersion]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._failed: Optional[str] = None
+        self._watcher: Optional[threading.Thread] = None
+
+    def current(self) -> ModelVersion:
+        current = self._current
+        if current is None:
+            with self._lock:
+                if self._current is None:
+                    _ensure_artifacts_exist()
+                    self._current = self._remember(ModelVersion(current_layout()))
+                current = self._current
+        return current
+
+    def get(self, version: str) -> ModelVersion:
+        """
+        A loaded version by id, loading a published one on demand. The id of
+        the legacy flat layout (a content hash, with no version directory)
+        is accepted as long as those are still the current artifacts.
+        """
+        with self._lock:
+            loaded = self._loaded.get(version)
+            if loaded is not None:
+                self._loaded.move_to_end(version)
+                return loaded
+        layout = version_layout(version)
+        if not layout.directory.is_dir():
+            layout = current_layout()
+            if layout.version_id is not None or layout.fingerprint() != version:
+                raise LookupError(f"Model version {version!r} is not available")
+        with self._lock:
+            return self._remember(ModelVersion(layout))
+
+    def _remember(self, version: ModelVersion) -> ModelVersion:
+        version = self._loaded.setdefault(version.version, version)
+        self._loaded.move_to_end(version.version)
+        for name in list(self._loaded)[: -self.keep_loaded]:
+            if self._current is None or name != self._current.version:
+                del self._loaded[name]
+        return version
+
+    def swap(self, version: ModelVersion) -> None:
+        with self._lock:
+            self._current = self._remember(version)
+
+    def poll(self, warm: Callable[[ModelVersion], None]) -> bool:
+        """
+        If the current-version pointer names a new version, build it with
+        `warm` while the old one keeps serving, then swap. Returns whether
+        it swapped.
+        """
+        layout = current_layout()
+        fingerprint = layout.fingerprint()
+        if fingerprint in (self.current().version, self._failed) or layout.missing():
+            return False
+        try:
+            with self._lock:
+                candidate = self._loaded.get(fingerprint) or ModelVersion(layout)
+            warm(candidate)
+        except Exception:
+            # Not retried until the pointer changes again.
+            self._failed = fingerprint
+            raise
+        self.swap(candidate)
+        return True
+
+    def start_watching(
+        self, warm: Callable[[ModelVersion], None], interval: float = MODEL_VERSION_POLL_SECONDS
+    ) -> None:
+        """
+        Poll for new versions every `interval` seconds in a daemon thread.
+        No-op if `interval` is 0 or a watcher is already running.
+        """
+        if interval <= 0 or self._watcher is not None:
+            return
+
+        def watch() -> None:
+            while True:
+                time.sleep(interval)
+                try:
+                    if self.poll(warm):
+                        logger.info("Now serving model version %s", self.current().version)
+                except Exception:
+                    logger.exception("Could not load the new model version; still serving the previous one")
+
+        self._watcher = threading.Thread(target=watch, name="model-version-watcher", daemon=True)
+        self._watcher.start()
+
+
+model_registry = ModelRegistry()
+
+_pinned_version: contextvars.ContextVar[Optional[ModelVersion]] = contextvars.ContextVar(
+    "pinned_model_version", default=None
+)
+
+
+def active_version() -> ModelVersion:
+    """
+    The version pinned for the current request or task, else the one this
+    process currently serves.
+    """
+    return _pinned_version.get() or model_registry.current()
+
+
+@contextmanager
+def pin_version(version: ModelVersion) -> Iterator[ModelVersion]:
+    """
+    Serve everything loaded in this context (and threadpool calls made from
+    it) from `version`, whatever swaps happen meanwhile.
+    """
+    token = _pinned_version.set(version)
+    try:
+        yield version
+    finally:
+        _pinned_version.reset(token)
+
+
+def version_cached(loader: Callable[[ModelVersion], T]) -> Callable[[Optional[ModelVersion]], T]:
+    """
+    Build `loader(version)` once per model version. The wrapped loader takes
+    an optional version and defaults to `active_version()`.
+    """
+
+    @functools.wraps(loader)
+    def wrapper(version: Optional[ModelVersion] = None) -> T:
+        version = version or active_version()
+        return version.cached(loader.__name__, lambda: loader(version))
+
+    return wrapper
 
 
-@lru_cache(maxsize=1)
-def load_artifacts() -> Tuple[RandomForestRegressor, pd.DataFrame, pd.Series, Dict[str, Any], Dict[str, Any], Any, LimeTabularExplainer]:
+def get_artifact_version(version: Optional[ModelVersion] = None) -> str:
     """
-    Load all persisted artifacts and construct shared explainability objects.
+    Id of the active model version (for the legacy flat layout, a short
+    fingerprint of the artifact files).
+
+    Returned to clients with every response, and used to namespace caches so
+    results never outlive the model they came from.
+    """
+    return (version or active_version()).version
+
+
+def ensure_shared_arrays(version: Optional[ModelVersion] = None) -> None:
+    """
+    Export the memory-mappable arrays if they are missing or were exported
+    from a different set of pickled artifacts.
+    """
+    layout = (version or active_version()).layout
+    if shared_arrays_current(layout.shared_dir):
+        return
+    # Loaded directly (not through the caches) so this process does not keep
+    # its own copy of the model around after exporting.
+    model = joblib.load(layout.model_path)
+    train_data = joblib.load(layout.train_data_path)
+    distilled = None
+    if layout.distilled_model_path.exists():
+        distilled = joblib.load(layout.distilled_model_path)
+    export_shared_arrays(
+        model, train_data["X_train"], train_data["y_train"], layout.shared_dir, distilled=distilled
+    )
+
+
+@version_cached
+def load_model(version: ModelVersion) -> "RandomForestRegressor":
+    """
+    Unpickle the trained RandomForestRegressor (imports sklearn).
+
+    Only SHAP and training need the sklearn object; predictions go through
+    `load_compiled_forest()`.
+    """
+    return joblib.load(version.layout.model_path)
+
+
+@version_cached
+def load_training_data(version: ModelVersion) -> Tuple[pd.DataFrame, pd.Series]:
+    """
+    Training features and target. With ARTIFACT_MMAP, both are read-only
+    memory maps over the shared `.npy` export instead of private copies.
+    """
+    if ARTIFACT_MMAP:
+        ensure_shared_arrays(version)
+        return load_shared_training_data(version.layout.shared_dir, mmap_mode="r")
+
+    train_data = joblib.load(version.layout.train_data_path)
+    X_train: pd.DataFrame = train_data["X_train"]
+    y_train: pd.Series = train_data["y_train"]
+    return X_train, y_train
+
+
+@version_cached
+def load_prediction_trend(version: ModelVersion) -> PredictionTrend:
+    """
+    Held-out (index, true, predicted) columns precomputed at training time,
+    memory-mapped read-only.
+    """
+    return PredictionTrend.load(version.layout.trend_dir, mmap_mode="r")
+
+
+@version_cached
+def load_metrics(version: ModelVersion) -> Dict[str, Any]:
+    return joblib.load(version.layout.metrics_path)
+
+
+@version_cached
+def load_global_explain(version: ModelVersion) -> Dict[str, Any]:
+    return joblib.load(version.layout.global_shap_path)
+
+
+def load_artifacts(
+    version: Optional[ModelVersion] = None,
+) -> Tuple["RandomForestRegressor", pd.DataFrame, pd.Series, Dict[str, Any], Dict[str, Any]]:
+    """
+    Load all persisted artifacts (of the active version by default).
 
     Returns:
         model: trained RandomForestRegressor
@@ -56,44 +378,172 @@ def load_artifacts() -> Tuple[RandomForestRegressor, pd.DataFrame, pd.Series, Di
         y_train: training target series
         metrics: dict of evaluation metrics
         global_explain: dict with global SHAP and RF importances
-        shap_explainer: TreeExplainer built on a background subset
-        lime_explainer: LimeTabularExplainer built on training data
+
+    Each part is cached by its own loader; callers that only need some of
+    them should use those loaders directly (notably to avoid unpickling the
+    model). The SHAP and LIME explainers are built separately, on first use,
+    by `load_shap_explainer()` and `load_lime_explainer()`.
     """
-    _ensure_artifacts_exist()
+    version = version or active_version()
+    X_train, y_train = load_training_data(version)
+    return load_model(version), X_train, y_train, load_metrics(version), load_global_explain(version)
 
-    model: RandomForestRegressor = joblib.load(MODEL_PATH)
-    train_data = joblib.load(TRAIN_DATA_PATH)
-    X_train: pd.DataFrame = train_data["X_train"]
-    y_train: pd.Series = train_data["y_train"]
-    metrics: Dict[str, Any] = joblib.load(METRICS_PATH)
-    global_explain: Dict[str, Any] = joblib.load(GLOBAL_SHAP_PATH)
 
-    # Background subset for SHAP
-    background = X_train.sample(
-        min(300, len(X_train)), random_state=42
-    )
-    shap_explainer = shap.TreeExplainer(model, background)
-
-    # LIME explainer
-    lime_explainer = LimeTabularExplainer(
-        training_data=X_train.values,
-        feature_names=FEATURE_COLUMNS,
-        mode="regression",
-        discretize_continuous=True,
-        random_state=42,
-    )
+def load_shap_explainer(
+    version: Optional[ModelVersion] = None, tier: Optional[str] = None, model: str = "full"
+) -> Any:
+    """
+    TreeExplainer for the Random Forest (or with `model="distilled"`, the
+    compressed one) at a SHAP tier (default `SHAP_TIER`, see
+    `build_shap_explainer`), built once per version, model and tier. Imports
+    shap on first call.
+    """
+    version = version or active_version()
+    tier = tier or SHAP_TIER
+    if tier not in SHAP_TIERS:
+        raise ValueError(f"Unknown SHAP tier {tier!r} (expected one of {', '.join(SHAP_TIERS)})")
+    if model not in MODEL_VARIANTS:
+        raise ValueError(f"Unknown model {model!r} (expected one of {', '.join(MODEL_VARIANTS)})")
+
+    def build() -> Any:
+        background = None
+        if ARTIFACT_MMAP and tier != "path":
+            ensure_shared_arrays(version)
+            size = SHAP_BACKGROUND_SIZE if tier == "interventional" else SHAP_KMEANS_CLUSTERS
+            background = load_shared_shap_background(version.layout.shared_dir, tier, size)
+        # Sampled (or clustered) here only without a matching precomputed one.
+        X_train = None if background is not None or tier == "path" else load_training_data(version)[0]
+        return build_shap_explainer(
+            load_model(version) if model == "full" else load_distilled_model(version),
+            X_train,
+            tier,
+            SHAP_BACKGROUND_SIZE,
+            SHAP_KMEANS_CLUSTERS,
+            background=background,
+        )
 
-    return model, X_train, y_train, metrics, global_explain, shap_explainer, lime_explainer
+    name = f"shap_explainer:{tier}" if model == "full" else f"shap_explainer:{model}:{tier}"
+    return version.cached(name, build)
 
 
-@lru_cache(maxsize=1)
-def load_baseline_model() -> Tuple[LinearRegression, Dict[str, Any]]:
+@version_cached
+def load_lime_explainer(version: ModelVersion) -> "LimeTabularExplainer":
     """
-    Load the Linear Regression baseline model and its evaluation metrics.
+    LimeTabularExplainer for the training data. With ARTIFACT_MMAP it is
+    rebuilt from the training statistics precomputed in the shared export
+    (no pass over the training data). Imports lime on first call.
     """
-    _ensure_artifacts_exist()
+    if ARTIFACT_MMAP:
+        ensure_shared_arrays(version)
+        return build_lime_explainer_from_stats(
+            load_shared_lime_stats(version.layout.shared_dir), FEATURE_COLUMNS
+        )
+    X_train, _ = load_training_data(version)
+    return build_lime_explainer(np.asarray(X_train.values), FEATURE_COLUMNS)
+
 
-    lr_model: LinearRegression = joblib.load(LR_MODEL_PATH)
-    lr_metrics: Dict[str, Any] = joblib.load(LR_METRICS_PATH)
+@version_cached
+def load_baseline_model(version: ModelVersion) -> Tuple[LinearRegression, Dict[str, Any]]:
+    """
+    Load the Linear Regression baseline model and its evaluation metrics.
+    """
+    lr_model: LinearRegression = joblib.load(version.layout.lr_model_path)
+    lr_metrics: Dict[str, Any] = joblib.load(version.layout.lr_metrics_path)
     return lr_model, lr_metrics
 
+
+@version_cached
+def load_compiled_forest(version: ModelVersion) -> FlatForest:
+    """
+    Flattened array form of the Random Forest for low-overhead inference.
+
+    With ARTIFACT_MMAP, the node arrays are memory-mapped from the shared
+    export (no sklearn model is loaded); otherwise they are built from
+    `load_model()`. Either way, predictions are bit-identical to `model.predict`.
+    """
+    if ARTIFACT_MMAP:
+        ensure_shared_arrays(version)
+        return load_shared_forest(version.layout.shared_dir, mmap_mode="r")
+    return FlatForest.from_sklearn(load_model(version))
+
+
+def has_distilled_model(version: Optional[ModelVersion] = None) -> bool:
+    """
+    Whether the version was trained with a distilled forest (see
+    `backend.model.distill`).
+    """
+    return (version or active_version()).layout.distilled_model_path.exists()
+
+
+@version_cached
+def load_distilled_model(version: ModelVersion) -> "RandomForestRegressor":
+    """
+    Unpickle the distilled RandomForestRegressor (for SHAP; predictions go
+    through `load_distilled_forest()`).
+    """
+    if not has_distilled_model(version):
+        raise LookupError(f"Model version {version.version!r} has no distilled model")
+    return joblib.load(version.layout.distilled_model_path)
+
+
+@version_cached
+def load_distilled_metrics(version: ModelVersion) -> Dict[str, Any]:
+    """
+    Test metrics of the distilled forest, relative to the full one, with
+    both forests' size and latency and a summary of the compression search.
+    """
+    if not has_distilled_model(version):
+        raise LookupError(f"Model version {version.version!r} has no distilled model")
+    return joblib.load(version.layout.distilled_metrics_path)
+
+
+@version_cached
+def load_distilled_forest(version: ModelVersion) -> FlatForest:
+    """
+    Flattened distilled forest, memory-mapped from the shared export like
+    `load_compiled_forest()`.
+    """
+    if ARTIFACT_MMAP:
+        ensure_shared_arrays(version)
+        if has_distilled_model(version):
+            return load_shared_forest(
+                version.layout.shared_dir, mmap_mode="r", prefix=DISTILLED_FOREST_PREFIX
+            )
+    return FlatForest.from_sklearn(load_distilled_model(version))
+
+
+def load_forest(model: str = "full", version: Optional[ModelVersion] = None) -> FlatForest:
+    """
+    The flat forest that serves predictions for `model` ("full" or
+    "distilled").
+    """
+    if model == "distilled":
+        return load_distilled_forest(version)
+    if model != "full":
+        raise ValueError(f"Unknown model {model!r} (expected one of {', '.join(MODEL_VARIANTS)})")
+    return load_compiled_forest(version)
+
+
+@version_cached
+def load_lime_templates(version: ModelVersion) -> Dict[int, LimePerturbationTemplate]:
+    """
+    Precomputed LIME perturbation templates, one per configured sample budget,
+    built once from the LIME explainer returned by `load_lime_explainer()`.
+    """
+    lime_explainer = load_lime_explainer(version)
+    return build_lime_templates(lime_explainer, LIME_TEMPLATE_BUDGETS)
+
+
+def get_lime_template(num_samples: int, version: Optional[ModelVersion] = None) -> LimePerturbationTemplate:
+    """
+    Return the perturbation template for a sample budget, building (and
+    keeping) it on first use if the budget was not configured up front.
+    """
+    version = version or active_version()
+    templates = load_lime_templates(version)
+    template = templates.get(num_samples)
+    if template is None:
+        lime_explainer = load_lime_explainer(version)
+        template = build_lime_templates(lime_explainer, [num_samples])[num_samples]
+        templates[num_samples] = template
+    return template
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..config import ARTIFACT_PRECISION, SHAP_BACKGROUND_SIZE, SHAP_KMEANS_CLUSTERS
+from ..explainability.lime_service import lime_training_stats
+from ..explainability.shap_service import shap_background
+from .constants import (
+    ARTIFACTS_DIR,
+    DISTILLED_MODEL_FILE,
+    FEATURE_COLUMNS,
+    MODEL_FILE,
+    SHARED_ARRAYS_DIR,
+    TRAIN_DATA_FILE,
+)
+from .inference import FlatForest, atomic_save_array
+
+
+META_FILE = "meta.json"
+# Bumped when the export gains files; older exports are redone on load.
+EXPORT_FORMAT = 2
+PRECISIONS = ("float64", "float32")
+LIME_STATS_FILE = "lime_stats.npy"
+FOREST_PREFIX = "forest_"
+DISTILLED_FOREST_PREFIX = "distilled_forest_"
+# Precomputed SHAP backgrounds, with the meta.json key recording their size.
+SHAP_BACKGROUNDS = {
+    "interventional": ("shap_background_interventional.npy", "shap_background_size"),
+    "kmeans": ("shap_background_kmeans.npy", "shap_kmeans_clusters"),
+}
+
+
+def source_fingerprint(artifacts_dir: Path = ARTIFACTS_DIR) -> str:
+    """
+    Identify the pickled artifacts the shared arrays were exported from, so a
+    retrained model is never served with stale arrays.
+    """
+    parts = []
+    paths = [artifacts_dir / MODEL_FILE, artifacts_dir / TRAIN_DATA_FILE]
+    # Optional; artifacts without one keep their earlier fingerprint.
+    if (artifacts_dir / DISTILLED_MODEL_FILE).exists():
+        paths.append(artifacts_dir / DISTILLED_MODEL_FILE)
+    for path in paths:
+        stat = path.stat()
+        parts.append(f"{path.name}:{stat.st_size}:{stat.st_mtime_ns}")
+    return "|".join(parts)
+
+
+def shared_arrays_current(directory: Path = SHARED_ARRAYS_DIR) -> bool:
+    meta_path = directory / META_FILE
+    if not meta_path.exists():
+        return False
+    try:
+        meta = json.loads(meta_path.read_text())
+    except ValueError:
+        return False
+    # The export lives inside the artifacts directory it was made from.
+    return meta.get("format") == EXPORT_FORMAT and meta.get("source") == source_fingerprint(
+        directory.parent
+    )
+
+
+def export_shared_arrays(
+    model: Any,
+    X_train: pd.DataFrame,
+    y_train: pd.Series,
+    directory: Path = SHARED_ARRAYS_DIR,
+    precision: str = ARTIFACT_PRECISION,
+    shap_background_size: int = SHAP_BACKGROUND_SIZE,
+    shap_kmeans_clusters: int = SHAP_KMEANS_CLUSTERS,
+    distilled: Any = None,
+) -> None:
+    """
+    Write the flat forest (and the `distilled` one, if given), the training
+    data and the explainers' inputs as raw `.npy` files.
+
+    Training features are stored column-major at `precision`. The SHAP
+    backgrounds and LIME training statistics are computed here, from the
+    full-precision data, so workers build their explainers from a few small
+    arrays instead of from the training data.
+
+    The metadata file is written last: it is what marks the export as current.
+    """
+    if precision not in PRECISIONS:
+        raise ValueError(f"precision must be one of {PRECISIONS}, got {precision!r}")
+    directory.mkdir(parents=True, exist_ok=True)
+    X_train = X_train[FEATURE_COLUMNS]
+    X = X_train.to_numpy(dtype=np.float64)
+
+    FlatForest.from_sklearn(model).save(directory, prefix=FOREST_PREFIX)
+    if distilled is not None:
+        FlatForest.from_sklearn(distilled).save(directory, prefix=DISTILLED_FOREST_PREFIX)
+    atomic_save_array(directory / "X_train.npy", X.astype(precision), order="F")
+    atomic_save_array(directory / "y_train.npy", y_train.to_numpy(dtype=precision))
+    atomic_save_array(directory / "train_index.npy", X_train.index.to_numpy())
+
+    sizes = {"shap_background_size": shap_background_size, "shap_kmeans_clusters": shap_kmeans_clusters}
+    for tier, (file_name, _) in SHAP_BACKGROUNDS.items():
+        background = shap_background(X_train, tier, shap_background_size, shap_kmeans_clusters)
+        atomic_save_array(directory / file_name, background.to_numpy(dtype=np.float64))
+    atomic_save_array(directory / LIME_STATS_FILE, lime_training_stats(X))
+
+    meta_path = directory / META_FILE
+    tmp_path = meta_path.with_name(f"{META_FILE}.{os.getpid()}.tmp")
+    tmp_path.write_text(
+        json.dumps(
+            {
+                "format": EXPORT_FORMAT,
+                "source": source_fingerprint(directory.parent),
+                "feature_names": FEATURE_COLUMNS,
+                "target_name": y_train.name,
+                "precision": precision,
+                "distilled": distilled is not None,
+                **sizes,
+            }
+        )
+    )
+    os.replace(tmp_path, meta_path)
+
+
+def load_shared_forest(
+    directory: Path = SHARED_ARRAYS_DIR, mmap_mode: Optional[str] = "r", prefix: str = FOREST_PREFIX
+) -> FlatForest:
+    return FlatForest.load(directory, prefix=prefix, mmap_mode=mmap_mode)
+
+
+def load_shared_training_data(
+    directory: Path = SHARED_ARRAYS_DIR, mmap_mode: Optional[str] = "r"
+) -> Tuple[pd.DataFrame, pd.Series]:
+    """
+    Training data backed by (read-only) memory maps, at the precision it was
+    exported with. The DataFrame wraps the mapped 2D array without copying
+    it; being column-major, it is already in pandas' own block layout, so
+    each column is a contiguous view.
+    """
+    meta = json.loads((directory / META_FILE).read_text())
+    X = np.load(directory / "X_train.npy", mmap_mode=mmap_mode)
+    y = np.load(directory / "y_train.npy", mmap_mode=mmap_mode)
+    index = pd.Index(np.load(directory / "train_index.npy"))
+
+    X_train = pd.DataFrame(X, columns=meta["feature_names"], index=index, copy=False)
+    y_train = pd.Series(y, index=index, name=meta["target_name"], copy=False)
+    return X_train, y_train
+
+
+def load_shared_shap_background(
+    directory: Path, tier: str, size: int
+) -> Optional[pd.DataFrame]:
+    """
+    The precomputed background of SHAP `tier`, or None if there is none of
+    that `size` (background rows for interventional, clusters for kmeans).
+    """
+    if tier not in SHAP_BACKGROUNDS:
+        return None
+    file_name, size_key = SHAP_BACKGROUNDS[tier]
+    meta = json.loads((directory / META_FILE).read_text())
+    if meta.get(size_key) != size:
+        return None
+    return pd.DataFrame(np.load(directory / file_name), columns=meta["feature_names"])
+
+
+def load_shared_lime_stats(directory: Path) -> np.ndarray:
+    return np.load(directory / LIME_STATS_FILE)
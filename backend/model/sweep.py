@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from typing import Sequence, Tuple
+
+import numpy as np
+
+from .features import BASE_FEATURE_COLUMNS, engineer_feature_matrix
+
+
+def sweep_feature_matrix(
+    base: np.ndarray, axes: Sequence[Tuple[str, np.ndarray]]
+) -> np.ndarray:
+    """
+    Model feature matrix for a what-if grid around one scenario.
+
+    `base` holds the raw scenario (BASE_FEATURE_COLUMNS order); each axis is
+    a raw feature name and the values it takes. Rows cover the full grid in
+    C order (the last axis varies fastest), and the engineered features are
+    recomputed for every row, so e.g. sweeping `energy_consumption` also
+    moves `energy_intensity` and `gdp_energy_interaction`.
+    """
+    grids = np.meshgrid(*[np.asarray(values, dtype=float) for _, values in axes], indexing="ij")
+    n_points = grids[0].size
+    rows = np.repeat(np.asarray(base, dtype=float).reshape(1, -1), n_points, axis=0)
+    for (name, _), grid in zip(axes, grids):
+        rows[:, BASE_FEATURE_COLUMNS.index(name)] = grid.ravel()
+    return engineer_feature_matrix(rows)
+
+
+def evenly_spaced_indices(n_points: int, n_samples: int) -> np.ndarray:
+    """
+    Up to `n_samples` distinct grid indices spread evenly over `n_points`,
+    always including the first and last.
+    """
+    if n_samples <= 0 or n_points == 0:
+        return np.empty(0, dtype=np.int64)
+    return np.unique(np.linspace(0, n_points - 1, min(n_samples, n_points)).round().astype(np.int64))
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import argparse
+import json
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import Callable, Dict, Iterable, Optional, Tuple
 
 import joblib
 import numpy as np
@@ -9,46 +11,40 @@ import pandas as pd
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.linear_model import LinearRegression
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
-from sklearn.model_selection import KFold, train_test_split
+from sklearn.model_selection import train_test_split
 
 import shap
 
-from .data import generate_synthetic_emission_data
+from ..config import DISTILL_MODEL, TRAIN_CORE_BUDGET, TRAIN_REUSE_FOLD_MODELS
+from .constants import ARTIFACTS_DIR, FEATURE_COLUMNS, TARGET_COLUMN
+from .cv_scheduler import fit_cv_and_final_model
+from .data import (
+    BLOCK_ROWS,
+    generate_synthetic_emission_data,
+    iter_parquet_shards,
+    iter_synthetic_emission_chunks,
+)
+from .distill import distill_random_forest
+from .shared import export_shared_arrays
+from .trend import PredictionTrend
+from .versions import publish_version, stage_version
 
 
-ARTIFACTS_DIR = Path(__file__).resolve().parent / "artifacts"
 ARTIFACTS_DIR.mkdir(parents=True, exist_ok=True)
 
-MODEL_PATH = ARTIFACTS_DIR / "rf_model.joblib"
-TRAIN_DATA_PATH = ARTIFACTS_DIR / "train_data.joblib"
-METRICS_PATH = ARTIFACTS_DIR / "metrics.joblib"
-GLOBAL_SHAP_PATH = ARTIFACTS_DIR / "global_shap.joblib"
 
-# Linear Regression baseline artifacts
-LR_MODEL_PATH = ARTIFACTS_DIR / "lr_model.joblib"
-LR_METRICS_PATH = ARTIFACTS_DIR / "lr_metrics.joblib"
-
-
-FEATURE_COLUMNS = [
-    "gdp_per_capita",
-    "industrial_output",
-    "population",
-    "vehicle_count",
-    "energy_consumption",
-    "renewable_share",
-    "engine_size",
-    "fuel_consumption",
-    "cylinders",
-    "energy_intensity",
-    "gdp_energy_interaction",
-]
-
-TARGET_COLUMN = "co2_emissions"
+def _report(progress: Optional[Callable[[str], None]], message: str) -> None:
+    if progress is not None:
+        progress(message)
 
 
 def train_random_forest_with_explainability(
     n_estimators: int = 200,
     random_state: int = 42,
+    progress: Optional[Callable[[str], None]] = None,
+    n_samples: int = 1000,
+    n_cores: Optional[int] = TRAIN_CORE_BUDGET,
+    reuse_fold_models: bool = TRAIN_REUSE_FOLD_MODELS,
 ) -> Tuple[
     RandomForestRegressor,
     Dict,
@@ -59,7 +55,8 @@ def train_random_forest_with_explainability(
     pd.Series,
 ]:
     """
-    Train a RandomForestRegressor on the synthetic dataset and compute:
+    Train a RandomForestRegressor on a synthetic dataset of `n_samples` rows
+    and compute:
 
     - Train/test metrics (MAE, RMSE, R^2)
     - 5-fold cross validation MAE
@@ -67,8 +64,15 @@ def train_random_forest_with_explainability(
 
     Returns the trained model, metrics dict, X_train, y_train, global explainability dict,
     and the held-out X_test, y_test used for evaluation (for baseline comparison).
+
+    The CV folds and the final fit are scheduled together within `n_cores`
+    cores (see `fit_cv_and_final_model`); with `reuse_fold_models`, the final
+    forest is assembled from the fold models instead of being refitted.
+
+    `progress`, if given, is called with a short description of each step.
     """
-    df = generate_synthetic_emission_data()
+    _report(progress, "generating data")
+    df = generate_synthetic_emission_data(n_samples=n_samples, random_state=random_state)
 
     X = df[FEATURE_COLUMNS]
     y = df[TARGET_COLUMN]
@@ -77,26 +81,17 @@ def train_random_forest_with_explainability(
         X, y, test_size=0.2, random_state=random_state
     )
 
-    model = RandomForestRegressor(
-        n_estimators=n_estimators, random_state=random_state, n_jobs=-1
+    # 5-fold cross validation on training set (MAE) + final fit on all of it
+    model, cv_mae_scores = fit_cv_and_final_model(
+        X_train,
+        y_train,
+        n_estimators=n_estimators,
+        random_state=random_state,
+        n_cores=n_cores,
+        reuse_fold_models=reuse_fold_models,
+        progress=progress,
     )
 
-    # 5-fold cross validation on training set (MAE)
-    kf = KFold(n_splits=5, shuffle=True, random_state=random_state)
-    cv_mae_scores = []
-    for train_idx, val_idx in kf.split(X_train):
-        X_tr, X_val = X_train.iloc[train_idx], X_train.iloc[val_idx]
-        y_tr, y_val = y_train.iloc[train_idx], y_train.iloc[val_idx]
-        model_cv = RandomForestRegressor(
-            n_estimators=n_estimators, random_state=random_state, n_jobs=-1
-        )
-        model_cv.fit(X_tr, y_tr)
-        preds_val = model_cv.predict(X_val)
-        cv_mae_scores.append(mean_absolute_error(y_val, preds_val))
-
-    # Fit final model on full training data
-    model.fit(X_train, y_train)
-
     # Evaluate on test set
     y_pred = model.predict(X_test)
     mae = mean_absolute_error(y_test, y_pred)
@@ -116,6 +111,7 @@ def train_random_forest_with_explainability(
 
     # Global SHAP explainability (TreeExplainer for Random Forest)
     # Use a background subset of training data for efficiency.
+    _report(progress, "computing global SHAP")
     background = X_train.sample(
         min(300, len(X_train)), random_state=random_state
     )
@@ -129,11 +125,104 @@ def train_random_forest_with_explainability(
         "feature_names": FEATURE_COLUMNS,
         "mean_abs_shap": mean_abs_shap,
         "rf_feature_importances": model.feature_importances_,
+        # Kept so incremental updates can adjust the summary tree by tree.
+        "background": background,
+        "background_shap": shap_values,
     }
 
     return model, metrics, X_train, y_train, global_explain, X_test, y_test
 
 
+def train_random_forest_on_chunks(
+    chunks: Iterable[pd.DataFrame],
+    trees_per_chunk: int = 10,
+    max_trees: int = 200,
+    holdout_every: int = 5,
+    max_holdout_rows: int = 200_000,
+    random_state: int = 42,
+    progress: Optional[Callable[[str], None]] = None,
+) -> Tuple[RandomForestRegressor, Dict]:
+    """
+    Train a RandomForestRegressor on a stream of chunks (e.g. from
+    `iter_synthetic_emission_chunks` or `iter_parquet_shards`) without ever
+    holding more than one chunk.
+
+    Each chunk contributes `trees_per_chunk` trees (`warm_start`), fitted on
+    the chunk's training rows, until the forest has `max_trees`. From then
+    on the stream's trees are reservoir-sampled: the forest stays at
+    `max_trees`, every chunk is equally likely to be represented, and only
+    the trees that are kept get grown, so later chunks grow fewer and fewer.
+
+    Every `holdout_every`-th row (by position in the stream) is held out
+    instead; the first `max_holdout_rows` of those are kept to compute MAE,
+    RMSE and R^2 of the final forest. Raises ValueError for an empty stream.
+    """
+    model = RandomForestRegressor(
+        n_estimators=0, warm_start=True, random_state=random_state, n_jobs=-1
+    )
+    model.estimators_ = []
+    rng = np.random.default_rng(random_state)
+    holdout_X, holdout_y = [], []
+    n_holdout = n_rows = n_chunks = n_sampled = 0
+
+    for chunk in chunks:
+        positions = np.arange(n_rows, n_rows + len(chunk))
+        is_holdout = positions % holdout_every == 0
+        n_rows += len(chunk)
+        n_chunks += 1
+
+        # Forest slot of each of this chunk's trees that is kept (a later
+        # tree drawing the same slot replaces an earlier one).
+        slots = {}
+        for order in range(trees_per_chunk):
+            slot = n_sampled if n_sampled < max_trees else int(rng.integers(n_sampled + 1))
+            n_sampled += 1
+            if slot < max_trees:
+                slots[slot] = order
+
+        train = chunk[~is_holdout]
+        if slots and len(train):
+            kept = len(model.estimators_)
+            # Fresh tree seeds per chunk, since the forest size stops growing.
+            model.random_state = int(np.random.SeedSequence([random_state, n_chunks]).generate_state(1)[0])
+            model.n_estimators = kept + len(slots)
+            model.fit(train[FEATURE_COLUMNS], train[TARGET_COLUMN])
+            grown = dict(zip(sorted(slots, key=slots.get), model.estimators_[kept:]))
+            estimators = model.estimators_[:kept]
+            for slot, estimator in sorted(grown.items()):
+                if slot < kept:
+                    estimators[slot] = estimator
+                else:
+                    estimators.append(estimator)
+            model.estimators_ = estimators
+            model.n_estimators = len(estimators)
+        _report(progress, f"chunk {n_chunks}: {n_rows:,} rows, {len(slots)} trees grown, {model.n_estimators} kept")
+
+        if n_holdout < max_holdout_rows:
+            held = chunk[is_holdout].iloc[: max_holdout_rows - n_holdout]
+            holdout_X.append(held[FEATURE_COLUMNS])
+            holdout_y.append(held[TARGET_COLUMN])
+            n_holdout += len(held)
+
+    if not model.estimators_:
+        raise ValueError(f"no trees trained: the stream had {n_rows} rows in {n_chunks} chunks")
+
+    model.warm_start = False
+    X_test = pd.concat(holdout_X)
+    y_test = pd.concat(holdout_y)
+    y_pred = model.predict(X_test)
+    metrics = {
+        "mae": float(mean_absolute_error(y_test, y_pred)),
+        "rmse": float(np.sqrt(mean_squared_error(y_test, y_pred))),
+        "r2": float(r2_score(y_test, y_pred)),
+        "n_rows": n_rows,
+        "n_chunks": n_chunks,
+        "n_holdout": n_holdout,
+        "n_trees": model.n_estimators,
+    }
+    return model, metrics
+
+
 def train_linear_regression_baseline(
     X_train: pd.DataFrame,
     y_train: pd.Series,
@@ -165,15 +254,23 @@ def train_linear_regression_baseline(
     return lr, metrics
 
 
-def train_and_persist_artifacts() -> None:
+def train_and_persist_artifacts(progress: Optional[Callable[[str], None]] = None) -> str:
     """
-    Train the model and persist all artifacts needed by the API layer:
+    Train the model and persist all artifacts needed by the API layer, as a
+    new immutable version that becomes the current one:
 
     - Trained RandomForestRegressor
     - Training data (for SHAP/LIME background)
     - Metrics
     - Global SHAP summary
     - Linear Regression baseline model + metrics
+    - Compressed ("distilled") forest + metrics, size and latency report,
+      unless DISTILL_MODEL is off
+    - Shared .npy arrays (flat forests, training data) for memory-mapped loading
+    - Held-out (index, true, predicted) columns for `/prediction-trend`
+
+    `progress`, if given, is called with a short description of each step.
+    Returns the new version id; running servers pre-warm and swap to it.
     """
     (
         model,
@@ -183,9 +280,10 @@ def train_and_persist_artifacts() -> None:
         global_explain,
         X_test,
         y_test,
-    ) = train_random_forest_with_explainability()
+    ) = train_random_forest_with_explainability(progress=progress)
 
     # Train Linear Regression baseline on the same split for fair comparison.
+    _report(progress, "training linear baseline")
     lr_model, lr_metrics = train_linear_regression_baseline(
         X_train=X_train,
         y_train=y_train,
@@ -193,16 +291,71 @@ def train_and_persist_artifacts() -> None:
         y_test=y_test,
     )
 
-    # Persist artifacts
-    joblib.dump(model, MODEL_PATH)
-    joblib.dump({"X_train": X_train, "y_train": y_train}, TRAIN_DATA_PATH)
-    joblib.dump(metrics, METRICS_PATH)
-    joblib.dump(global_explain, GLOBAL_SHAP_PATH)
-    joblib.dump(lr_model, LR_MODEL_PATH)
-    joblib.dump(lr_metrics, LR_METRICS_PATH)
+    distilled = distilled_metrics = None
+    if DISTILL_MODEL:
+        distilled, distilled_metrics = distill_random_forest(
+            model, metrics, X_train, y_train, X_test, y_test, progress=progress
+        )
+
+    # Persist artifacts into a staging directory that nothing reads yet
+    _report(progress, "persisting artifacts")
+    layout = stage_version()
+    joblib.dump(model, layout.model_path)
+    joblib.dump({"X_train": X_train, "y_train": y_train}, layout.train_data_path)
+    joblib.dump(metrics, layout.metrics_path)
+    joblib.dump(global_explain, layout.global_shap_path)
+    joblib.dump(lr_model, layout.lr_model_path)
+    joblib.dump(lr_metrics, layout.lr_metrics_path)
+    if distilled is not None:
+        joblib.dump(distilled, layout.distilled_model_path)
+        joblib.dump(distilled_metrics, layout.distilled_metrics_path)
+
+    # Memory-mappable copies of the forests and training data for the API
+    export_shared_arrays(model, X_train, y_train, layout.shared_dir, distilled=distilled)
+
+    # Prediction trend on the held-out test set, so the dashboard never
+    # triggers model compute.
+    PredictionTrend.from_predictions(X_test.index, y_test, model.predict(X_test)).save(layout.trend_dir)
+
+    # Atomically becomes the current version once complete.
+    return publish_version(layout).fingerprint()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Train and publish a new model version. With --rows or --shards, instead "
+            "train a forest on the chunked synthetic dataset (out of core) and report "
+            "its held-out metrics without publishing it."
+        )
+    )
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--rows", type=int, help="Stream this many generated rows.")
+    source.add_argument("--shards", type=Path, help="Stream the Parquet shards in this directory.")
+    parser.add_argument("--chunk-size", type=int, default=BLOCK_ROWS)
+    parser.add_argument("--trees-per-chunk", type=int, default=10)
+    parser.add_argument("--max-trees", type=int, default=200)
+    parser.add_argument("--output", type=Path, help="Save the chunk-trained forest here (joblib).")
+    args = parser.parse_args()
+
+    if args.rows is None and args.shards is None:
+        print(f"published model version {train_and_persist_artifacts(progress=print)}")
+        return
+
+    if args.rows is not None:
+        chunks = iter_synthetic_emission_chunks(args.rows, args.chunk_size)
+    else:
+        chunks = iter_parquet_shards(args.shards, args.chunk_size)
+    model, metrics = train_random_forest_on_chunks(
+        chunks, trees_per_chunk=args.trees_per_chunk, max_trees=args.max_trees, progress=print
+    )
+    print(json.dumps(metrics, indent=2))
+    if args.output is not None:
+        joblib.dump(model, args.output)
 
 
 if __name__ == "__main__":
-    # Allow manual training: `python -m backend.model.train_model`
-    train_and_persist_artifacts()
+    # Allow manual training: `python -m backend.model.train_model`, or
+    # `python -m backend.model.train_model --shards shards/` for a chunked run
+    main()
 
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from .constants import TREND_DIR
+from .inference import atomic_save_array
+
+
+META_FILE = "meta.json"
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets downsampling: positions of `n_out` points
+    of the series (x, y) that preserve its visual shape.
+
+    The first and last points are always kept; every bucket in between
+    contributes the point forming the largest triangle with the previously
+    kept point and the average of the next bucket.
+    """
+    n = len(x)
+    if n_out >= n:
+        return np.arange(n)
+    if n_out < 3:
+        raise ValueError("LTTB needs at least 3 output points")
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+
+    selected = np.empty(n_out, dtype=np.intp)
+    selected[0] = 0
+    selected[-1] = n - 1
+    previous = 0
+    for bucket in range(n_out - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        next_stop = edges[bucket + 2] if bucket + 2 < len(edges) else n
+        avg_x = x[stop:next_stop].mean()
+        avg_y = y[stop:next_stop].mean()
+
+        area = np.abs(
+            (x[previous] - avg_x) * (y[start:stop] - y[previous])
+            - (x[previous] - x[start:stop]) * (avg_y - y[previous])
+        )
+        previous = start + int(np.argmax(area))
+        selected[bucket + 1] = previous
+    return selected
+
+
+class PredictionTrend:
+    """
+    Held-out (index, true, predicted) series, precomputed at training time and
+    stored as one `.npy` file per column, ordered by the original row index.
+
+    Serving a page is a slice of these arrays (plus optional LTTB
+    downsampling of the predictions); no model is involved.
+    """
+
+    array_names = ("index", "true_value", "predicted_value")
+
+    def __init__(self, index: np.ndarray, true_value: np.ndarray, predicted_value: np.ndarray) -> None:
+        self.index = index
+        self.true_value = true_value
+        self.predicted_value = predicted_value
+
+    @classmethod
+    def from_predictions(cls, index: Any, y_true: Any, y_pred: Any) -> "PredictionTrend":
+        index = np.asarray(index, dtype=np.int64)
+        order = np.argsort(index, kind="stable")
+        return cls(
+            index=index[order],
+            true_value=np.asarray(y_true, dtype=np.float64)[order],
+            predicted_value=np.asarray(y_pred, dtype=np.float64)[order],
+        )
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def page(self, offset: int = 0, limit: int = 100, max_points: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Points `offset:offset + limit` as a JSON-ready dict. If `max_points`
+        is given and the page is longer, it is reduced to `max_points` points
+        with LTTB on the predicted series.
+        """
+        index = self.index[offset:offset + limit]
+        true_value = self.true_value[offset:offset + limit]
+        predicted_value = self.predicted_value[offset:offset + limit]
+
+        downsampled = max_points is not None and len(index) > max_points
+        if downsampled:
+            keep = lttb_indices(index, predicted_value, max_points)
+            index, true_value, predicted_value = index[keep], true_value[keep], predicted_value[keep]
+
+        points = [
+            {"index": i, "true_value": t, "predicted_value": p}
+            for i, t, p in zip(index.tolist(), true_value.tolist(), predicted_value.tolist())
+        ]
+        return {
+            "points": points,
+            "total": len(self),
+            "offset": offset,
+            "limit": limit,
+            "downsampled": downsampled,
+        }
+
+    def save(self, directory: Path = TREND_DIR) -> None:
+        """
+        Write each column as a `.npy` file; the metadata file is written last
+        and marks the export as complete.
+        """
+        directory.mkdir(parents=True, exist_ok=True)
+        for name in self.array_names:
+            atomic_save_array(directory / f"{name}.npy", getattr(self, name))
+
+        meta_path = directory / META_FILE
+        tmp_path = meta_path.with_name(f"{META_FILE}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps({"n_points": len(self), "source": "held-out test set"}))
+        os.replace(tmp_path, meta_path)
+
+    @classmethod
+    def load(cls, directory: Path = TREND_DIR, mmap_mode: Optional[str] = "r") -> "PredictionTrend":
+        arrays = {
+            name: np.load(directory / f"{name}.npy", mmap_mode=mmap_mode)
+            for name in cls.array_names
+        }
+        return cls(**arrays)
+
+    @staticmethod
+    def exists(directory: Path = TREND_DIR) -> bool:
+        return (directory / META_FILE).exists()
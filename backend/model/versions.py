@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from ..config import MODEL_VERSIONS_KEEP
+from .constants import (
+    ARTIFACTS_DIR,
+    CURRENT_VERSION_FILE,
+    DISTILLED_METRICS_FILE,
+    DISTILLED_MODEL_FILE,
+    GLOBAL_SHAP_FILE,
+    LR_METRICS_FILE,
+    LR_MODEL_FILE,
+    METRICS_FILE,
+    MODEL_FILE,
+    SHARED_ARRAYS_SUBDIR,
+    TRAIN_DATA_FILE,
+    TREND_SUBDIR,
+    VERSIONS_DIR,
+)
+from .trend import PredictionTrend
+
+# Staging directories are renamed into place once complete; ones left behind
+# by a crashed run are removed by `prune_versions` after this long.
+STALE_STAGING_SECONDS = 3600
+
+
+class ArtifactLayout:
+    """
+    Paths of one complete set of artifacts: an immutable version directory
+    under `VERSIONS_DIR`, or the flat legacy layout in `ARTIFACTS_DIR`.
+    """
+
+    def __init__(self, directory: Path, version_id: Optional[str] = None) -> None:
+        self.directory = directory
+        self.version_id = version_id
+        self.model_path = directory / MODEL_FILE
+        self.train_data_path = directory / TRAIN_DATA_FILE
+        self.metrics_path = directory / METRICS_FILE
+        self.global_shap_path = directory / GLOBAL_SHAP_FILE
+        self.lr_model_path = directory / LR_MODEL_FILE
+        self.lr_metrics_path = directory / LR_METRICS_FILE
+        # Optional, so not part of `pickle_paths`.
+        self.distilled_model_path = directory / DISTILLED_MODEL_FILE
+        self.distilled_metrics_path = directory / DISTILLED_METRICS_FILE
+        self.shared_dir = directory / SHARED_ARRAYS_SUBDIR
+        self.trend_dir = directory / TREND_SUBDIR
+
+    @property
+    def pickle_paths(self) -> Tuple[Path, ...]:
+        return (
+            self.model_path,
+            self.train_data_path,
+            self.metrics_path,
+            self.global_shap_path,
+            self.lr_model_path,
+            self.lr_metrics_path,
+        )
+
+    def missing(self) -> bool:
+        return (
+            any(not path.exists() for path in self.pickle_paths)
+            or not PredictionTrend.exists(self.trend_dir)
+        )
+
+    def fingerprint(self) -> str:
+        """
+        The model version reported to clients and used to namespace caches:
+        the version id, or for the legacy layout a short hash of the pickled
+        artifacts' names, sizes and mtimes.
+        """
+        if self.version_id is not None:
+            return self.version_id
+        digest = hashlib.sha1()
+        for path in self.pickle_paths:
+            if path.exists():
+                stat = path.stat()
+                digest.update(f"{path.name}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+        return digest.hexdigest()[:12]
+
+
+def read_current_version() -> Optional[str]:
+    try:
+        version_id = CURRENT_VERSION_FILE.read_text().strip()
+    except FileNotFoundError:
+        return None
+    return version_id or None
+
+
+def version_layout(version_id: str) -> ArtifactLayout:
+    return ArtifactLayout(VERSIONS_DIR / version_id, version_id)
+
+
+def current_layout() -> ArtifactLayout:
+    """
+    The artifacts `CURRENT_VERSION_FILE` points to, or the legacy flat
+    layout if no version has been published yet.
+    """
+    version_id = read_current_version()
+    if version_id is None:
+        return ArtifactLayout(ARTIFACTS_DIR)
+    return version_layout(version_id)
+
+
+def list_versions() -> List[str]:
+    """
+    Published version ids, oldest first (ids start with their UTC timestamp).
+    """
+    if not VERSIONS_DIR.exists():
+        return []
+    return sorted(
+        path.name for path in VERSIONS_DIR.iterdir() if path.is_dir() and not path.name.startswith(".")
+    )
+
+
+def stage_version() -> ArtifactLayout:
+    """
+    A fresh, empty directory to write a new version into. Nothing reads it
+    until `publish_version` renames it into place.
+    """
+    version_id = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime()) + "-" + os.urandom(3).hex()
+    directory = VERSIONS_DIR / f".{version_id}.partial"
+    directory.mkdir(parents=True)
+    return ArtifactLayout(directory, version_id)
+
+
+def set_current_version(version_id: str) -> None:
+    """
+    Atomically point `CURRENT_VERSION_FILE` at a published version. Running
+    servers pick the change up on their next poll.
+    """
+    if not version_layout(version_id).directory.is_dir():
+        raise ValueError(f"Unknown model version {version_id!r}")
+    tmp_path = CURRENT_VERSION_FILE.with_name(f"{CURRENT_VERSION_FILE.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(version_id + "\n")
+    os.replace(tmp_path, CURRENT_VERSION_FILE)
+
+
+def publish_version(staged: ArtifactLayout, keep: int = MODEL_VERSIONS_KEEP) -> ArtifactLayout:
+    """
+    Make a fully written staging directory an immutable version, point
+    `CURRENT_VERSION_FILE` at it, and prune old versions down to `keep`.
+    """
+    assert staged.version_id is not None
+    published = version_layout(staged.version_id)
+    os.rename(staged.directory, published.directory)
+    set_current_version(staged.version_id)
+    prune_versions(keep)
+    return published
+
+
+def prune_versions(keep: int = MODEL_VERSIONS_KEEP) -> List[str]:
+    """
+    Delete all but the newest `keep` versions (never the current one) and
+    abandoned staging directories. Returns the removed version ids.
+
+    Servers still holding a removed version keep working from what they have
+    loaded (mapped files stay valid after deletion), so `keep` should cover
+    the previous version while a swap is in progress.
+    """
+    current = read_current_version()
+    versions = list_versions()
+    removed = [
+        version_id
+        for version_id in versions[: max(len(versions) - max(keep, 1), 0)]
+        if version_id != current
+    ]
+    for version_id in removed:
+        shutil.rmtree(version_layout(version_id).directory, ignore_errors=True)
+
+    if VERSIONS_DIR.exists():
+        cutoff = time.time() - STALE_STAGING_SECONDS
+        for path in VERSIONS_DIR.glob(".*.partial"):
+            if path.stat().st_mtime < cutoff:
+                shutil.rmtree(path, ignore_errors=True)
+    return removed
+
+
+def link_or_copy(source: Path, destination: Path) -> None:
+    """
+    Carry an unchanged file into a new version: a hard link where possible
+    (versions are immutable, so sharing the inode is safe), else a copy.
+    """
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copy2(source, destination)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="List, activate (roll back) or prune model versions.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="Published versions, oldest first; * marks the current one.")
+    activate = commands.add_parser("activate", help="Serve a published version (running servers hot-swap).")
+    activate.add_argument("version")
+    prune = commands.add_parser("prune", help="Delete old versions.")
+    prune.add_argument("--keep", type=int, default=MODEL_VERSIONS_KEEP)
+    args = parser.parse_args()
+
+    if args.command == "list":
+        current = read_current_version()
+        for version_id in list_versions():
+            print(f"{'*' if version_id == current else ' '} {version_id}")
+    elif args.command == "activate":
+        try:
+            set_current_version(args.version)
+        except ValueError as exc:
+            parser.error(str(exc))
+        print(f"current version: {args.version}")
+    else:
+        for version_id in prune_versions(args.keep):
+            print(f"removed {version_id}")
+
+
+if __name__ == "__main__":
+    # `python -m backend.model.versions list | activate <version> | prune [--keep 3]`
+    main()
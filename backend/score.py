@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Deque, Iterator, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .config import EXPLAIN_POOL_START_METHOD
+from .explainability.shap_service import SHAP_TIERS
+from .model.constants import FEATURE_COLUMNS
+from .model.data import iter_parquet_shards
+from .model.features import BASE_FEATURE_COLUMNS, engineer_feature_matrix
+from .model.registry import (
+    get_artifact_version,
+    load_baseline_model,
+    load_compiled_forest,
+    load_shap_explainer,
+    model_registry,
+)
+
+MODELS = ("rf", "lr", "both")
+
+
+def _file_format(path: Path) -> str:
+    suffix = path.suffix.lower()
+    if suffix in (".parquet", ".pq"):
+        return "parquet"
+    if suffix == ".csv":
+        return "csv"
+    raise ValueError(f"Unsupported file type {path.suffix!r} (expected .csv or .parquet)")
+
+
+def _import_pyarrow() -> Any:
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as exc:
+        raise RuntimeError("Parquet input/output requires pyarrow (pip install pyarrow)") from exc
+    return pyarrow
+
+
+def iter_chunks(path: Path, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """
+    Read a CSV or Parquet file, or a directory of Parquet shards, as
+    DataFrames of at most `chunk_size` rows, never holding more than one
+    chunk of the input in memory.
+    """
+    if path.is_dir():
+        # A directory of Parquet shards (see `write_synthetic_parquet_shards`).
+        _import_pyarrow()
+        yield from iter_parquet_shards(path, chunk_size)
+        return
+    if _file_format(path) == "csv":
+        yield from pd.read_csv(path, chunksize=chunk_size)
+        return
+
+    pyarrow = _import_pyarrow()
+    parquet_file = pyarrow.parquet.ParquetFile(path)
+    for batch in parquet_file.iter_batches(batch_size=chunk_size):
+        yield batch.to_pandas()
+
+
+class ChunkWriter:
+    """
+    Append scored chunks to a CSV or Parquet file as they arrive.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.format = _file_format(path)
+        self._parquet_writer: Any = None
+        self._wrote_header = False
+
+    def write(self, chunk: pd.DataFrame) -> None:
+        if self.format == "csv":
+            chunk.to_csv(self.path, mode="a" if self._wrote_header else "w", header=not self._wrote_header, index=False)
+            self._wrote_header = True
+            return
+
+        pyarrow = _import_pyarrow()
+        table = pyarrow.Table.from_pandas(chunk, preserve_index=False)
+        if self._parquet_writer is None:
+            self._parquet_writer = pyarrow.parquet.ParquetWriter(self.path, table.schema)
+        self._parquet_writer.write_table(table)
+
+    def close(self) -> None:
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+
+
+def load_scoring_models(
+    model: str = "rf",
+    include_shap: bool = False,
+    version: Optional[str] = None,
+    shap_tier: Optional[str] = None,
+) -> None:
+    """
+    Load (and cache) everything `score_chunk` needs from model `version`
+    (default: the current one). Used as the worker initializer so each
+    process pays for it once.
+    """
+    model_version = model_registry.get(version) if version else None
+    if model in ("rf", "both"):
+        load_compiled_forest(model_version)
+    if model in ("lr", "both"):
+        load_baseline_model(model_version)
+    if include_shap:
+        load_shap_explainer(model_version, shap_tier)
+
+
+def score_chunk(
+    chunk: pd.DataFrame,
+    model: str = "rf",
+    include_shap: bool = False,
+    version: Optional[str] = None,
+    shap_tier: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Score one chunk of raw scenarios (the `EmissionFeatures` columns; any
+    other columns are passed through) with model `version` (default: the
+    current one).
+
+    Engineered features are built the same way as for `/predict`. Adds
+    `rf_prediction` and/or `lr_prediction`, plus one `shap_<feature>` column
+    per model feature (Random Forest, at `shap_tier`) when `include_shap` is
+    set.
+    """
+    model_version = model_registry.get(version) if version else None
+    missing = [name for name in BASE_FEATURE_COLUMNS if name not in chunk.columns]
+    if missing:
+        raise ValueError(f"Input is missing feature columns: {', '.join(missing)}")
+
+    X = engineer_feature_matrix(chunk[BASE_FEATURE_COLUMNS].to_numpy(dtype=float))
+    scored = chunk.reset_index(drop=True)
+
+    if model in ("rf", "both"):
+        scored["rf_prediction"] = load_compiled_forest(model_version).predict(X)
+    if model in ("lr", "both"):
+        lr_model, _ = load_baseline_model(model_version)
+        scored["lr_prediction"] = lr_model.predict(pd.DataFrame(X, columns=FEATURE_COLUMNS))
+    if include_shap:
+        shap_explainer = load_shap_explainer(model_version, shap_tier)
+        shap_values = np.asarray(shap_explainer.shap_values(pd.DataFrame(X, columns=FEATURE_COLUMNS)))
+        shap_values = shap_values.reshape(len(X), len(FEATURE_COLUMNS))
+        for position, name in enumerate(FEATURE_COLUMNS):
+            scored[f"shap_{name}"] = shap_values[:, position]
+    return scored
+
+
+def score_file(
+    input_path: Path,
+    output_path: Path,
+    model: str = "rf",
+    include_shap: bool = False,
+    shap_tier: Optional[str] = None,
+    chunk_size: int = 100_000,
+    workers: int = 1,
+    log: Optional[Any] = sys.stderr,
+) -> int:
+    """
+    Stream `input_path` through `score_chunk` into `output_path`, in order.
+
+    With `workers > 1`, chunks are scored in that many processes; at most
+    `2 * workers` chunks are read ahead, so memory stays bounded by the chunk
+    size whatever the file size. The whole file is scored by the model
+    version current at the start, even if a new one is published meanwhile.
+    Returns the number of rows scored.
+    """
+    if model not in MODELS:
+        raise ValueError(f"model must be one of {MODELS}, got {model!r}")
+    version = get_artifact_version()
+
+    writer = ChunkWriter(output_path)
+    executor = None
+    if workers > 1:
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context(EXPLAIN_POOL_START_METHOD),
+            initializer=load_scoring_models,
+            initargs=(model, include_shap, version, shap_tier),
+        )
+    else:
+        load_scoring_models(model, include_shap, version, shap_tier)
+
+    start = time.perf_counter()
+    rows = 0
+
+    def emit(scored: pd.DataFrame) -> None:
+        nonlocal rows
+        writer.write(scored)
+        rows += len(scored)
+        if log is not None:
+            elapsed = time.perf_counter() - start
+            print(f"{rows:>12,} rows  {rows / elapsed:>12,.0f} rows/s", file=log, flush=True)
+
+    try:
+        pending: Deque[Future] = deque()
+        for chunk in iter_chunks(input_path, chunk_size):
+            if executor is None:
+                emit(score_chunk(chunk, model, include_shap, version, shap_tier))
+                continue
+            pending.append(executor.submit(score_chunk, chunk, model, include_shap, version, shap_tier))
+            if len(pending) >= 2 * workers:
+                emit(pending.popleft().result())
+        while pending:
+            emit(pending.popleft().result())
+    finally:
+        writer.close()
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    if log is not None:
+        elapsed = time.perf_counter() - start
+        print(f"scored {rows:,} rows with model version {version} in {elapsed:.1f}s ({rows / max(elapsed, 1e-9):,.0f} rows/s)", file=log)
+    return rows
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Score a CSV/Parquet file of scenarios in fixed-size chunks, without the API."
+    )
+    parser.add_argument("input", type=Path, help="Input .csv or .parquet file, or a directory of .parquet shards.")
+    parser.add_argument("output", type=Path, help="Output .csv or .parquet file.")
+    parser.add_argument("--model", choices=MODELS, default="rf", help="Random Forest, LR baseline, or both.")
+    parser.add_argument("--shap", action="store_true", help="Add per-feature SHAP columns (Random Forest).")
+    parser.add_argument("--shap-tier", choices=SHAP_TIERS, default=None, help="SHAP explainer tier (default SHAP_TIER).")
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=1, help="Scoring processes (chunks are scored in parallel).")
+    args = parser.parse_args(argv)
+
+    score_file(
+        args.input,
+        args.output,
+        model=args.model,
+        include_shap=args.shap,
+        shap_tier=args.shap_tier,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+    )
+
+
+if __name__ == "__main__":
+    # `python -m backend.score scenarios.parquet scored.parquet [--model both] [--shap] [--workers 8]`
+    main()
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from backend.utils.admission import MIN_SAMPLES, AdmissionController
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _controller(clock: FakeClock, **kwargs) -> AdmissionController:
+    options = dict(
+        max_inflight=4,
+        explanation_target_seconds=1.0,
+        prediction_slo_seconds=0.05,
+        window_seconds=10.0,
+        recover_seconds=5.0,
+        clock=clock,
+    )
+    options.update(kwargs)
+    return AdmissionController(**options)
+
+
+def _explain(controller: AdmissionController, clock: FakeClock, seconds: float) -> None:
+    with controller.track_explanation():
+        clock.now += seconds
+
+
+def test_idle_server_serves_full_tier():
+    controller = _controller(FakeClock())
+    assert controller.tier() == "full"
+    assert controller.pressure() == 0.0
+
+
+def test_one_slow_explanation_does_not_degrade():
+    clock = FakeClock()
+    controller = _controller(clock)
+    # e.g. the first request after startup, building the explainers
+    _explain(controller, clock, 2.5)
+    for _ in range(MIN_SAMPLES - 2):
+        clock.now += 1.0
+        assert controller.tier() == "full"
+        _explain(controller, clock, 0.1)
+
+
+def test_slow_explanations_degrade_then_recover_one_tier_at_a_time():
+    clock = FakeClock()
+    controller = _controller(clock, window_seconds=60.0)
+    for _ in range(MIN_SAMPLES):
+        _explain(controller, clock, 1.6)
+    assert controller.tier() == "shap_only"
+
+    # Still slow: stays degraded.
+    clock.now += 30.0
+    assert controller.tier() == "shap_only"
+
+    # Once the slow samples leave the window, tiers come back one at a time,
+    # `recover_seconds` apart.
+    clock.now += 31.0
+    assert controller.tier() == "reduced_lime"
+    clock.now += 1.0
+    assert controller.tier() == "reduced_lime"
+    clock.now += 4.0
+    assert controller.tier() == "full"
+
+
+def test_inflight_and_queued_explanations_add_pressure():
+    queued = [0]
+    controller = _controller(FakeClock(), queue_depth=lambda: queued[0])
+    queued[0] = 4
+    assert controller.tier() == "reduced_lime"
+    queued[0] = 8
+    assert controller.tier() == "prediction_only"
+
+
+def test_prediction_slo_breach_needs_min_samples():
+    controller = _controller(FakeClock())
+    for _ in range(MIN_SAMPLES - 1):
+        controller.record_prediction(0.2)
+    assert controller.tier() == "full"
+    controller.record_prediction(0.2)
+    assert controller.tier() == "prediction_only"
+
+
+def test_disabled_controller_always_serves_full_tier():
+    clock = FakeClock()
+    controller = _controller(clock, enabled=False)
+    for _ in range(MIN_SAMPLES):
+        controller.record_prediction(1.0)
+        _explain(controller, clock, 5.0)
+    assert controller.tier() == "full"
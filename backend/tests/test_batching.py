@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Hashable, List, Tuple
+
+from backend.utils.batching import MicroBatcher
+
+
+def _run(max_batch_size: int, max_wait_seconds: float, items: List[Tuple[Any, Hashable]]):
+    calls: List[Tuple[Hashable, List[Any]]] = []
+
+    async def process(key: Hashable, batch: List[Any]) -> List[Any]:
+        calls.append((key, list(batch)))
+        return [item * 10 for item in batch]
+
+    async def main() -> List[Any]:
+        batcher = MicroBatcher("test", process, max_batch_size, max_wait_seconds)
+        return await asyncio.gather(*(batcher.submit(item, key) for item, key in items))
+
+    return asyncio.run(main()), calls
+
+
+def test_concurrent_calls_are_coalesced_per_key():
+    results, calls = _run(64, 0.01, [(1, "a"), (2, "b"), (3, "a")])
+    assert results == [10, 20, 30]
+    assert sorted(calls) == [("a", [1, 3]), ("b", [2])]
+
+
+def test_full_batches_are_dispatched_at_max_batch_size():
+    results, calls = _run(2, 10.0, [(1, None), (2, None), (3, None), (4, None)])
+    assert results == [10, 20, 30, 40]
+    assert calls == [(None, [1, 2]), (None, [3, 4])]
+
+
+def test_zero_wait_disables_coalescing():
+    _, calls = _run(64, 0.0, [(1, None), (2, None)])
+    assert calls == [(None, [1]), (None, [2])]
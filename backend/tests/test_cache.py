@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import numpy as np
+
+from backend.utils import cache as cache_module
+from backend.utils.cache import ExplanationCache
+
+
+def test_keys_quantize_to_precision():
+    cache = ExplanationCache(precision=6)
+    assert cache.make_key("v1", np.array([1.0000001, 2.0])) == cache.make_key("v1", np.array([1.0, 2.0]))
+    assert cache.make_key("v1", np.array([1.001, 2.0])) != cache.make_key("v1", np.array([1.0, 2.0]))
+    assert cache.make_key("v1", np.array([1.0])) != cache.make_key("v2", np.array([1.0]))
+    assert cache.make_key("v1", np.array([1.0]), "path") != cache.make_key("v1", np.array([1.0]), "kmeans")
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    cache = ExplanationCache(ttl_seconds=10)
+    cache.put("key", "value")
+    now[0] += 9.0
+    assert cache.get("key") == "value"
+    now[0] += 2.0
+    assert cache.get("key") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ExplanationCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_zero_entries_disables_the_cache():
+    cache = ExplanationCache(max_entries=0)
+    cache.put("a", 1)
+    assert cache.get("a") is None
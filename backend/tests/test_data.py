@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+from backend.model.data import (
+    BLOCK_ROWS,
+    generate_synthetic_rows,
+    iter_parquet_shards,
+    iter_synthetic_emission_chunks,
+    write_synthetic_parquet_shards,
+)
+
+N_ROWS = 2 * BLOCK_ROWS + 1234
+
+
+@pytest.fixture(scope="module")
+def reference() -> pd.DataFrame:
+    return generate_synthetic_rows(0, N_ROWS)
+
+
+@pytest.mark.parametrize("chunk_size", [10_000, BLOCK_ROWS, BLOCK_ROWS + 1, 200_000])
+def test_chunks_do_not_depend_on_chunk_size(reference, chunk_size):
+    chunks = list(iter_synthetic_emission_chunks(N_ROWS, chunk_size))
+    assert all(len(chunk) <= chunk_size for chunk in chunks)
+    pd.testing.assert_frame_equal(pd.concat(chunks), reference)
+
+
+def test_row_ranges_are_slices_of_the_dataset(reference):
+    start, stop = BLOCK_ROWS - 10, BLOCK_ROWS + 10
+    pd.testing.assert_frame_equal(generate_synthetic_rows(start, stop), reference.iloc[start:stop])
+
+
+def test_random_state_changes_the_data(reference):
+    assert not generate_synthetic_rows(0, 100, random_state=7).equals(reference.iloc[:100])
+
+
+@pytest.mark.parametrize("rows_per_shard", [50_000, BLOCK_ROWS])
+def test_shards_match_the_chunked_dataset(reference, tmp_path, rows_per_shard):
+    pytest.importorskip("pyarrow")
+    paths = write_synthetic_parquet_shards(tmp_path, N_ROWS, rows_per_shard=rows_per_shard)
+    assert len(paths) == 3  # rounded up to whole blocks
+    shards = pd.concat(iter_parquet_shards(tmp_path, chunk_size=30_000), ignore_index=True)
+    pd.testing.assert_frame_equal(shards, reference.reset_index(drop=True))
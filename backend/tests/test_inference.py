@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+
+from backend.model.constants import FEATURE_COLUMNS, TARGET_COLUMN
+from backend.model.data import generate_synthetic_emission_data
+from backend.model.inference import FlatForest
+
+
+@pytest.fixture(scope="module")
+def fitted():
+    data = generate_synthetic_emission_data(n_samples=2000, random_state=0)
+    model = RandomForestRegressor(n_estimators=20, random_state=0, n_jobs=1)
+    model.fit(data[FEATURE_COLUMNS].to_numpy(), data[TARGET_COLUMN].to_numpy())
+    X = generate_synthetic_emission_data(n_samples=5000, random_state=1)[FEATURE_COLUMNS].to_numpy()
+    return model, X
+
+
+# One row (interactive), a vectorized batch, and batches past
+# `compiled_min_rows` / `tree_major_min_rows`.
+@pytest.mark.parametrize("n_rows", [1, 100, 300, 5000])
+def test_predict_matches_sklearn(fitted, n_rows):
+    model, X = fitted
+    expected = model.predict(X[:n_rows])
+    np.testing.assert_array_equal(FlatForest.from_sklearn(model).predict(X[:n_rows]), expected)
+
+
+@pytest.mark.parametrize("n_rows", [1, 100, 5000])
+def test_loaded_forest_matches_sklearn(fitted, tmp_path, n_rows):
+    model, X = fitted
+    FlatForest.from_sklearn(model).save(tmp_path)
+    loaded = FlatForest.load(tmp_path)
+    np.testing.assert_array_equal(loaded.predict(X[:n_rows]), model.predict(X[:n_rows]))
+
+
+def test_predict_sweep_matches_predict(fitted):
+    model, X = fitted
+    forest = FlatForest.from_sklearn(model)
+    grid = np.repeat(X[:1], 50, axis=0)
+    grid[:, 0] = np.linspace(X[:, 0].min(), X[:, 0].max(), 50)
+    np.testing.assert_array_equal(forest.predict_sweep(grid), forest.predict(grid))
+
+
+def test_predict_rejects_wrong_feature_count(fitted):
+    model, X = fitted
+    with pytest.raises(ValueError):
+        FlatForest.from_sklearn(model).predict(X[:, :-1])
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, AsyncIterator, List, Sequence, Tuple
+
+from backend.utils.ndjson import iter_ndjson_batches
+
+
+async def _stream(chunks: Sequence[bytes]) -> AsyncIterator[bytes]:
+    for chunk in chunks:
+        yield chunk
+
+
+def _collect(chunks: Sequence[bytes], batch_size: int = 2, **kwargs) -> List[List[Tuple[int, Any]]]:
+    async def collect() -> List[List[Tuple[int, Any]]]:
+        return [batch async for batch in iter_ndjson_batches(_stream(chunks), batch_size, **kwargs)]
+
+    return asyncio.run(collect())
+
+
+def test_lines_split_across_chunks_are_batched_in_order():
+    batches = _collect([b'{"a": 1}\n{"a"', b': 2}\n\n{"a": 3}'])
+    assert batches == [[(1, {"a": 1}), (2, {"a": 2})], [(4, {"a": 3})]]
+
+
+def test_invalid_json_is_a_per_line_error():
+    (batch,) = _collect([b'{"a": 1}\nnot json\n'])
+    assert batch[0] == (1, {"a": 1})
+    assert batch[1][0] == 2 and isinstance(batch[1][1], ValueError)
+
+
+def test_overlong_line_is_dropped_with_an_error():
+    long_line = [b'{"a": "'] + [b"x" * 100] * 50 + [b'"}\n{"a": 2}\n']
+    (batch,) = _collect(long_line, max_line_bytes=256)
+    assert batch[0][0] == 1 and "longer than 256 bytes" in str(batch[0][1])
+    assert batch[1] == (2, {"a": 2})
+
+
+def test_overlong_unterminated_body_is_one_error():
+    (batch,) = _collect([b"x" * 100] * 50, max_line_bytes=256)
+    assert len(batch) == 1 and isinstance(batch[0][1], ValueError)
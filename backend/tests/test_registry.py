@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from backend.model import registry
+from backend.model.versions import ArtifactLayout
+
+
+@pytest.fixture
+def legacy_layout(tmp_path, monkeypatch) -> ArtifactLayout:
+    layout = ArtifactLayout(tmp_path)
+    for path in layout.pickle_paths:
+        path.write_bytes(b"artifact")
+    monkeypatch.setattr(registry, "current_layout", lambda: layout)
+    monkeypatch.setattr(
+        registry, "version_layout", lambda version: ArtifactLayout(tmp_path / "versions" / version, version)
+    )
+    return layout
+
+
+def test_published_version_is_loaded_by_id(tmp_path, monkeypatch):
+    directory = tmp_path / "versions" / "20240101T000000Z-abcdef"
+    directory.mkdir(parents=True)
+    monkeypatch.setattr(registry, "version_layout", lambda version: ArtifactLayout(directory, version))
+    version = registry.ModelRegistry().get("20240101T000000Z-abcdef")
+    assert version.version == "20240101T000000Z-abcdef"
+    assert version.layout.directory == directory
+
+
+def test_legacy_fingerprint_resolves_to_the_flat_layout(legacy_layout):
+    version = registry.ModelRegistry().get(legacy_layout.fingerprint())
+    assert version.layout.directory == legacy_layout.directory
+
+
+def test_legacy_fingerprint_changes_with_the_artifacts(legacy_layout):
+    before = legacy_layout.fingerprint()
+    Path(legacy_layout.model_path).write_bytes(b"retrained artifact")
+    assert legacy_layout.fingerprint() != before
+    with pytest.raises(LookupError):
+        registry.ModelRegistry().get(before)
+
+
+def test_unknown_version_raises(legacy_layout):
+    with pytest.raises(LookupError):
+        registry.ModelRegistry().get("no-such-version")
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from backend.model.trend import PredictionTrend, lttb_indices
+
+
+def test_lttb_keeps_endpoints_and_peaks():
+    x = np.arange(1000)
+    y = np.zeros(1000)
+    y[500] = 100.0
+    keep = lttb_indices(x, y, 50)
+    assert len(keep) == 50
+    assert keep[0] == 0 and keep[-1] == 999
+    assert np.all(np.diff(keep) > 0)
+    assert 500 in keep
+
+
+def test_lttb_needs_three_points():
+    with pytest.raises(ValueError):
+        lttb_indices(np.arange(10), np.arange(10), 2)
+
+
+def test_pages_are_ordered_by_index_and_downsampled_on_request():
+    trend = PredictionTrend.from_predictions([3, 1, 2, 0], [30.0, 10.0, 20.0, 0.0], [31.0, 11.0, 21.0, 1.0])
+    page = trend.page(offset=1, limit=2)
+    assert [point["index"] for point in page["points"]] == [1, 2]
+    assert page["total"] == 4 and not page["downsampled"]
+
+    series = PredictionTrend.from_predictions(np.arange(500), np.zeros(500), np.sin(np.arange(500)))
+    page = series.page(limit=500, max_points=20)
+    assert page["downsampled"] and len(page["points"]) == 20
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import bisect
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Deque, Dict, Iterator, Optional, Tuple
+
+# Explanation effort, most to least: full LIME + SHAP, LIME at a reduced
+# sample budget + SHAP, SHAP only, no explanations.
+TIERS = ("full", "reduced_lime", "shap_only", "prediction_only")
+# Pressure (load relative to capacity) from which each tier after "full" applies.
+STEP_PRESSURES = (1.0, 1.5, 2.0)
+# Fewest recent samples a latency percentile is computed from (so one slow
+# request, e.g. the first after startup, does not degrade an idle server).
+MIN_SAMPLES = 10
+
+
+def _percentile(samples: Deque[Tuple[float, float]], q: float) -> float:
+    values = sorted(seconds for _, seconds in samples)
+    return values[min(int(q * len(values)), len(values) - 1)]
+
+
+class AdmissionController:
+    """
+    Picks how much explanation work a `/predict` request gets from the
+    current load, so overload degrades explanations instead of every
+    response's latency.
+
+    Pressure is the larger of the explanations in flight or queued relative
+    to `max_inflight`, and the 90th percentile of explanation latencies over
+    the last `window_seconds` relative to `explanation_target_seconds` (once
+    there are `MIN_SAMPLES` of them).
+    Each `STEP_PRESSURES` threshold crossed drops one tier, and predictions
+    whose recent 95th percentile latency breaks `prediction_slo_seconds` drop
+    straight to "prediction_only". Tiers drop at once but come back one at a
+    time, at most every `recover_seconds`, so a recovering server does not
+    flap.
+
+    Used from the event loop only.
+    """
+
+    def __init__(
+        self,
+        max_inflight: int,
+        explanation_target_seconds: float,
+        prediction_slo_seconds: float,
+        window_seconds: float = 10.0,
+        recover_seconds: float = 5.0,
+        queue_depth: Optional[Callable[[], int]] = None,
+        enabled: bool = True,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_inflight = max(int(max_inflight), 1)
+        self.explanation_target_seconds = float(explanation_target_seconds)
+        self.prediction_slo_seconds = float(prediction_slo_seconds)
+        self.window_seconds = float(window_seconds)
+        self.recover_seconds = float(recover_seconds)
+        self.queue_depth = queue_depth
+        self.enabled = enabled
+        self._clock = clock
+        self._inflight = 0
+        self._explanations: Deque[Tuple[float, float]] = deque(maxlen=512)
+        self._predictions: Deque[Tuple[float, float]] = deque(maxlen=512)
+        self._level = 0
+        self._changed_at = clock()
+
+    def tier(self) -> str:
+        """
+        The tier for a request arriving now.
+        """
+        if not self.enabled:
+            return TIERS[0]
+        now = self._clock()
+        target = bisect.bisect_right(STEP_PRESSURES, self.pressure(now))
+        if self.prediction_slo_breached(now):
+            target = len(TIERS) - 1
+        if target > self._level:
+            self._level, self._changed_at = target, now
+        elif target < self._level and now - self._changed_at >= self.recover_seconds:
+            self._level, self._changed_at = self._level - 1, now
+        return TIERS[self._level]
+
+    def pressure(self, now: Optional[float] = None) -> float:
+        now = self._clock() if now is None else now
+        self._expire(self._explanations, now)
+        queued = self.queue_depth() if self.queue_depth is not None else 0
+        pressure = (self._inflight + queued) / self.max_inflight
+        if len(self._explanations) >= MIN_SAMPLES:
+            pressure = max(
+                pressure, _percentile(self._explanations, 0.9) / self.explanation_target_seconds
+            )
+        return pressure
+
+    def prediction_slo_breached(self, now: Optional[float] = None) -> bool:
+        now = self._clock() if now is None else now
+        self._expire(self._predictions, now)
+        return (
+            len(self._predictions) >= MIN_SAMPLES
+            and _percentile(self._predictions, 0.95) > self.prediction_slo_seconds
+        )
+
+    def record_prediction(self, seconds: float) -> None:
+        self._predictions.append((self._clock(), seconds))
+
+    @contextmanager
+    def track_explanation(self) -> Iterator[None]:
+        """
+        Count an explanation as in flight while the block runs, and record
+        its latency.
+        """
+        self._inflight += 1
+        start = self._clock()
+        try:
+            yield
+        finally:
+            self._inflight -= 1
+            end = self._clock()
+            self._explanations.append((end, end - start))
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "level": self._level,
+            "pressure": self.pressure(),
+            "inflight": self._inflight,
+        }
+
+    def _expire(self, samples: Deque[Tuple[float, float]], now: float) -> None:
+        while samples and samples[0][0] < now - self.window_seconds:
+            samples.popleft()
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Sequence, Tuple
+
+from .telemetry import BATCH_SIZE, BATCH_WAIT_SECONDS
+
+# (item, caller's future, enqueue time)
+_Pending = Tuple[Any, "asyncio.Future[Any]", float]
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent `submit` calls into one `process(key, items)` call.
+
+    Items wait until `max_batch_size` of them share a key or `max_wait_seconds`
+    has passed since the first one arrived, whichever comes first; `process`
+    then returns one result per item, in order, and each caller gets its own.
+    Items are only batched with others of the same `key` (e.g. model version
+    and explainer settings). A `max_wait_seconds` of 0 dispatches each call
+    on its own (no coalescing).
+
+    Must be used from a single event loop. Batch sizes and the time items
+    spend waiting for their batch are recorded under `name`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        process: Callable[[Hashable, List[Any]], Awaitable[Sequence[Any]]],
+        max_batch_size: int = 64,
+        max_wait_seconds: float = 0.002,
+    ) -> None:
+        self.name = name
+        self.process = process
+        self.max_batch_size = max(int(max_batch_size), 1)
+        self.max_wait_seconds = max(float(max_wait_seconds), 0.0)
+        self._pending: Dict[Hashable, List[_Pending]] = {}
+        self._timers: Dict[Hashable, asyncio.TimerHandle] = {}
+        self._tasks: set = set()
+
+    async def submit(self, item: Any, key: Hashable = None) -> Any:
+        loop = asyncio.get_running_loop()
+        future: "asyncio.Future[Any]" = loop.create_future()
+        pending = self._pending.setdefault(key, [])
+        pending.append((item, future, time.perf_counter()))
+
+        if len(pending) >= self.max_batch_size or self.max_wait_seconds == 0:
+            self._flush(key)
+        elif key not in self._timers:
+            self._timers[key] = loop.call_later(self.max_wait_seconds, self._flush, key)
+        return await future
+
+    def _flush(self, key: Hashable) -> None:
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(key, None)
+        if not batch:
+            return
+        dispatched = time.perf_counter()
+        BATCH_SIZE.observe(len(batch), stage=self.name)
+        for _, _, enqueued in batch:
+            BATCH_WAIT_SECONDS.observe(dispatched - enqueued, stage=self.name)
+
+        task = asyncio.ensure_future(self._run(key, batch))
+        # Keep a reference so the task is not garbage-collected mid-flight.
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, key: Hashable, batch: List[_Pending]) -> None:
+        try:
+            results = await self.process(key, [item for item, _, _ in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(
+                    f"{self.name}: batch of {len(batch)} returned {len(results)} results"
+                )
+        except Exception as exc:
+            for _, future, _ in batch:
+                # Callers that went away (client disconnects) are cancelled.
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, future, _), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+
+
+class ExplanationCache:
+    """
+    In-process LRU + TTL cache for prediction/explanation results.
+
+    Keys are built from a namespace (e.g. the artifact version), any extra
+    settings that affect the result, and the feature vector quantized to
+    `precision` significant digits, so near-identical scenarios share an entry.
+    A `max_entries` of 0 disables caching.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 3600.0, precision: int = 6) -> None:
+        self.max_entries = int(max_entries)
+        self.ttl_seconds = float(ttl_seconds)
+        self.precision = int(precision)
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def make_key(self, namespace: str, vector: np.ndarray, *settings: Hashable) -> Tuple:
+        quantized = tuple(float(f"{value:.{self.precision}g}") for value in np.asarray(vector, dtype=float))
+        return (namespace, settings, quantized)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        if not self.enabled:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if not self.enabled:
+            return
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .telemetry import observe_stage
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+
+
+class Job:
+    """
+    One queued computation: its input (dropped once it has run), `info`
+    reported alongside its status, and once finished its result (or the
+    error message).
+    """
+
+    def __init__(self, job_id: str, payload: Any, info: Dict[str, Any]) -> None:
+        self.id = job_id
+        self.payload = payload
+        self.info = info
+        self.status = PENDING
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.submitted_at = time.perf_counter()
+        self.finished = asyncio.Event()
+
+
+class JobQueue:
+    """
+    Runs `compute(payload)` in the background for submitted jobs, with a
+    bounded backlog, and keeps finished jobs for later retrieval.
+
+    At most `max_queued` jobs wait and `concurrency` run at once; `submit`
+    refuses new jobs beyond that instead of queueing without bound. The
+    `max_results` most recently finished jobs are kept (least recently
+    fetched evicted first). Workers are started on the first `submit`, on
+    the running event loop.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        compute: Callable[[Any], Awaitable[Dict[str, Any]]],
+        max_queued: int = 256,
+        concurrency: int = 1,
+        max_results: int = 1024,
+    ) -> None:
+        self.name = name
+        self.compute = compute
+        self.max_queued = max(int(max_queued), 1)
+        self.concurrency = max(int(concurrency), 1)
+        self.max_results = max(int(max_results), 1)
+        self._queue: Optional["asyncio.Queue[Job]"] = None
+        self._workers: List["asyncio.Task[None]"] = []
+        self._pending: Dict[str, Job] = {}
+        self._finished: "OrderedDict[str, Job]" = OrderedDict()
+        self.submitted = 0
+        self.rejected = 0
+        self.evicted = 0
+
+    def submit(self, payload: Any, **info: Any) -> Optional[Job]:
+        """
+        Queue a job for `payload` and return it, or None if the backlog is
+        full.
+        """
+        if self._queue is None:
+            self._start()
+        job = Job(uuid.uuid4().hex, payload, info)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            return None
+        self._pending[job.id] = job
+        self.submitted += 1
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        job = self._pending.get(job_id)
+        if job is None:
+            job = self._finished.get(job_id)
+            if job is not None:
+                self._finished.move_to_end(job_id)
+        return job
+
+    async def wait(self, job_id: str, timeout: float = 0.0) -> Optional[Job]:
+        """
+        The job (None if unknown or evicted), after waiting up to `timeout`
+        seconds for it to finish.
+        """
+        job = self.get(job_id)
+        if job is not None and job.status == PENDING and timeout > 0:
+            try:
+                await asyncio.wait_for(job.finished.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return job
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "pending": len(self._pending),
+            "stored": len(self._finished),
+            "submitted": self.submitted,
+            "rejected": self.rejected,
+            "evicted": self.evicted,
+        }
+
+    async def stop(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+
+    def _start(self) -> None:
+        self._queue = asyncio.Queue(maxsize=self.max_queued)
+        self._workers = [
+            asyncio.ensure_future(self._work(self._queue)) for _ in range(self.concurrency)
+        ]
+
+    async def _work(self, queue: "asyncio.Queue[Job]") -> None:
+        while True:
+            job = await queue.get()
+            observe_stage(f"{self.name}_queue_wait", time.perf_counter() - job.submitted_at)
+            try:
+                job.result = await self.compute(job.payload)
+                job.status = DONE
+            except Exception as exc:
+                logger.exception("%s job %s failed", self.name, job.id)
+                job.error = str(exc) or type(exc).__name__
+                job.status = FAILED
+            job.payload = None
+            self._pending.pop(job.id, None)
+            self._finished[job.id] = job
+            while len(self._finished) > self.max_results:
+                self._finished.popitem(last=False)
+                self.evicted += 1
+            job.finished.set()
+            queue.task_done()
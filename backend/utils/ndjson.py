@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import json
+from typing import Any, AsyncIterator, List, Tuple
+
+from starlette.requests import ClientDisconnect
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+
+async def iter_ndjson_batches(
+    chunks: AsyncIterator[bytes], batch_size: int, max_line_bytes: int = 65_536
+) -> AsyncIterator[List[Tuple[int, Any]]]:
+    """
+    Group an NDJSON byte stream into batches of at most `batch_size` parsed
+    lines, as `(line_number, value)` pairs (1-based, blank lines skipped).
+
+    A line that is not valid JSON, or longer than `max_line_bytes`, is
+    yielded with a `ValueError` as its value, so one bad row does not abort
+    the stream. The rest of an over-long line is discarded as it arrives,
+    so at most about `max_line_bytes` plus one chunk is buffered. Input is
+    pulled only as fast as batches are consumed.
+    """
+    buffer = b""
+    # Whether the line in `buffer` already passed `max_line_bytes`.
+    overflow = False
+    batch: List[Tuple[int, Any]] = []
+    line_number = 0
+
+    def parse(line: bytes, too_long: bool) -> None:
+        nonlocal line_number
+        line_number += 1
+        if too_long or len(line) > max_line_bytes:
+            batch.append((line_number, ValueError(f"line longer than {max_line_bytes} bytes")))
+            return
+        if not line.strip():
+            return
+        try:
+            batch.append((line_number, json.loads(line)))
+        except ValueError as exc:
+            batch.append((line_number, ValueError(f"invalid JSON: {exc}")))
+
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            parse(line, overflow)
+            overflow = False
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if len(buffer) > max_line_bytes:
+            buffer, overflow = b"", True
+    if buffer or overflow:
+        parse(buffer, overflow)
+    if batch:
+        yield batch
+
+
+def dumps_line(value: Any) -> bytes:
+    return json.dumps(value, separators=(",", ":")).encode() + b"\n"
+
+
+class NDJSONStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse for generators that read the request body while the
+    response is being sent.
+
+    Starlette's StreamingResponse listens for disconnects on `receive` in
+    parallel (ASGI < 2.4), which would swallow the body messages the
+    generator is waiting for; here only the generator reads `receive`, and a
+    disconnect surfaces there as `ClientDisconnect`.
+    """
+
+    media_type = "application/x-ndjson"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await self.stream_response(send)
+        except OSError:
+            raise ClientDisconnect()
+        if self.background is not None:
+            await self.background()
@@ -1,8 +1,22 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Literal, Optional, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
+
+from ..config import BATCH_MAX_ITEMS
+
+
+# Local SHAP explainer tiers, fastest first (see `build_shap_explainer`).
+ShapTier = Literal["path", "kmeans", "interventional"]
+
+# Forest a prediction is served by: the full Random Forest, or the compressed
+# one trained alongside it (see `backend.model.distill`).
+ModelVariant = Literal["full", "distilled"]
+
+# Explanation effort `/predict` served under the current load (see
+# `AdmissionController`), most first.
+ExplanationTier = Literal["full", "reduced_lime", "shap_only", "prediction_only"]
 
 
 class EmissionFeatures(BaseModel):
@@ -19,8 +33,25 @@ class EmissionFeatures(BaseModel):
 
 class PredictionResponse(BaseModel):
     prediction: float
-    lime_explanation: Dict[str, Any]
-    shap_values: Dict[str, Any]
+    # Absent for deferred requests, which get `explanation_id` instead (null
+    # if the explanation queue was full).
+    lime_explanation: Optional[Dict[str, Any]] = None
+    shap_values: Optional[Dict[str, Any]] = None
+    explanation_id: Optional[str] = None
+    # Explanations left out under load are null.
+    explanation_tier: ExplanationTier = "full"
+    model: ModelVariant = "full"
+
+
+class ExplanationJobResponse(BaseModel):
+    id: str
+    status: Literal["pending", "done", "failed"]
+    prediction: float
+    model: ModelVariant = "full"
+    explanation_tier: ExplanationTier = "full"
+    lime_explanation: Optional[Dict[str, Any]] = None
+    shap_values: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
 
 
 class MetricsResponse(BaseModel):
@@ -31,6 +62,28 @@ class MetricsResponse(BaseModel):
     cv_mae_std: float
 
 
+class ForestProfile(BaseModel):
+    n_trees: int
+    max_depth: int
+    n_nodes: int
+    size_bytes: int = Field(..., description="Flat node arrays, as served")
+    latency_single_ms: float = Field(..., description="Median prediction time for one row")
+    latency_batch_ms: float = Field(..., description="Median prediction time for batch_rows rows")
+    batch_rows: int
+
+
+class DistilledMetricsResponse(BaseModel):
+    r2: float
+    rmse: float
+    mae: float
+    full_mae: float
+    mae_ratio: float = Field(..., description="Test MAE relative to the full forest's")
+    accuracy_budget: float
+    within_budget: bool
+    distilled: ForestProfile
+    full: ForestProfile
+
+
 class FeatureImportanceItem(BaseModel):
     feature: str
     mean_abs_shap: float
@@ -49,6 +102,10 @@ class TrendPoint(BaseModel):
 
 class PredictionTrendResponse(BaseModel):
     points: List[TrendPoint]
+    total: int = Field(0, description="Number of held-out points available")
+    offset: int = 0
+    limit: int = 0
+    downsampled: bool = Field(False, description="Page was reduced with LTTB")
 
 
 class PolicyInsight(BaseModel):
@@ -64,3 +121,106 @@ class PolicyInsightsResponse(BaseModel):
 class BaselinePredictionResponse(BaseModel):
     prediction: float
 
+
+class BatchPredictionRequest(BaseModel):
+    items: List[EmissionFeatures] = Field(..., min_length=1, max_length=BATCH_MAX_ITEMS)
+    include_shap: bool = Field(
+        False, description="Also return per-row SHAP values (one batched explainer call)"
+    )
+    shap_tier: Optional[ShapTier] = Field(
+        None, description="SHAP explainer tier (default: the server's SHAP_TIER)"
+    )
+    model: ModelVariant = Field("full", description="Forest to predict (and explain) with")
+
+
+class BatchPredictionResponse(BaseModel):
+    predictions: List[float]
+    shap_values: Optional[Dict[str, Any]] = None
+
+
+# Raw scenario inputs a what-if sweep can vary (engineered features follow).
+SweepFeature = Literal[
+    "gdp_per_capita",
+    "industrial_output",
+    "population",
+    "vehicle_count",
+    "energy_consumption",
+    "renewable_share",
+    "engine_size",
+    "fuel_consumption",
+    "cylinders",
+]
+
+
+class SweepAxis(BaseModel):
+    feature: SweepFeature
+    values: Optional[List[float]] = Field(
+        None, min_length=1, description="Explicit grid values (or give start/stop/num)"
+    )
+    start: Optional[float] = None
+    stop: Optional[float] = None
+    num: Optional[int] = Field(None, ge=1, description="Evenly spaced points from start to stop")
+
+    @model_validator(mode="after")
+    def _check_grid(self) -> "SweepAxis":
+        if (self.values is None) == (self.start is None or self.stop is None or self.num is None):
+            raise ValueError("give either values, or start, stop and num")
+        return self
+
+    @property
+    def size(self) -> int:
+        return len(self.values) if self.values is not None else self.num
+
+    def grid(self) -> List[float]:
+        if self.values is not None:
+            return self.values
+        step = (self.stop - self.start) / (self.num - 1) if self.num > 1 else 0.0
+        return [self.start + step * position for position in range(self.num)]
+
+
+class SweepRequest(BaseModel):
+    base: EmissionFeatures
+    axes: List[SweepAxis] = Field(..., min_length=1, max_length=2)
+    shap_points: int = Field(
+        0, ge=0, description="Also return SHAP values for this many evenly spaced grid points"
+    )
+    shap_tier: Optional[ShapTier] = Field(
+        None, description="SHAP explainer tier (default: the server's SHAP_TIER)"
+    )
+    model: ModelVariant = Field("full", description="Forest to predict (and explain) with")
+
+    @model_validator(mode="after")
+    def _distinct_features(self) -> "SweepRequest":
+        if len({axis.feature for axis in self.axes}) != len(self.axes):
+            raise ValueError("each axis must sweep a different feature")
+        return self
+
+
+class SweepShapValues(BaseModel):
+    base_value: float
+    feature_names: List[str]
+    points: List[List[int]] = Field(..., description="Grid coordinates of each explained point")
+    values: List[List[float]]
+
+
+class SweepResponse(BaseModel):
+    features: List[str]
+    grid: List[List[float]] = Field(..., description="Values of each swept feature, per axis")
+    predictions: Union[List[float], List[List[float]]] = Field(
+        ..., description="Response curve (one axis) or surface indexed [axis0][axis1]"
+    )
+    shap_values: Optional[SweepShapValues] = None
+
+
+class ReadinessStage(BaseModel):
+    stage: str
+    at_seconds: float
+
+
+class ReadinessResponse(BaseModel):
+    ready: bool
+    stage: str
+    detail: Optional[str] = None
+    error: Optional[str] = None
+    elapsed_seconds: float
+    history: List[ReadinessStage]
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from pydantic import BaseModel
+from starlette.requests import Request
+from starlette.responses import Response
+
+
+class StaticResponseCache:
+    """
+    Pre-serialized JSON responses for endpoints whose output only changes
+    when the artifacts do (metrics, feature importance, policy insights).
+
+    Each response is rendered once per artifact version into bytes with a
+    strong ETag (a hash of the body). Requests whose `If-None-Match` matches
+    get an empty 304; everything else gets the stored bytes as-is.
+
+    The `versions_kept` most recent versions stay rendered, so a new model
+    version can be pre-rendered while requests pinned to the previous one
+    are still served.
+    """
+
+    def __init__(self, max_age_seconds: int = 60, versions_kept: int = 2) -> None:
+        self.cache_control = f"public, max-age={int(max_age_seconds)}, must-revalidate"
+        self.versions_kept = versions_kept
+        self._entries: Dict[str, "OrderedDict[str, Tuple[bytes, str]]"] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str, version: str, render: Callable[[], BaseModel]) -> Tuple[bytes, str]:
+        """
+        Body bytes and ETag for `name` at artifact `version`, rendering (and
+        dropping the oldest kept version) on first use.
+        """
+        entry = self._entries.get(name, {}).get(version)
+        if entry is not None:
+            return entry
+
+        body = render().model_dump_json().encode()
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        with self._lock:
+            versions = self._entries.setdefault(name, OrderedDict())
+            versions[version] = (body, etag)
+            while len(versions) > self.versions_kept:
+                versions.popitem(last=False)
+        return body, etag
+
+    def respond(
+        self, request: Request, name: str, version: str, render: Callable[[], BaseModel]
+    ) -> Response:
+        body, etag = self.get(name, version, render)
+        headers = {"ETag": etag, "Cache-Control": self.cache_control}
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        return Response(body, media_type="application/json", headers=headers)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    # If-None-Match uses weak comparison, so W/"x" also matches "x".
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Latency buckets (seconds) shared by the latency histograms: 0.5 ms .. 30 s.
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+# Rows per coalesced batch.
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+# Time spent waiting for a coalescing window: 0.1 ms .. 0.5 s.
+WAIT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.002, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram (of latencies, by default) per label set. `observe` is a bisect and
+    a few additions under a lock.
+    """
+
+    def __init__(self, name: str, help_text: str, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        self._series: Dict[LabelKey, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        position = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # Per-bucket counts, then +Inf count and sum.
+                series = self._series[key] = [0.0] * (len(self.buckets) + 2)
+            series[position] += 1
+            series[-1] += seconds
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = {key: list(series) for key, series in self._series.items()}
+        for key, series in sorted(snapshot.items()):
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_labels(key, le=_number(bound))} {_number(cumulative)}")
+            cumulative += series[len(self.buckets)]
+            lines.append(f'{self.name}_bucket{_labels(key, le="+Inf")} {_number(cumulative)}')
+            lines.append(f"{self.name}_sum{_labels(key)} {series[-1]!r}")
+            lines.append(f"{self.name}_count{_labels(key)} {_number(cumulative)}")
+        return lines
+
+
+class Counter:
+    """
+    Monotonic counter per label set.
+    """
+
+    def __init__(self, name: str, help_text: str) -> None:
+        self.name = name
+        self.help_text = help_text
+        self._series: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._series[key] = self._series.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            snapshot = dict(self._series)
+        for key, value in sorted(snapshot.items()):
+            lines.append(f"{self.name}{_labels(key)} {_number(value)}")
+        return lines
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _labels(key: LabelKey, **extra: str) -> str:
+    items = list(key) + list(extra.items())
+    if not items:
+        return ""
+    escaped = (
+        name + '="' + str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+        for name, value in items
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+def gauge_lines(name: str, help_text: str, samples: Sequence[Tuple[Dict[str, str], float]]) -> List[str]:
+    """
+    Prometheus lines for a gauge computed at scrape time (cache stats,
+    artifact load times).
+    """
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+    for labels, value in samples:
+        lines.append(f"{name}{_labels(tuple(sorted(labels.items())))} {_number(value)}")
+    return lines
+
+
+STAGE_SECONDS = Histogram(
+    "carbon_stage_seconds", "Time spent in each hot-path stage (feature matrix, RF predict, LIME, SHAP)."
+)
+REQUEST_SECONDS = Histogram("carbon_http_request_seconds", "HTTP request latency by endpoint.")
+REQUESTS_TOTAL = Counter("carbon_http_requests_total", "HTTP requests by endpoint, method and status.")
+EXPLANATION_TIERS_TOTAL = Counter(
+    "carbon_explanation_tier_total", "/predict responses by the explanation tier they were served."
+)
+BATCH_SIZE = Histogram(
+    "carbon_coalesced_batch_size", "Requests per coalesced batch, by stage.", BATCH_SIZE_BUCKETS
+)
+BATCH_WAIT_SECONDS = Histogram(
+    "carbon_coalesce_wait_seconds",
+    "Time each request waited for its coalesced batch to be dispatched, by stage.",
+    WAIT_BUCKETS,
+)
+
+_capture = threading.local()
+
+
+def observe_stage(stage: str, seconds: float) -> None:
+    """
+    Record a stage duration, or add it to the active `capture_stages` list.
+    """
+    captured: Optional[List[Tuple[str, float]]] = getattr(_capture, "stages", None)
+    if captured is not None:
+        captured.append((stage, seconds))
+    else:
+        STAGE_SECONDS.observe(seconds, stage=stage)
+
+
+@contextmanager
+def stage_timer(stage: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(stage, time.perf_counter() - start)
+
+
+@contextmanager
+def capture_stages() -> Iterator[List[Tuple[str, float]]]:
+    """
+    Collect the stage timings recorded in this thread instead of recording
+    them, so work done in an explanation worker process can hand them back
+    to the API process (see `record_stages`).
+    """
+    previous = getattr(_capture, "stages", None)
+    _capture.stages = captured = []
+    try:
+        yield captured
+    finally:
+        _capture.stages = previous
+
+
+def record_stages(stages: Sequence[Tuple[str, float]]) -> None:
+    for stage, seconds in stages:
+        observe_stage(stage, seconds)
+
+
+def render_metrics(extra: Sequence[str] = ()) -> str:
+    """
+    All runtime metrics in the Prometheus text exposition format.
+    """
+    lines: List[str] = []
+    for metric in (
+        STAGE_SECONDS,
+        REQUEST_SECONDS,
+        REQUESTS_TOTAL,
+        EXPLANATION_TIERS_TOTAL,
+        BATCH_SIZE,
+        BATCH_WAIT_SECONDS,
+    ):
+        lines.extend(metric.render())
+    lines.extend(extra)
+    return "\n".join(lines) + "\n"
+
+
+class RequestMetricsMiddleware:
+    """
+    ASGI middleware counting requests and timing them per route template
+    (e.g. `/predict`), until the last body chunk has been sent.
+    """
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = {"code": 500}
+
+        async def send_wrapper(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            endpoint = getattr(route, "path", "unmatched")
+            REQUEST_SECONDS.observe(time.perf_counter() - start, endpoint=endpoint)
+            REQUESTS_TOTAL.inc(
+                endpoint=endpoint, method=scope["method"], status=str(status["code"])
+            )
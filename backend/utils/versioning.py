@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from typing import Any, Dict
+
+from ..model.registry import artifact_readiness, model_registry, pin_version
+
+MODEL_VERSION_HEADER = "X-Model-Version"
+
+
+class ModelVersionMiddleware:
+    """
+    ASGI middleware pinning each request to the model version being served
+    when it arrives, and reporting that version in an `X-Model-Version`
+    response header. A hot swap mid-request therefore never mixes versions
+    within one response. Until the artifacts are ready, requests pass
+    through untouched.
+    """
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http" or not artifact_readiness.ready:
+            await self.app(scope, receive, send)
+            return
+
+        version = model_registry.current()
+        header = (MODEL_VERSION_HEADER.lower().encode(), version.version.encode())
+
+        async def send_wrapper(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), header]
+            await send(message)
+
+        with pin_version(version):
+            await self.app(scope, receive, send_wrapper)